@@ -3,23 +3,42 @@
 Auto-generate __init__.py files for robot models in openrd.
 
 Usage:
-    python auto_generate_init.py [--format mjcf|urdf|all]
+    python auto_generate_init.py [--format mjcf|urdf|all] [--incremental] [--watch]
 
 This script will:
 1. Scan mjcf/ and urdf/ directories
 2. Auto-generate __init__.py files for each robot directory
 3. Update parent __init__.py files to register all robots
+4. Refresh the model catalog index (openrd/catalog.json)
 
 After adding new robot models (meshes, mjcf, urdf files), run this script
 to automatically generate the necessary __init__.py files.
+
+Files are only written when their content changes. Each format directory
+keeps a state file (.openrd_state.json) with the size, mtime and SHA-256 of
+every model file and a digest of the sizes and mtimes of the robot's meshes
+(meshes/<robot>/); with --incremental only robot directories whose model
+files changed are regenerated, and only the catalog entries of robots whose
+model files or meshes changed are re-parsed.
+--watch polls the directories and regenerates incrementally on change.
 """
 
 import os
 import re
+import sys
+import json
+import time
+import hashlib
 import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+STATE_FILE = ".openrd_state.json"
+STATE_VERSION = 2
+MODEL_EXTENSIONS = {"mjcf": ["xml"], "urdf": ["urdf"]}
+
 
 def find_model_files(directory: Path, extensions: List[str]) -> List[Path]:
     """Find all model files with given extensions in directory."""
@@ -67,13 +86,11 @@ def generate_init_py(robot_dir: Path, format_type: str) -> str:
     
     # Find model files
     if format_type == "mjcf":
-        extensions = ["xml"]
         attr_name = "xml"
     else:  # urdf
-        extensions = ["urdf"]
         attr_name = "urdf"
     
-    model_files = find_model_files(robot_dir, extensions)
+    model_files = find_model_files(robot_dir, MODEL_EXTENSIONS[format_type])
     
     if not model_files:
         return None
@@ -101,12 +118,97 @@ def generate_init_py(robot_dir: Path, format_type: str) -> str:
     return "\n".join(lines)
 
 
-def update_parent_init(parent_dir: Path, format_type: str) -> None:
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write content to path unless the file already holds exactly that content.
+    
+    :return: True if the file was written
+    """
+    if path.exists() and path.read_text() == content:
+        return False
+    path.write_text(content)
+    return True
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint_models(robot_dir: Path, format_type: str, previous: Dict) -> Dict[str, Dict]:
+    """
+    Fingerprint the model files of a robot directory.
+    
+    Files whose size and mtime match the previous state reuse its hash, so
+    only new or touched files are read.
+    
+    :param robot_dir: Path to robot directory (e.g., openrd/mjcf/bruce)
+    :param format_type: 'mjcf' or 'urdf'
+    :param previous: Previous fingerprint of this directory ({} if none)
+    :return: {file name: {"size", "mtime_ns", "sha256"}}
+    """
+    fingerprint = {}
+    for model_file in find_model_files(robot_dir, MODEL_EXTENSIONS[format_type]):
+        stat = model_file.stat()
+        old = previous.get(model_file.name)
+        if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            sha256 = old["sha256"]
+        else:
+            sha256 = hash_file(model_file)
+        fingerprint[model_file.name] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+        }
+    return fingerprint
+
+
+def fingerprint_meshes(mesh_dir: Path) -> str:
+    """
+    Digest of the names, sizes and mtimes of every file below a robot's mesh directory.
+    
+    Catalog properties such as mesh_bytes are derived from the meshes, so a
+    changed digest marks all model files of the robot as modified.
+    
+    :param mesh_dir: Path to the robot's mesh directory (e.g., openrd/meshes/bruce), which may not exist
+    :return: SHA-256 hex digest (of nothing if the directory does not exist)
+    """
+    digest = hashlib.sha256()
+    for path in sorted(p for p in mesh_dir.rglob("*") if p.is_file()):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(mesh_dir).as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def load_state(format_dir: Path) -> Dict[str, Dict]:
+    """Load the per-robot fingerprints of a format directory ({} if missing or outdated)."""
+    state_file = format_dir / STATE_FILE
+    try:
+        state = json.loads(state_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    if state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("robots", {})
+
+
+def save_state(format_dir: Path, robots: Dict[str, Dict]) -> None:
+    """Save the per-robot fingerprints of a format directory."""
+    content = json.dumps({"version": STATE_VERSION, "robots": robots}, indent=1, sort_keys=True) + "\n"
+    write_if_changed(format_dir / STATE_FILE, content)
+
+
+def update_parent_init(parent_dir: Path, format_type: str) -> bool:
     """
     Update parent __init__.py to include all robot directories.
     
     :param parent_dir: Path to parent directory (e.g., openrd/mjcf)
     :param format_type: 'mjcf' or 'urdf'
+    :return: True if the file was written
     """
     init_file = parent_dir / "__init__.py"
     
@@ -119,38 +221,61 @@ def update_parent_init(parent_dir: Path, format_type: str) -> None:
                 robot_dirs.append(item.name)
     
     # Generate new __init__.py content
-    import_lines = []
     all_lines = []
     
     for robot_dir in robot_dirs:
         # Convert to valid Python identifier
         import_name = robot_dir
-        import_lines.append(f"from . import {import_name}")
         all_lines.append(f'    "{import_name}",')
     
+    # The sub-folders are attributes of this module, imported on first access
+    # so that looking up one robot does not import all of them
     content = [
-        "# This line makes the sub-folders available as attributes of this module",
-    ] + import_lines + [
+        "# The sub-folders are available as attributes of this module; each one is",
+        "# imported on first access",
+        "import importlib",
         "",
         "__all__ = [",
     ] + all_lines + [
         "]",
         "",
+        "",
+        "def __getattr__(name):",
+        "    if name in __all__:",
+        '        return importlib.import_module(f".{name}", __name__)',
+        '    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")',
+        "",
+        "",
+        "def __dir__():",
+        "    return list(__all__)",
+        "",
     ]
     
     # Write to file
-    init_file.write_text("\n".join(content))
-    print(f"  ✓ Updated {init_file.name}/__init__.py")
+    if not write_if_changed(init_file, "\n".join(content)):
+        return False
+    print(f"  ✓ Updated {parent_dir.name}/__init__.py")
+    return True
 
 
-def process_library(library_path: Path, format_types: List[str]) -> None:
+def process_library(library_path: Path, format_types: List[str], incremental: bool = False,
+                    jobs: int = None, verbose: bool = True) -> Tuple[bool, List[Path]]:
     """
     Process the openrd library.
     
     :param library_path: Path to library root (e.g., Open-Robot-Descriptions/openrd)
     :param format_types: List of formats to process ['mjcf', 'urdf']
+    :param incremental: Only regenerate robot directories whose model files
+        changed since the last run (according to the state files)
+    :param jobs: Number of threads fingerprinting robot directories (default: CPU count)
+    :param verbose: Print directories and skipped robots even when nothing changed
+    :return: (changed, changed model files); changed is True if any model
+        file was added, modified or removed since the last run. When a robot's
+        meshes changed, all of its model files count as changed.
     """
     library_name = library_path.name
+    changed = False
+    changed_files = []
     
     for format_type in format_types:
         format_dir = library_path / format_type
@@ -158,28 +283,95 @@ def process_library(library_path: Path, format_types: List[str]) -> None:
             print(f"⚠ Skipping {format_dir} (does not exist)")
             continue
         
-        print(f"\n📁 Processing {library_name}/{format_type}/")
+        if verbose:
+            print(f"\n📁 Processing {library_name}/{format_type}/")
+        
+        # Fingerprint each robot directory in parallel (hashing is I/O bound)
+        robot_dirs = sorted(d for d in format_dir.iterdir()
+                            if d.is_dir() and not d.name.startswith("__"))
+        previous = load_state(format_dir)
+        
+        def scan(robot_dir):
+            models = fingerprint_models(robot_dir, format_type, previous.get(robot_dir.name, {}).get("models", {}))
+            return {"models": models, "meshes": fingerprint_meshes(library_path / "meshes" / robot_dir.name)}
         
-        # Process each robot directory
-        robot_dirs = [d for d in format_dir.iterdir() 
-                     if d.is_dir() and not d.name.startswith("__")]
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            fingerprints = list(pool.map(scan, robot_dirs))
+        state = {d.name: fp for d, fp in zip(robot_dirs, fingerprints) if fp["models"]}
         
-        for robot_dir in sorted(robot_dirs):
+        for robot_dir, robot_state in zip(robot_dirs, fingerprints):
             init_file = robot_dir / "__init__.py"
+            fingerprint = robot_state["models"]
+            old = previous.get(robot_dir.name, {}).get("models", {})
+            meshes_changed = previous.get(robot_dir.name, {}).get("meshes") != robot_state["meshes"]
+            modified = [name for name, entry in fingerprint.items()
+                        if meshes_changed or old.get(name, {}).get("sha256") != entry["sha256"]]
+            if modified or set(old) != set(fingerprint):
+                changed = True
+                changed_files.extend(robot_dir / name for name in modified)
             
-            # Generate __init__.py
-            init_content = generate_init_py(robot_dir, format_type)
+            if not fingerprint:
+                if verbose:
+                    print(f"  ⚠ Skipping {robot_dir.name} (no model files found)")
+                continue
             
-            if init_content is None:
-                print(f"  ⚠ Skipping {robot_dir.name} (no model files found)")
+            if incremental and set(old) == set(fingerprint) and init_file.exists():
                 continue
             
+            # Generate __init__.py
+            init_content = generate_init_py(robot_dir, format_type)
+            
             # Write __init__.py
-            init_file.write_text(init_content)
-            print(f"  ✓ Generated {robot_dir.name}/__init__.py")
+            if write_if_changed(init_file, init_content):
+                print(f"  ✓ Generated {robot_dir.name}/__init__.py")
+        
+        changed = changed or set(previous) != set(state)
         
         # Update parent __init__.py
         update_parent_init(format_dir, format_type)
+        save_state(format_dir, state)
+    
+    return changed, changed_files
+
+
+def refresh_catalog(library_path: Path, changed_files: List[Path] = None) -> None:
+    """
+    Refresh the model catalog index in a fresh interpreter (so the newly
+    generated __init__.py files are imported).
+    
+    :param library_path: Path to library root
+    :param changed_files: Only re-parse these model files (default: all)
+    """
+    if not (library_path / "catalog.py").exists():
+        return
+    command = [sys.executable, "-m", f"{library_path.name}.catalog", "build"]
+    if changed_files is not None:
+        command += ["--only"] + [str(path.resolve()) for path in changed_files]
+    result = subprocess.run(command, cwd=library_path.parent, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"  ⚠ Catalog refresh failed:\n{result.stderr}")
+    else:
+        print(f"  ✓ {result.stdout.strip()}")
+
+
+def watch(library_path: Path, format_types: List[str], interval: float, jobs: int = None,
+          catalog: bool = True) -> None:
+    """
+    Poll the model directories and regenerate incrementally whenever model files change.
+    
+    :param interval: Seconds between polls
+    """
+    print(f"\n👀 Watching for model changes every {interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            changed, changed_files = process_library(
+                library_path, format_types, incremental=True, jobs=jobs, verbose=False
+            )
+            if changed and catalog:
+                refresh_catalog(library_path, changed_files)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
 
 
 def main():
@@ -198,6 +390,33 @@ def main():
         default=None,
         help="Path to openrd directory (auto-detected if not specified)"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate robot directories whose model files changed since the last run"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate incrementally when model files change"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Polling interval in seconds for --watch (default: 1.0)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of threads scanning robot directories (default: CPU count)"
+    )
+    parser.add_argument(
+        "--no-catalog",
+        action="store_true",
+        help="Do not refresh the model catalog index"
+    )
     
     args = parser.parse_args()
     
@@ -219,7 +438,20 @@ def main():
         return
     
     print(f"🔧 Processing Open-Robot-Descriptions: {openrd_path}")
-    process_library(openrd_path, format_types)
+    incremental = args.incremental or args.watch
+    changed, changed_files = process_library(openrd_path, format_types, incremental=incremental,
+                                             jobs=args.jobs)
+    if not args.no_catalog:
+        if not incremental:
+            refresh_catalog(openrd_path)
+        elif changed:
+            refresh_catalog(openrd_path, changed_files)
+    if incremental and not changed:
+        print("\n✓ No model files changed")
+    
+    if args.watch:
+        watch(openrd_path, format_types, args.interval, jobs=args.jobs, catalog=not args.no_catalog)
+        return
     
     print("\n✅ Done!")
 
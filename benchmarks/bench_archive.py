@@ -0,0 +1,115 @@
+"""Benchmark cold-cache loading from loose files against a packed archive.
+
+Packs the selected robots into one temporary catalog archive and into one
+archive per robot, then reads every model and mesh file of each robot either
+as loose files (``stat`` + ``open`` + ``read`` per file) or as members of an
+mmap-ed archive. Before every timed
+run the data pages of the benchmark's own files are dropped with
+``posix_fadvise(DONTNEED)``, which leaves file metadata cached and
+understates the per-file overhead. With ``--drop-caches`` (root only) all
+kernel caches of the machine (pages, dentries, inodes) are dropped instead,
+which slows down everything else running on it. With ``--parse`` meshes are
+also parsed with trimesh.
+
+Usage:
+    python benchmarks/bench_archive.py [--robots unitree_h1 unitree_g1] [--repeat 3] [--parse] [--drop-caches]
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from openrd.archive import PACKAGE_DIR, Archive, _robot_files, _robot_names, build_archive
+
+_MESH_EXTENSIONS = (".stl", ".obj", ".ply", ".dae")
+
+
+def _evict(paths, drop_caches=False):
+    if drop_caches:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _parse(name, data):
+    import trimesh
+
+    return trimesh.load(io.BytesIO(data), file_type=os.path.splitext(name)[1][1:].lower(), force="mesh")
+
+
+def _load_loose(members, parse):
+    total = 0
+    for name in members:
+        path = os.path.join(PACKAGE_DIR, name)
+        os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        total += len(data)
+        if parse and name.lower().endswith(_MESH_EXTENSIONS):
+            _parse(name, data)
+    return total
+
+
+def _load_archive(archive_path, members, parse):
+    total = 0
+    with Archive(archive_path) as archive:
+        for name in members:
+            data = archive.read(name)
+            total += len(data)
+            if parse and name.lower().endswith(_MESH_EXTENSIONS):
+                _parse(name, data)
+    return total
+
+
+def _cold(fn, files, repeat, drop_caches):
+    best = float("inf")
+    for _ in range(repeat):
+        _evict(files, drop_caches)
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    robots = args.robots or _robot_names()
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_path = os.path.join(tmp, "catalog.orda")
+        build_archive(catalog_path, robots=robots)
+        print(f"{'Robot':<12} {'Files':>6} {'MB':>7} {'Loose (ms)':>11} {'Catalog (ms)':>13} {'Robot (ms)':>11} "
+              f"{'Speedup':>8}")
+        for robot in robots:
+            robot_path = os.path.join(tmp, f"{robot}.orda")
+            build_archive(robot_path, robots=[robot])
+            members = _robot_files(robot)
+            loose_files = [os.path.join(PACKAGE_DIR, name) for name in members]
+            size = sum(os.path.getsize(path) for path in loose_files)
+            loose = _cold(lambda: _load_loose(members, args.parse), loose_files, args.repeat, args.drop_caches)
+            catalog = _cold(lambda: _load_archive(catalog_path, members, args.parse), [catalog_path], args.repeat,
+                            args.drop_caches)
+            single = _cold(lambda: _load_archive(robot_path, members, args.parse), [robot_path], args.repeat,
+                           args.drop_caches)
+            print(f"{robot:<12} {len(members):>6} {size / 1e6:>7.1f} {loose * 1e3:>11.1f} {catalog * 1e3:>13.1f} "
+                  f"{single * 1e3:>11.1f} {loose / single:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold-cache loading from loose files vs a packed archive")
+    parser.add_argument("--robots", nargs="+", default=None, help="Robots to benchmark (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--parse", action="store_true", help="Also parse meshes with trimesh")
+    parser.add_argument("--drop-caches", action="store_true",
+                        help="Drop the page, dentry and inode caches of the whole machine before each run "
+                             "(needs root, affects every running process)")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,50 @@
+"""Benchmark URDF <-> MJCF conversion and the kinematic equivalence check.
+
+For each robot, converts the URDF into a fresh temporary cache (cold), then
+again (cache hit), and measures how many random configurations per second
+:func:`compare_kinematics` evaluates for the source/converted pair.
+
+Usage:
+    python benchmarks/bench_convert.py [--robots unitree_h1 unitree_g1] [--samples 4096] [--from mjcf]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from openrd import get_model_path
+from openrd.convert import compare_kinematics, convert_file
+
+
+def main(args):
+    print(f"{'Robot':<12} {'Cold (ms)':>10} {'Cached (ms)':>12} {'Check (ms)':>11} {'Configs/s':>10} "
+          f"{'Max err (m)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["OPENRD_CACHE_DIR"] = tmp
+        for robot in args.robots:
+            path = get_model_path(robot, model_format=args.source_format)
+            start = time.perf_counter()
+            converted = convert_file(path, args.source_format)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            convert_file(path, args.source_format)
+            cached = time.perf_counter() - start
+            pair = (path, converted) if args.source_format == "urdf" else (converted, path)
+            start = time.perf_counter()
+            report = compare_kinematics(*pair, samples=args.samples)
+            check = time.perf_counter() - start
+            print(f"{robot:<12} {cold * 1e3:>10.1f} {cached * 1e3:>12.2f} {check * 1e3:>11.1f} "
+                  f"{args.samples / check:>10.0f} {report.position_error:>12.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark URDF <-> MJCF conversion and equivalence checks")
+    parser.add_argument("--robots", nargs="+", default=["unitree_h1", "unitree_g1", "fourier_gr3"],
+                        help="Robots to benchmark")
+    parser.add_argument("--samples", type=int, default=4096, help="Random configurations per check")
+    parser.add_argument("--from", dest="source_format", choices=["urdf", "mjcf"], default="urdf",
+                        help="Format to convert from")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,57 @@
+"""Benchmark batched inverse dynamics throughput.
+
+Times ``InverseDynamics.inverse`` (full RNEA) and the gravity-compensation
+fast path ``InverseDynamics.gravity_torques`` on random samples within the
+joint limits and reports samples per second for each robot.
+
+Usage:
+    python benchmarks/bench_dynamics.py [--robots unitree_h1 unitree_g1] [--samples 100000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from openrd.dynamics import InverseDynamics
+
+
+def _samples(dyn, count, seed):
+    km = dyn.kinematics
+    rng = np.random.default_rng(seed)
+    lower = np.where(np.isfinite(km.lower), km.lower, -np.pi)
+    upper = np.where(np.isfinite(km.upper), km.upper, np.pi)
+    q = rng.uniform(lower, upper, (count, km.nq))
+    return q, rng.normal(size=q.shape), rng.normal(size=q.shape)
+
+
+def _rate(fn, count, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main(args):
+    print(f"{'Robot':<12} {'DOF':>4} {'Links':>6} {'RNEA samples/s':>15} {'Gravity samples/s':>18}")
+    for name in args.robots:
+        dyn = InverseDynamics.from_model(name)
+        q, qd, qdd = _samples(dyn, args.samples, args.seed)
+        full = _rate(lambda: dyn.inverse(q, qd, qdd, chunk_size=args.chunk_size), args.samples, args.repeat)
+        gravity = _rate(lambda: dyn.gravity_torques(q, chunk_size=args.chunk_size), args.samples, args.repeat)
+        print(f"{name:<12} {dyn.nq:>4} {len(dyn.kinematics.link_names):>6} {full:>15.0f} {gravity:>18.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched inverse dynamics throughput")
+    parser.add_argument("--robots", nargs="+", default=["unitree_h1", "unitree_g1", "fourier_gr3"],
+                        help="Robots to benchmark")
+    parser.add_argument("--samples", type=int, default=100000, help="Number of (q, qd, qdd) samples")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="Samples per vectorized pass")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,62 @@
+"""Benchmark GLB export and the node transform fast path.
+
+For each robot, exports the URDF into a fresh temporary cache (cold), then
+again (cache hit), and measures how many joint configurations per second
+:meth:`GlbScene.node_matrices` turns into link node transforms, and how long
+writing one posed GLB (JSON rewrite, binary chunk reused) takes.
+
+Usage:
+    python benchmarks/bench_gltf.py [--robots unitree_h1 unitree_g1] [--batch 4096] [--quantize]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from openrd import get_model_path
+from openrd.gltf import GlbScene, export_glb
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    print(f"{'Robot':<12} {'Nodes':>6} {'Meshes':>7} {'MB':>6} {'Cold (s)':>9} {'Cached (ms)':>12} "
+          f"{'Configs/s':>11} {'Posed (ms)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["OPENRD_CACHE_DIR"] = tmp
+        for robot in args.robots:
+            path = get_model_path(robot)
+            start = time.perf_counter()
+            glb = export_glb(path, quantize=args.quantize)
+            cold = time.perf_counter() - start
+            cached = _best(lambda: export_glb(path, quantize=args.quantize), args.repeat)
+            scene = GlbScene(glb)
+            q = rng.uniform(-1, 1, (args.batch, scene.nq))
+            batch = _best(lambda: scene.node_matrices(q), args.repeat)
+            posed = _best(lambda: scene.posed(q[0]), args.repeat)
+            print(f"{robot:<12} {len(scene.gltf['nodes']):>6} {len(scene.gltf['meshes']):>7} "
+                  f"{os.path.getsize(glb) / 1e6:>6.1f} {cold:>9.2f} {cached * 1e3:>12.1f} "
+                  f"{args.batch / batch:>11.0f} {posed * 1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GLB export and batched node transforms")
+    parser.add_argument("--robots", nargs="+", default=["unitree_h1", "unitree_g1", "fourier_gr3"],
+                        help="Robots to benchmark")
+    parser.add_argument("--batch", type=int, default=4096, help="Joint configurations per batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--quantize", action="store_true", help="Export quantized geometry")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,58 @@
+"""Benchmark batched IK retargeting throughput.
+
+For each humanoid, a smooth random joint trajectory (sinusoids within the
+joint limits) is pushed through forward kinematics to produce reachable
+foot and hand targets. ``BatchIK.solve_sequence`` then retargets the
+sequence from scratch and the script reports frames per second together
+with the median and worst position error.
+
+Usage:
+    python benchmarks/bench_ik.py [--robots unitree_h1 unitree_g1] [--frames 2000] [--batch-size 64]
+"""
+
+import argparse
+
+import numpy as np
+
+from openrd.ik import BatchIK
+
+TARGET_LINKS = {
+    "unitree_h1": ["left_ankle_link", "right_ankle_link", "left_elbow_link", "right_elbow_link"],
+    "unitree_g1": ["left_ankle_roll_link", "right_ankle_roll_link", "left_elbow_roll_link", "right_elbow_roll_link"],
+    "tienkung_1": ["ankle_roll_l_link", "ankle_roll_r_link", "L_hand_base_link", "R_hand_base_link"],
+}
+
+
+def _reference_motion(ik, frames, seed):
+    km = ik.kinematics
+    rng = np.random.default_rng(seed)
+    lower = np.where(np.isfinite(km.lower), km.lower, -np.pi)
+    upper = np.where(np.isfinite(km.upper), km.upper, np.pi)
+    center, amplitude = (lower + upper) / 2, (upper - lower) / 4
+    t = np.arange(frames)[:, None] / 100.0
+    q = center + amplitude * np.sin(2 * np.pi * rng.uniform(0.2, 1.0, km.nq) * t + rng.uniform(0, 2 * np.pi, km.nq))
+    return km.forward(q)[:, ik.target_ids][..., :3, 3]
+
+
+def main(args):
+    print(f"{'Robot':<12} {'DOF':>4} {'Frames':>7} {'FPS':>9} {'Median mm':>10} {'Max mm':>8}")
+    for name in args.robots:
+        ik = BatchIK.from_model(name, TARGET_LINKS[name])
+        targets = _reference_motion(ik, args.frames, args.seed)
+        result = ik.solve_sequence(targets, batch_size=args.batch_size)
+        print(
+            f"{name:<12} {ik.kinematics.nq:>4} {args.frames:>7} {result.fps:>9.0f} "
+            f"{np.median(result.error) * 1e3:>10.2f} {result.error.max() * 1e3:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched IK retargeting throughput")
+    parser.add_argument("--robots", nargs="+", default=list(TARGET_LINKS), choices=list(TARGET_LINKS),
+                        help="Robots to benchmark")
+    parser.add_argument("--frames", type=int, default=2000, help="Length of the reference motion")
+    parser.add_argument("--batch-size", type=int, default=64, help="Number of segments solved in parallel")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the reference motion")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,89 @@
+"""Benchmark simulation step cost before and after model reduction.
+
+Loads each bundled model in MuJoCo as shipped and after
+``openrd.reduce`` (fixed-joint lumping plus any requested locks), then times
+``mj_step``. MuJoCo fuses static URDF bodies on import by default; URDF runs
+disable that (``fusestatic="false"``) to reflect simulators that keep one
+body per link, such as PyBullet, Gazebo and Isaac Sim.
+
+Usage:
+    python benchmarks/bench_reduce.py [--robots unitree_g1 fourier_gr3] [--steps 2000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+import mujoco
+
+from openrd import get_model_path
+
+
+def _load(path, model_format):
+    if model_format == "urdf":
+        robot = ET.parse(path).getroot()
+        mujoco_el = robot.find("mujoco")
+        if mujoco_el is None:
+            mujoco_el = ET.SubElement(robot, "mujoco")
+        compiler = mujoco_el.find("compiler")
+        if compiler is None:
+            compiler = ET.SubElement(mujoco_el, "compiler")
+        compiler.set("fusestatic", "false")
+        text = ET.tostring(robot, encoding="unicode")
+        # Write next to the source so relative mesh paths keep resolving
+        fd, tmp = tempfile.mkstemp(suffix=".urdf", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            start = time.perf_counter()
+            model = mujoco.MjModel.from_xml_path(tmp)
+        finally:
+            os.remove(tmp)
+    else:
+        start = time.perf_counter()
+        model = mujoco.MjModel.from_xml_path(path)
+    return model, time.perf_counter() - start
+
+
+def _step_time(model, steps):
+    data = mujoco.MjData(model)
+    mujoco.mj_forward(model, data)
+    start = time.perf_counter()
+    for _ in range(steps):
+        mujoco.mj_step(model, data)
+    return (time.perf_counter() - start) / steps
+
+
+def main(args):
+    print(f"{'Robot':<14} {'Format':<6} {'Model':<8} {'Bodies':>6} {'Load ms':>8} {'Step us':>8}")
+    for name in args.robots:
+        for model_format in ("urdf", "mjcf"):
+            try:
+                original = get_model_path(name, model_format=model_format)
+                reduced = get_model_path(name, model_format=model_format, reduction={"fixed_base": True})
+                rows = [("original", *_load(original, model_format)), ("reduced", *_load(reduced, model_format))]
+            except (ValueError, mujoco.FatalError) as e:
+                print(f"{name:<14} {model_format:<6} skipped: {str(e).splitlines()[0]}")
+                continue
+            for label, model, load_time in rows:
+                step = _step_time(model, args.steps)
+                print(
+                    f"{name:<14} {model_format:<6} {label:<8} {model.nbody:>6} "
+                    f"{load_time * 1e3:>8.1f} {step * 1e6:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark mj_step before and after model reduction")
+    parser.add_argument(
+        "--robots",
+        nargs="+",
+        default=["bruce", "fourier_gr3", "rewr1_1", "tienkung_1", "unitree_g1", "unitree_h1"],
+        help="Robots to benchmark",
+    )
+    parser.add_argument("--steps", type=int, default=2000, help="Number of mj_step calls per model")
+    args = parser.parse_args()
+
+    main(args)
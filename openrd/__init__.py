@@ -26,28 +26,50 @@ __author__ = "Synria Robotics Team"
 __copyright__ = "Copyright (c) 2025 Synria Robotics Co., Ltd."
 __license__ = "GPL-3.0"
 
+import importlib
+import os
+import time
 
-# Export subpackages, allowing access via `openrd.urdf` / `openrd.mjcf` / `openrd.meshes`
-from . import urdf  # noqa: F401
-from . import mjcf  # noqa: F401
-from . import meshes  # noqa: F401
+from . import _stats
 
+_import_start = time.perf_counter()
 
-def get_model_path(name, version=None, variant=None, model_format="urdf"):
+# Subpackages `openrd.urdf` / `openrd.mjcf` / `openrd.meshes` are imported on
+# first access, and the robot packages below them on first lookup, so a
+# single model lookup does not import every robot package
+_SUBPACKAGES = ("urdf", "mjcf", "meshes")
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _format_module(model_format):
+    if model_format not in ("urdf", "mjcf"):
+        raise ValueError(f"Unsupported model format: {model_format}. Use 'urdf' or 'mjcf'.")
+    return importlib.import_module(f".{model_format}", __name__)
+
+
+@_stats.timed("get_model_path")
+def get_model_path(name, version=None, variant=None, model_format="urdf", reduction=None, mirror_meshes=False):
     """Get robot model file path.
 
     :param name: Robot name, e.g., 'bruce', 'fourier_gr3', 'unitree_g1', 'unitree_h1', 'rewr1_1', 'smpl'
     :param version: Robot version, optional for most robots
     :param variant: Variant name, optional for most robots (required for some like 'smpl')
     :param model_format: Model format, 'urdf' or 'mjcf', default is 'urdf'
-    :return: Absolute path to the model file
+    :param reduction: Optional dict of reduction options (see :mod:`openrd.reduce`),
+        e.g. ``{"root": "pelvis", "lock": {"waist_yaw_joint": 0.0}}``; returns the
+        path of a cached reduced variant instead of the bundled file
+    :param mirror_meshes: If True, return a cached variant that references the
+        canonical mesh with a negative scale for every mirrored mesh listed in
+        ``meshes/<robot>/mirrors.json`` (see :mod:`openrd.mirror`)
+    :return: Absolute path to the model file. Models missing on disk but packed
+        in an archive (see :mod:`openrd.archive`) are extracted to the cache.
     """
-    if model_format == "urdf":
-        model_module = urdf
-    elif model_format == "mjcf":
-        model_module = mjcf
-    else:
-        raise ValueError(f"Unsupported model format: {model_format}. Use 'urdf' or 'mjcf'.")
+    model_module = _format_module(model_format)
 
     # Build version module name (most robots don't have version in module name)
     if version:
@@ -139,110 +161,154 @@ def get_model_path(name, version=None, variant=None, model_format="urdf"):
             f"All available models:\n{available_info}"
         )
 
-    return model_path
+    if not os.path.exists(model_path):
+        # Pruned install: serve the model (and its meshes) from a packed archive
+        from .archive import extract_path
 
+        model_path = extract_path(model_path) or model_path
 
-def list_available_models(model_format="urdf", show_path=False):
-    """List all available robot models in a table format.
+    if reduction is not None:
+        from .reduce import reduce_file
 
-    :param model_format: Model format to list, 'urdf' or 'mjcf', default is 'urdf'
-    :param show_path: If True, include file path column in the table
-    :return: Formatted string table showing name, version, variant, and optionally path
-    """
-    if model_format == "urdf":
-        model_module = urdf
-    elif model_format == "mjcf":
-        model_module = mjcf
-    else:
-        raise ValueError(f"Unsupported model format: {model_format}. Use 'urdf' or 'mjcf'.")
+        model_path = reduce_file(model_path, model_format=model_format, **reduction)
 
-    # Collect all models
-    models = []
+    if mirror_meshes:
+        from .mirror import mirror_model_references
 
-    # Get all version modules
-    version_modules = [attr for attr in dir(model_module) if not attr.startswith('_')]
-    
-    for version_module_name in version_modules:
+        model_path = mirror_model_references(model_path, model_format=model_format)
+
+    return model_path
+
+
+def _parse_module_name(version_module_name):
+    """Split a robot module name into ``(name, version)``; version is None if absent."""
+    # For Open-Robot-Descriptions, most robots don't have version in module name
+    # Examples: bruce, fourier_gr3, unitree_g1, rewr1_1, smpl
+    # Some might have version like: name_version
+    parts = version_module_name.split('_')
+    # Try to detect if there's a version (starting with 'v' followed by numbers)
+    version_idx = None
+    for i in range(len(parts)):
+        if parts[i].startswith('v') and parts[i][1:].replace('_', '').replace('.', '').isdigit():
+            version_idx = i
+            break
+
+    if version_idx:
+        return '_'.join(parts[:version_idx]), '_'.join(parts[version_idx:])
+    # No version detected, use module name as robot name
+    return version_module_name, None
+
+
+def _module_models(version_module, name, version, model_format):
+    """Yield the model dicts of one robot module, sorted by variant (None first)."""
+    # Get all variant objects from version module
+    excluded_attrs = {'os', 'SimpleNamespace', 'types', 'abspath', 'dirname', 'join', '__builtins__',
+                      '__cached__', '__doc__', '__file__', '__loader__', '__name__', '__package__', '__spec__', '_MODULE_PATH'}
+    variant_attrs = [attr for attr in dir(version_module)
+                    if not attr.startswith('_') and attr not in excluded_attrs]
+
+    models = []
+    for variant_attr in variant_attrs:
         try:
-            version_module = getattr(model_module, version_module_name)
-            
-            # Parse robot name and version from module name
-            # For Open-Robot-Descriptions, most robots don't have version in module name
-            # Examples: bruce, fourier_gr3, unitree_g1, rewr1_1, smpl
-            # Some might have version like: name_version
-            parts = version_module_name.split('_')
-            # Try to detect if there's a version (starting with 'v' followed by numbers)
-            version_idx = None
-            for i in range(len(parts)):
-                if parts[i].startswith('v') and parts[i][1:].replace('_', '').replace('.', '').isdigit():
-                    version_idx = i
-                    break
-            
-            if version_idx:
-                name = '_'.join(parts[:version_idx])
-                version = '_'.join(parts[version_idx:])
-            else:
-                # No version detected, use module name as robot name
-                name = version_module_name
-                version = None
-
-            # Get all variant objects from version module
-            excluded_attrs = {'os', 'SimpleNamespace', 'types', 'abspath', 'dirname', 'join', '__builtins__',
-                              '__cached__', '__doc__', '__file__', '__loader__', '__name__', '__package__', '__spec__', '_MODULE_PATH'}
-            variant_attrs = [attr for attr in dir(version_module)
-                            if not attr.startswith('_') and attr not in excluded_attrs]
-            
-            for variant_attr in variant_attrs:
-                try:
-                    variant_obj = getattr(version_module, variant_attr)
-                    # Skip if it's a module or standard library object
-                    if isinstance(variant_obj, type) or hasattr(variant_obj, '__module__') and variant_obj.__module__ in ('types', 'os', 'builtins'):
-                        continue
-                    # Map model format to actual attribute name (mjcf uses 'xml')
-                    format_attr = 'xml' if model_format == 'mjcf' else model_format
-                    # Check if this variant object has the requested format
-                    if hasattr(variant_obj, format_attr):
-                        # Get path if requested
-                        path = getattr(variant_obj, format_attr) if show_path else None
-                        
-                        # For Open-Robot-Descriptions, variant detection:
-                        # - If variant_attr matches a common pattern of the robot name (e.g., bruce.bruce, gr3 in fourier_gr3), it's no variant
-                        # - Check if variant_attr is part of the robot name pattern
-                        # Simple robots without variants have object name matching part of module name
-                        name_parts = name.lower().split('_')
-                        variant_lower = variant_attr.lower()
-                        name_lower = name.lower()
-                        
-                        # Check if variant_attr matches robot name or is a subset of it
-                        if (variant_lower == name_lower or 
-                            variant_attr == name or 
-                            variant_lower in name_parts or
-                            (version and variant_attr == f"{name}_{version}")):
-                            variant = None
-                        # Check if it looks like a version number (e.g., bruce contains date)
-                        elif '_' in variant_attr and any(char.isdigit() for char in variant_attr):
-                            # This might be a version-like variant, but we'll treat it as variant
-                            variant = variant_attr
-                        else:
-                            variant = variant_attr
-                        
-                        model_entry = {
-                            'name': name,
-                            'version': version,
-                            'variant': variant or '-',
-                            'format': model_format
-                        }
-                        if show_path:
-                            model_entry['path'] = path
-                        models.append(model_entry)
-                except (AttributeError, TypeError):
-                    continue
-                    
+            variant_obj = getattr(version_module, variant_attr)
+            # Skip if it's a module or standard library object
+            if isinstance(variant_obj, type) or hasattr(variant_obj, '__module__') and variant_obj.__module__ in ('types', 'os', 'builtins'):
+                continue
+            # Map model format to actual attribute name (mjcf uses 'xml')
+            format_attr = 'xml' if model_format == 'mjcf' else model_format
+            # Check if this variant object has the requested format
+            if hasattr(variant_obj, format_attr):
+                path = getattr(variant_obj, format_attr)
+
+                # For Open-Robot-Descriptions, variant detection:
+                # - If variant_attr matches a common pattern of the robot name (e.g., bruce.bruce, gr3 in fourier_gr3), it's no variant
+                # - Check if variant_attr is part of the robot name pattern
+                # Simple robots without variants have object name matching part of module name
+                name_parts = name.lower().split('_')
+                variant_lower = variant_attr.lower()
+                name_lower = name.lower()
+
+                # Check if variant_attr matches robot name or is a subset of it
+                if (variant_lower == name_lower or
+                    variant_attr == name or
+                    variant_lower in name_parts or
+                    (version and variant_attr == f"{name}_{version}")):
+                    variant = None
+                # Check if it looks like a version number (e.g., bruce contains date)
+                elif '_' in variant_attr and any(char.isdigit() for char in variant_attr):
+                    # This might be a version-like variant, but we'll treat it as variant
+                    variant = variant_attr
+                else:
+                    variant = variant_attr
+
+                models.append({
+                    'name': name,
+                    'version': version,
+                    'variant': variant,
+                    'format': model_format,
+                    'path': path,
+                })
         except (AttributeError, TypeError):
             continue
+    models.sort(key=lambda x: x['variant'] or '')
+    return models
+
+
+def iter_models(model_format="urdf", name=None):
+    """Iterate over registered models as structured records.
+
+    Records are produced one robot package at a time, importing each package
+    only when the iteration reaches it (with ``name``, only the packages of
+    that robot are imported). Unlike :func:`list_available_models`, no table
+    is built.
+
+    :param model_format: 'urdf', 'mjcf', or None for both formats
+    :param name: Only yield models of this robot, optional
+    :return: Generator of dicts with 'name', 'version' (None if absent),
+        'variant' (None if absent), 'format' and 'path', ordered by module
+        name, format and variant. 'name', 'version', 'variant' and 'format'
+        can be passed to :func:`get_model_path` as is (as ``model_format``).
+    """
+    formats = ("urdf", "mjcf") if model_format is None else (model_format,)
+    modules = {fmt: _format_module(fmt) for fmt in formats}
+    # Get all version modules
+    version_module_names = sorted({attr for model_module in modules.values() for attr in dir(model_module)
+                                   if not attr.startswith('_')})
+    for version_module_name in version_module_names:
+        robot, version = _parse_module_name(version_module_name)
+        if name is not None and robot != name:
+            continue
+        for fmt, model_module in modules.items():
+            try:
+                version_module = getattr(model_module, version_module_name)
+            except (AttributeError, TypeError, ImportError):
+                continue
+            yield from _module_models(version_module, robot, version, fmt)
+
+
+def _collect_models(model_format="urdf"):
+    """Collect registered models of one format as dicts.
+
+    :param model_format: Model format to list, 'urdf' or 'mjcf'
+    :return: List of dicts with 'name', 'version', 'variant' ('-' if none),
+        'format' and 'path', sorted by name, version and variant
+    """
+    models = [dict(model, variant=model['variant'] or '-') for model in iter_models(model_format)]
 
     # Sort models by name, version, variant
     models.sort(key=lambda x: (x['name'], x['version'] or '', x['variant']))
+    return models
+
+
+@_stats.timed("list_available_models")
+def list_available_models(model_format="urdf", show_path=False):
+    """List all available robot models in a table format.
+
+    :param model_format: Model format to list, 'urdf' or 'mjcf', default is 'urdf'
+    :param show_path: If True, include file path column in the table
+    :return: Formatted string table showing name, version, variant, and optionally path
+    """
+    models = _collect_models(model_format)
 
     # Format as table
     if not models:
@@ -277,12 +343,45 @@ def list_available_models(model_format="urdf", show_path=False):
     return '\n'.join(lines)
 
 
+def enable_stats(enabled=True):
+    """Turn the loader instrumentation on or off.
+
+    Setting ``$OPENRD_PROFILE`` before importing openrd enables it too and
+    dumps a profile at exit (``1`` or ``stderr`` prints to stderr, any other
+    value is a JSON output path where ``{pid}`` is replaced by the process
+    id). Empty, ``0``, ``false`` and ``off`` (any case) leave it disabled.
+
+    :param enabled: True to start recording, False to stop
+    """
+    _stats.enabled = bool(enabled)
+
+
+def stats(reset=False):
+    """Return a snapshot of the loader instrumentation.
+
+    :param reset: Clear the recorded data after taking the snapshot
+    :return: Dict with 'enabled', 'import_seconds' (wall time of ``import
+        openrd``), 'calls' (per entry point: 'count', 'total', 'mean', 'min',
+        'max', 'p50', 'p90', 'p99' in seconds and 'histogram' as
+        ``[upper bound in seconds, count]`` pairs), 'bytes_read' (per robot,
+        '-' for files outside a robot directory) and 'cache' (per cache:
+        'hits', 'misses')
+    """
+    return _stats.snapshot(reset=reset)
+
+
+_stats.import_seconds = time.perf_counter() - _import_start
+
+
 __all__ = [
     "urdf",
     "mjcf",
     "meshes",
     "get_model_path",
+    "iter_models",
     "list_available_models",
+    "enable_stats",
+    "stats",
     "__version__",
     "__author__",
     "__license__",
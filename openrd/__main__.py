@@ -0,0 +1,5 @@
+"""``python -m openrd``: same as the ``openrd`` console script, see :mod:`openrd.cli`."""
+
+from .cli import main
+
+main()
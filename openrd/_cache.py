@@ -0,0 +1,66 @@
+"""On-disk cache shared by the openrd model tools.
+
+Generated artifacts (reduced models, converted models, ...) are written below
+``$OPENRD_CACHE_DIR`` if set, otherwise ``~/.cache/openrd``. Entries are keyed
+by a content hash so stale files are never reused after a source changes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+def cache_dir(*parts):
+    """Return (and create) a directory inside the openrd cache.
+
+    :param parts: Optional sub-directory components, e.g. ``("reduced",)``
+    :return: Absolute path of the directory
+    """
+    root = os.environ.get("OPENRD_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "openrd"
+    )
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def hash_bytes(data):
+    """Return the hex SHA-256 digest of ``data``."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """Return the hex SHA-256 digest of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_key(*items):
+    """Return a short stable key for a mix of file hashes and JSON-able options."""
+    payload = json.dumps(items, sort_keys=True, default=str).encode("utf-8")
+    return hash_bytes(payload)[:16]
+
+
+def atomic_write(path, data):
+    """Write ``data`` (bytes or str) to ``path`` atomically.
+
+    Concurrent writers of the same cache entry never expose a partial file.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
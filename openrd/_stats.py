@@ -0,0 +1,194 @@
+"""Opt-in instrumentation of the openrd entry points and loaders.
+
+Disabled by default: instrumented functions then only test one module
+global before calling through. Enable it with ``openrd.enable_stats()`` or
+by setting ``$OPENRD_PROFILE`` before importing openrd:
+
+- ``OPENRD_PROFILE=1`` prints a profile to stderr at interpreter exit
+- ``OPENRD_PROFILE=/tmp/openrd-{pid}.json`` writes it as JSON instead
+  (``{pid}`` is replaced by the process id, for worker pools)
+- empty, ``0``, ``false`` and ``off`` leave it disabled
+
+While enabled, the module records per-call latency histograms (power-of-two
+microsecond buckets), bytes read per robot and hit/miss counts of the
+on-disk caches. :func:`openrd.stats` returns a snapshot.
+"""
+
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV = "OPENRD_PROFILE"
+# Values of $OPENRD_PROFILE that leave the instrumentation off
+_DISABLED_VALUES = ("", "0", "false", "off")
+
+enabled = os.environ.get(PROFILE_ENV, "").strip().lower() not in _DISABLED_VALUES
+# Wall time of ``import openrd``, set by the package once imported
+import_seconds = None
+
+_lock = threading.Lock()
+_calls = {}
+_bytes = {}
+_cache_events = {}
+
+_SECTIONS = ("urdf", "mjcf", "meshes")
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        # buckets[k] counts calls taking less than 2**k microseconds (and at least 2**(k-1))
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        k = int(seconds * 1e6).bit_length()
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def quantile(self, q):
+        target = q * self.count
+        seen = 0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen >= target:
+                return min(2.0 ** k * 1e-6, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            # (upper bound in seconds, count) per non-empty bucket
+            "histogram": [[2.0 ** k * 1e-6, n] for k, n in sorted(self.buckets.items())],
+        }
+
+
+def timed(name):
+    """Decorator recording the latency of every call under ``name`` while enabled."""
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_call(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+def record_call(name, seconds):
+    with _lock:
+        histogram = _calls.get(name)
+        if histogram is None:
+            histogram = _calls[name] = _Histogram()
+        histogram.add(seconds)
+
+
+def robot_of(path):
+    """Robot directory name of a package (or extracted archive) path, '-' if unknown."""
+    parts = os.path.normpath(path).replace(os.sep, "/").split("/")
+    for i in range(len(parts) - 2, -1, -1):
+        if parts[i] in _SECTIONS:
+            return parts[i + 1]
+    return "-"
+
+
+def add_bytes(path, size=None):
+    """Count ``size`` bytes (default: the file size) read from ``path``."""
+    if not enabled:
+        return
+    if size is None:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+    robot = robot_of(path)
+    with _lock:
+        _bytes[robot] = _bytes.get(robot, 0) + size
+
+
+def cache_event(name, hit):
+    """Count a hit (or miss) of the cache ``name``."""
+    if not enabled:
+        return
+    with _lock:
+        counts = _cache_events.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+def snapshot(reset=False):
+    with _lock:
+        result = {
+            "enabled": enabled,
+            "import_seconds": import_seconds,
+            "calls": {name: h.snapshot() for name, h in sorted(_calls.items())},
+            "bytes_read": dict(sorted(_bytes.items())),
+            "cache": {name: {"hits": hits, "misses": misses}
+                      for name, (hits, misses) in sorted(_cache_events.items())},
+        }
+        if reset:
+            _calls.clear()
+            _bytes.clear()
+            _cache_events.clear()
+    return result
+
+
+def format_report(data):
+    """Render a :func:`snapshot` as a text table."""
+    lines = [f"openrd profile (pid {os.getpid()})"]
+    if data["import_seconds"] is not None:
+        lines[0] += f": import {data['import_seconds'] * 1e3:.1f} ms"
+    if data["calls"]:
+        width = max(len("Call"), max(len(name) for name in data["calls"]))
+        lines.append(f"{'Call':<{width}} {'Count':>7} {'Total ms':>10} {'Mean ms':>9} {'p50 ms':>8} "
+                     f"{'p90 ms':>8} {'p99 ms':>8} {'Max ms':>8}")
+        for name, c in data["calls"].items():
+            lines.append(f"{name:<{width}} {c['count']:>7} {c['total'] * 1e3:>10.2f} {c['mean'] * 1e3:>9.3f} "
+                         f"{c['p50'] * 1e3:>8.3f} {c['p90'] * 1e3:>8.3f} {c['p99'] * 1e3:>8.3f} "
+                         f"{c['max'] * 1e3:>8.3f}")
+    if data["bytes_read"]:
+        lines.append("Bytes read: " + ", ".join(f"{robot} {n / 1e6:.2f} MB" for robot, n in data["bytes_read"].items()))
+    if data["cache"]:
+        lines.append("Cache: " + ", ".join(f"{name} {c['hits']} hit / {c['misses']} miss"
+                                           for name, c in data["cache"].items()))
+    return "\n".join(lines)
+
+
+def _dump():
+    target = os.environ.get(PROFILE_ENV)
+    data = snapshot()
+    if target in ("1", "stderr"):
+        print(format_report(data), file=sys.stderr)
+        return
+    import json
+
+    from ._cache import atomic_write
+
+    atomic_write(target.replace("{pid}", str(os.getpid())), json.dumps(data, indent=2))
+
+
+if enabled:
+    atexit.register(_dump)
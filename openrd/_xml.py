@@ -0,0 +1,217 @@
+"""XML helpers shared by the URDF / MJCF writers (reduce, convert, gltf, ...).
+
+- :func:`format_floats` formats numbers the way every generated file does
+- URDF: :func:`set_origin`, :func:`set_inertial`, :func:`absolutize_urdf_paths`
+- MJCF: :class:`MJCFFrames` reads and writes local frames honoring the
+  ``<compiler>`` angle settings, :class:`MJCFDefaults` resolves attributes
+  through ``<default>`` classes, :func:`set_mjcf_inertial`,
+  :func:`absolutize_mjcf_paths`
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from .transforms import axis_angle_to_matrix, make_transform, matrix_to_quat, quat_to_matrix, transform_to_origin
+
+
+def format_floats(values):
+    """Space-separated values with 9 significant digits."""
+    return " ".join(f"{float(v):.9g}" for v in np.ravel(values))
+
+
+# ---------------------------------------------------------------------------
+# URDF
+# ---------------------------------------------------------------------------
+
+def set_origin(element, T):
+    """Set the ``<origin>`` of a URDF element to the transform ``T``."""
+    origin = element.find("origin")
+    if origin is None:
+        origin = ET.Element("origin")
+        element.insert(0, origin)
+    xyz, rpy = transform_to_origin(T)
+    origin.set("xyz", format_floats(xyz))
+    origin.set("rpy", format_floats(rpy))
+
+
+def set_inertial(link_el, mass, com, inertia):
+    """Replace the ``<inertial>`` of a URDF link (``inertia`` about ``com``, link axes)."""
+    inertial = link_el.find("inertial")
+    if inertial is None:
+        inertial = ET.Element("inertial")
+        link_el.insert(0, inertial)
+    for child in list(inertial):
+        inertial.remove(child)
+    ET.SubElement(inertial, "origin", xyz=format_floats(com), rpy="0 0 0")
+    ET.SubElement(inertial, "mass", value=f"{mass:.9g}")
+    ET.SubElement(
+        inertial,
+        "inertia",
+        ixx=f"{inertia[0, 0]:.9g}",
+        ixy=f"{inertia[0, 1]:.9g}",
+        ixz=f"{inertia[0, 2]:.9g}",
+        iyy=f"{inertia[1, 1]:.9g}",
+        iyz=f"{inertia[1, 2]:.9g}",
+        izz=f"{inertia[2, 2]:.9g}",
+    )
+
+
+def absolutize_urdf_paths(robot_el, base_dir):
+    """Make relative mesh and asset paths absolute so the file can be written elsewhere."""
+    for mesh in robot_el.iter("mesh"):
+        filename = mesh.get("filename")
+        if filename and not filename.startswith(("package://", "file://")) and not os.path.isabs(filename):
+            mesh.set("filename", os.path.normpath(os.path.join(base_dir, filename)))
+    for compiler in robot_el.iter("compiler"):
+        for attr in ("meshdir", "texturedir", "assetdir"):
+            value = compiler.get(attr)
+            if value and not os.path.isabs(value):
+                compiler.set(attr, os.path.normpath(os.path.join(base_dir, value)))
+
+
+# ---------------------------------------------------------------------------
+# MJCF
+# ---------------------------------------------------------------------------
+
+# MJCF attributes that set the orientation of a frame
+ORIENTATION_ATTRS = ("quat", "axisangle", "euler", "xyaxes", "zaxis")
+
+
+class MJCFFrames:
+    """Read/write MJCF local frames honoring the ``<compiler>`` angle settings."""
+
+    def __init__(self, mujoco_el):
+        compiler = mujoco_el.find("compiler")
+        self.degrees = compiler is None or compiler.get("angle", "degree") == "degree"
+        self.eulerseq = compiler.get("eulerseq", "xyz") if compiler is not None else "xyz"
+
+    def rotation(self, el):
+        if el.get("quat"):
+            return quat_to_matrix([float(v) for v in el.get("quat").split()])
+        if el.get("axisangle"):
+            x, y, z, a = (float(v) for v in el.get("axisangle").split())
+            axis = np.array([x, y, z])
+            axis /= np.linalg.norm(axis)
+            return axis_angle_to_matrix(axis, np.radians(a) if self.degrees else a)
+        if el.get("euler"):
+            angles = [float(v) for v in el.get("euler").split()]
+            if self.degrees:
+                angles = np.radians(angles)
+            R = np.eye(3)
+            for axis_name, angle in zip(self.eulerseq, angles):
+                axis = np.eye(3)["xyz".index(axis_name.lower())]
+                step = axis_angle_to_matrix(axis, angle)
+                # Lower case: rotations about moving axes; upper case: fixed axes
+                R = R @ step if axis_name.islower() else step @ R
+            return R
+        if el.get("xyaxes"):
+            v = np.array([float(t) for t in el.get("xyaxes").split()])
+            x = v[:3] / np.linalg.norm(v[:3])
+            y = v[3:] - np.dot(v[3:], x) * x
+            y /= np.linalg.norm(y)
+            return np.column_stack([x, y, np.cross(x, y)])
+        if el.get("zaxis"):
+            z = np.array([float(t) for t in el.get("zaxis").split()])
+            z /= np.linalg.norm(z)
+            axis = np.cross([0.0, 0.0, 1.0], z)
+            s = np.linalg.norm(axis)
+            if s < 1e-12:
+                return np.eye(3) if z[2] > 0 else np.diag([1.0, -1.0, -1.0])
+            return axis_angle_to_matrix(axis / s, np.arctan2(s, z[2]))
+        return np.eye(3)
+
+    def transform(self, el):
+        pos = [float(v) for v in el.get("pos", "0 0 0").split()]
+        return make_transform(self.rotation(el), pos)
+
+    @staticmethod
+    def set_transform(el, T):
+        for attr in ORIENTATION_ATTRS:
+            el.attrib.pop(attr, None)
+        el.set("pos", format_floats(T[:3, 3]))
+        q = matrix_to_quat(T[:3, :3])
+        if not np.allclose(q, [1, 0, 0, 0], atol=1e-12):
+            el.set("quat", format_floats(q))
+
+    def apply(self, el, T):
+        """Pre-multiply the local frame of ``el`` by ``T``."""
+        if el.tag == "geom" and el.get("fromto"):
+            v = np.array([float(t) for t in el.get("fromto").split()])
+            a = T[:3, :3] @ v[:3] + T[:3, 3]
+            b = T[:3, :3] @ v[3:] + T[:3, 3]
+            el.set("fromto", format_floats(np.concatenate([a, b])))
+            return
+        if el.tag == "light" and el.get("dir"):
+            d = np.array([float(t) for t in el.get("dir").split()])
+            el.set("dir", format_floats(T[:3, :3] @ d))
+        self.set_transform(el, T @ self.transform(el))
+
+    def inertial(self, body_el):
+        """Return ``(mass, com, inertia)`` of the explicit ``<inertial>`` of a body."""
+        inertial = body_el.find("inertial")
+        T = self.transform(inertial)
+        mass = float(inertial.get("mass"))
+        if inertial.get("fullinertia"):
+            xx, yy, zz, xy, xz, yz = (float(v) for v in inertial.get("fullinertia").split())
+            I = np.array([[xx, xy, xz], [xy, yy, yz], [xz, yz, zz]])
+        else:
+            I = np.diag([float(v) for v in inertial.get("diaginertia", "0 0 0").split()])
+        R = T[:3, :3]
+        return mass, T[:3, 3], R @ I @ R.T
+
+
+class MJCFDefaults:
+    """Resolve element attributes through MJCF ``<default>`` classes."""
+
+    def __init__(self, mujoco_el):
+        self.classes = {}
+        for top in mujoco_el.findall("default"):
+            self._visit(top, {})
+
+    def _visit(self, el, inherited):
+        attrs = {tag: dict(values) for tag, values in inherited.items()}
+        for child in el:
+            if child.tag != "default":
+                attrs.setdefault(child.tag, {}).update(child.attrib)
+        self.classes[el.get("class", "main")] = attrs
+        for child in el.findall("default"):
+            self._visit(child, attrs)
+
+    def resolve(self, el, childclass=None):
+        cls = el.get("class") or childclass or "main"
+        return {**self.classes.get(cls, {}).get(el.tag, {}), **el.attrib}
+
+
+def set_mjcf_inertial(body_el, mass, com, inertia):
+    """Replace the ``<inertial>`` of an MJCF body (``inertia`` about ``com``, body axes)."""
+    inertial = body_el.find("inertial")
+    if inertial is None:
+        inertial = ET.Element("inertial")
+        body_el.insert(0, inertial)
+    inertial.attrib.clear()
+    inertial.set("pos", format_floats(com))
+    inertial.set("mass", f"{mass:.9g}")
+    inertial.set(
+        "fullinertia",
+        format_floats([inertia[0, 0], inertia[1, 1], inertia[2, 2], inertia[0, 1], inertia[0, 2], inertia[1, 2]]),
+    )
+
+
+def absolutize_mjcf_paths(mujoco_el, base_dir):
+    """Make asset directories and includes absolute so the file can be written elsewhere."""
+    compiler = mujoco_el.find("compiler")
+    if compiler is None:
+        compiler = ET.Element("compiler")
+        mujoco_el.insert(0, compiler)
+    for attr in ("meshdir", "texturedir", "assetdir"):
+        value = compiler.get(attr)
+        if value and not os.path.isabs(value):
+            compiler.set(attr, os.path.normpath(os.path.join(base_dir, value)))
+    if not compiler.get("meshdir") and not compiler.get("assetdir"):
+        compiler.set("assetdir", os.path.normpath(base_dir))
+    for include in mujoco_el.iter("include"):
+        value = include.get("file")
+        if value and not os.path.isabs(value):
+            include.set("file", os.path.normpath(os.path.join(base_dir, value)))
@@ -0,0 +1,326 @@
+"""Single-file packed model archives with mmap-based random access.
+
+The package ships hundreds of loose model and mesh files; on network file
+systems and container layers every ``open``/``stat`` costs more than reading
+the data. An archive packs the files of some (or all) robots into one
+indexed file that readers open once and slice with ``mmap``.
+
+Layout (little endian)::
+
+    b"ORDA" | version u32 | index size u64 | JSON index | member data ...
+
+The index maps member names (paths relative to the package directory, e.g.
+``urdf/unitree_g1/g1.urdf`` or ``meshes/unitree_g1/pelvis.STL``) to
+``[offset, size, sha256]`` with offsets relative to the start of the member
+data. It sits right after the header so opening an archive reads one
+contiguous block.
+
+Archives are either per robot (``<robot>.orda``) or cover the whole catalog;
+small per-robot archives load fastest from a cold cache (see
+``benchmarks/bench_archive.py``). They are found in ``$OPENRD_ARCHIVE``
+(``os.pathsep``-separated paths) and as ``*.orda`` files in the package
+directory. Loose files always take
+precedence; members of pruned installs are served from the archives:
+
+- :func:`openrd.get_model_path` extracts the model together with its robot's
+  mesh directory into ``<cache>/archive`` (consumers need real file paths)
+- :func:`openrd.mesh_loader.load_mesh` parses meshes straight from the mapped
+  archive; :func:`openrd.mesh_loader.resolve_mesh_path` extracts on demand
+
+Usage::
+
+    python -m openrd.archive build [--robots unitree_g1 unitree_h1] [--output openrd/openrd.orda]
+    python -m openrd.archive build --per-robot [--output openrd]   # openrd/<robot>.orda
+    python -m openrd.archive list openrd/openrd.orda
+    python -m openrd.archive verify openrd/openrd.orda
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from . import _cache, _stats
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ARCHIVE = os.path.join(PACKAGE_DIR, "openrd.orda")
+
+MAGIC = b"ORDA"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+
+_SECTIONS = ("urdf", "mjcf", "meshes")
+
+
+def _robot_names():
+    names = set()
+    for section in _SECTIONS:
+        section_dir = os.path.join(PACKAGE_DIR, section)
+        names.update(d for d in os.listdir(section_dir)
+                     if os.path.isdir(os.path.join(section_dir, d)) and not d.startswith("__"))
+    return sorted(names)
+
+
+def _robot_files(robot):
+    """Member names of one robot's model and mesh files, model files first."""
+    members = []
+    for section in _SECTIONS:
+        robot_dir = os.path.join(PACKAGE_DIR, section, robot)
+        for directory, dirs, files in os.walk(robot_dir):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for file_name in sorted(files):
+                if file_name.endswith((".py", ".pyc")):
+                    continue
+                path = os.path.join(directory, file_name)
+                members.append(os.path.relpath(path, PACKAGE_DIR).replace(os.sep, "/"))
+    return members
+
+
+def build_archive(path=DEFAULT_ARCHIVE, robots=None):
+    """Pack the model and mesh files of ``robots`` into one archive.
+
+    :param path: Output archive path
+    :param robots: Robot directory names, e.g. ['unitree_g1'] (default: all)
+    :return: Number of packed members
+    """
+    available = _robot_names()
+    robots = robots or available
+    unknown = [name for name in robots if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown robots: {unknown}. Available robots: {available}")
+
+    names = [name for robot in robots for name in _robot_files(robot)]
+    members, offset = {}, 0
+    for name in names:
+        source = os.path.join(PACKAGE_DIR, name)
+        size = os.path.getsize(source)
+        members[name] = [offset, size, _cache.hash_file(source)]
+        offset += size
+    index = json.dumps({"version": _VERSION, "members": members}, separators=(",", ":")).encode("utf-8")
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, _VERSION, len(index)))
+            out.write(index)
+            for name in names:
+                with open(os.path.join(PACKAGE_DIR, name), "rb") as f:
+                    out.write(f.read())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(members)
+
+
+class Archive:
+    """Read-only view of a packed archive, mapped into memory once.
+
+    :param path: Archive file path
+    :ivar members: Dict of member name -> ``(absolute offset, size, sha256)``
+    :ivar key: Short content key of the archive (changes with any member)
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"Not an openrd archive: {path}")
+        magic, version, index_size = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"Not an openrd archive: {path}")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported archive version {version} in {path}; rebuild it with this openrd version.")
+        index = self._map[_HEADER.size:_HEADER.size + index_size]
+        data_offset = _HEADER.size + index_size
+        self.members = {
+            name: (data_offset + offset, size, sha256)
+            for name, (offset, size, sha256) in json.loads(index)["members"].items()
+        }
+        self.key = hashlib.sha256(index).hexdigest()[:16]
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def __len__(self):
+        return len(self.members)
+
+    def view(self, name):
+        """Zero-copy ``memoryview`` of a member's bytes."""
+        offset, size, _ = self.members[name]
+        return memoryview(self._map)[offset:offset + size]
+
+    def read(self, name):
+        """Return a member's bytes."""
+        offset, size, _ = self.members[name]
+        return self._map[offset:offset + size]
+
+    def extract(self, name, directory=None):
+        """Write a member to ``directory`` (default: this archive's cache directory).
+
+        Members keep their package-relative layout, so relative mesh references
+        of extracted models stay valid. Existing extracted files are reused.
+
+        :return: Absolute path of the extracted file
+        """
+        directory = directory or _cache.cache_dir("archive", self.key)
+        out_path = os.path.join(directory, *name.split("/"))
+        if not (os.path.exists(out_path) and os.path.getsize(out_path) == self.members[name][1]):
+            _stats.add_bytes(name, self.members[name][1])
+            _cache.atomic_write(out_path, self.read(name))
+        return out_path
+
+    def verify(self):
+        """Return the names of members whose content does not match their hash."""
+        return [name for name, (_, _, sha256) in self.members.items()
+                if _cache.hash_bytes(self.view(name)) != sha256]
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# (value of $OPENRD_ARCHIVE, archive paths); the package directory is only scanned once
+_paths = None
+_opened = {}
+# (extraction directory, section, robot) whose robot files are already extracted;
+# the directory holds the archive key and follows $OPENRD_CACHE_DIR
+_extracted = set()
+
+
+def _archive_paths():
+    global _paths
+    env = os.environ.get("OPENRD_ARCHIVE", "")
+    if _paths is None or _paths[0] != env:
+        paths = [p for p in env.split(os.pathsep) if p]
+        paths += sorted(glob.glob(os.path.join(PACKAGE_DIR, "*.orda")))
+        _paths = (env, list(dict.fromkeys(os.path.abspath(p) for p in paths)))
+    return _paths[1]
+
+
+def _open(path):
+    archive = _opened.get(path)
+    if archive is None:
+        archive = _opened[path] = Archive(path)
+    return archive
+
+
+def archives():
+    """Archives from ``$OPENRD_ARCHIVE`` and ``*.orda`` in the package directory, opened once."""
+    return [_open(path) for path in _archive_paths()]
+
+
+def find_member(path):
+    """Locate the archive member for a package file path.
+
+    Archives are opened on first use; a per-robot archive (``<robot>.orda``)
+    is searched before the others.
+
+    :param path: Absolute path inside the package directory
+    :return: ``(archive, member name)`` or None
+    """
+    name = os.path.relpath(os.path.abspath(path), PACKAGE_DIR).replace(os.sep, "/")
+    if name.startswith("../") or not _archive_paths():
+        return None
+    robot = name.split("/")[1] if name.count("/") >= 2 else None
+    for archive_path in sorted(_archive_paths(), key=lambda p: os.path.basename(p) != f"{robot}.orda"):
+        archive = _open(archive_path)
+        if name in archive:
+            return archive, name
+    return None
+
+
+def read_member(path):
+    """Bytes of the archive member for a package file path, or None."""
+    found = find_member(path)
+    if found is None:
+        return None
+    archive, name = found
+    _stats.add_bytes(name, archive.members[name][1])
+    return archive.read(name)
+
+
+@_stats.timed("archive.extract_path")
+def extract_path(path):
+    """Real file path for a package file served from an archive.
+
+    Model files are extracted together with the other files of their robot
+    directory and the robot's mesh directory, once per process.
+
+    :param path: Absolute path inside the package directory
+    :return: Path of the extracted file, or None if no archive has it
+    """
+    found = find_member(path)
+    if found is None:
+        return None
+    archive, name = found
+    directory = _cache.cache_dir("archive", archive.key)
+    if _stats.enabled:
+        _stats.cache_event("archive", os.path.exists(os.path.join(directory, *name.split("/"))))
+    section, robot = name.split("/")[:2]
+    if section in ("urdf", "mjcf") and (directory, section, robot) not in _extracted:
+        prefixes = (f"{section}/{robot}/", f"meshes/{robot}/")
+        for member in archive.members:
+            if member.startswith(prefixes):
+                archive.extract(member, directory)
+        _extracted.add((directory, section, robot))
+    return archive.extract(name, directory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect packed model archives")
+    parser.add_argument("command", choices=["build", "list", "verify"])
+    parser.add_argument("archive", nargs="?", default=DEFAULT_ARCHIVE, help="Archive path")
+    parser.add_argument("--robots", nargs="+", default=None, help="Robots to pack (build only, default: all)")
+    parser.add_argument("--output", default=None,
+                        help="Output path, or directory with --per-robot (build only, default: the archive argument)")
+    parser.add_argument("--per-robot", action="store_true", help="Write one <robot>.orda per robot (build only)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.per_robot:
+            directory = args.output or PACKAGE_DIR
+            targets = [([robot], os.path.join(directory, f"{robot}.orda")) for robot in args.robots or _robot_names()]
+        else:
+            targets = [(args.robots, args.output or args.archive)]
+        for robots, path in targets:
+            count = build_archive(path, robots=robots)
+            print(f"✓ Packed {count} files into {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        return 0
+    with Archive(args.archive) as archive:
+        if args.command == "list":
+            for name, (_, size, _) in archive.members.items():
+                print(f"{size:>12}  {name}")
+            return 0
+        corrupt = archive.verify()
+        for name in corrupt:
+            print(f"  ✗ {name}")
+        print(f"{'✗' if corrupt else '✓'} {len(archive) - len(corrupt)} of {len(archive)} members intact")
+        return 1 if corrupt else 0
+
+
+__all__ = [
+    "MAGIC",
+    "DEFAULT_ARCHIVE",
+    "Archive",
+    "build_archive",
+    "archives",
+    "find_member",
+    "read_member",
+    "extract_path",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
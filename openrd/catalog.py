@@ -0,0 +1,359 @@
+"""Searchable catalog of the bundled robot models.
+
+Per-model properties (DOF, total mass, link count, joint names, mesh bytes,
+available formats, tags) are precomputed into ``catalog.json`` next to this
+module, so queries never parse XML. Models registered after the index was
+built are indexed on first use and cached under ``<cache>/catalog``.
+
+Usage::
+
+    from openrd.catalog import query
+
+    # Humanoids with at least 23 actuated joints shipping both URDF and MJCF
+    for model in query(tags__contains="humanoid", dof__ge=23, formats__contains=["urdf", "mjcf"],
+                       format="urdf", sort_by="-dof"):
+        print(model.name, model.dof, model.total_mass)
+
+    python -m openrd.catalog build   # regenerate catalog.json after adding models
+    python -m openrd.catalog build --only openrd/urdf/unitree_g1/g1.urdf   # re-parse changed files only
+    python -m openrd.catalog check   # exit with 1 if catalog.json is out of date
+
+Filters are keyword arguments ``<field>`` (equality) or ``<field>__<op>``
+with ``op`` one of ``eq``, ``ne``, ``lt``, ``le``, ``gt``, ``ge``, ``in``
+(field value is one of the given values) and ``contains`` (list field
+contains the value, or all given values). Models whose field is ``None``
+(e.g. unknown mass) never match a comparison.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+from . import _cache, _stats
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+_PACKAGE_DIR = os.path.dirname(INDEX_PATH)
+
+# Bump when the per-model properties change, to invalidate cached entries
+_INDEX_VERSION = 2
+
+FIELDS = ("name", "version", "variant", "format", "path", "dof", "total_mass", "link_count",
+          "joint_names", "mesh_bytes", "mesh_count", "formats", "tags")
+
+_LIMB_PARTS = {"legs": ("hip", "knee", "ankle"), "arms": ("shoulder", "elbow", "wrist")}
+_SIDES = {"left": "left", "l": "left", "right": "right", "r": "right"}
+_FINGERS = ("thumb", "index", "middle", "ring", "pinky", "finger")
+
+_OPERATORS = {
+    "eq": lambda value, arg: value == arg,
+    "ne": lambda value, arg: value != arg,
+    "lt": lambda value, arg: value is not None and value < arg,
+    "le": lambda value, arg: value is not None and value <= arg,
+    "gt": lambda value, arg: value is not None and value > arg,
+    "ge": lambda value, arg: value is not None and value >= arg,
+    "in": lambda value, arg: value in arg,
+    "contains": lambda value, arg: value is not None and all(
+        item in value for item in (arg if isinstance(arg, (list, tuple, set)) else [arg])
+    ),
+}
+
+
+def _tags(names):
+    """Structural tags derived from link / joint / body names."""
+    sides = {part: set() for parts in _LIMB_PARTS.values() for part in parts}
+    fingers = False
+    for name in names:
+        tokens = [t for t in re.split(r"[^a-z]+", re.sub(r"([a-z])([A-Z])", r"\1_\2", name).lower()) if t]
+        side = {_SIDES[t] for t in tokens if t in _SIDES}
+        for part in sides:
+            if part in tokens:
+                sides[part] |= side
+        fingers = fingers or any(t.startswith(_FINGERS) for t in tokens)
+    bilateral = {
+        limb: any(sides[part] == {"left", "right"} for part in parts) for limb, parts in _LIMB_PARTS.items()
+    }
+    tags = []
+    if bilateral["legs"] and bilateral["arms"]:
+        tags.append("humanoid")
+    if fingers:
+        tags.append("hands")
+    return tags
+
+
+def _mesh_stats(paths):
+    """Number and total on-disk size of the unique mesh files in ``paths``."""
+    unique = {os.path.normpath(p) for p in paths}
+    return len(unique), sum(os.path.getsize(p) for p in unique if os.path.exists(p))
+
+
+def _urdf_properties(path):
+    from .robot import load_urdf
+
+    model = load_urdf(path)
+    meshes = [
+        model.resolve_filename(filename)
+        for link in model.links.values()
+        for _, _, filename, _ in link.meshes()
+    ]
+    mesh_count, mesh_bytes = _mesh_stats(meshes)
+    joint_names = [joint.name for joint in model.actuated_joints]
+    return {
+        "dof": len(joint_names),
+        "total_mass": round(model.total_mass, 6),
+        "link_count": len(model.links),
+        "joint_names": joint_names,
+        "mesh_bytes": mesh_bytes,
+        "mesh_count": mesh_count,
+        "tags": _tags(list(model.links) + list(model.joints)),
+    }
+
+
+def _mjcf_properties(path):
+    root = ET.parse(path).getroot()
+    base_dir = os.path.dirname(os.path.abspath(path))
+    compiler = root.find("compiler")
+    mesh_dir = base_dir
+    if compiler is not None and (compiler.get("meshdir") or compiler.get("assetdir")):
+        mesh_dir = os.path.join(base_dir, compiler.get("meshdir") or compiler.get("assetdir"))
+    meshes = [os.path.join(mesh_dir, mesh.get("file")) for mesh in root.iter("mesh") if mesh.get("file")]
+    mesh_count, mesh_bytes = _mesh_stats(meshes)
+
+    worldbody = root.find("worldbody")
+    bodies = list(worldbody.iter("body")) if worldbody is not None else []
+    joint_names, dof = [], 0
+    for body in bodies:
+        for joint in body.findall("joint"):
+            joint_type = joint.get("type", "hinge")
+            if joint_type == "free":
+                continue
+            joint_names.append(joint.get("name", ""))
+            dof += 3 if joint_type == "ball" else 1
+    # Masses are only known without the compiler; bodies with geoms but no
+    # explicit inertial get geom-derived mass, so they make it unknown
+    from_geoms = compiler is not None and compiler.get("inertiafromgeom") == "true"
+    inertials = [body.find("inertial") for body in bodies]
+    total_mass = None
+    if bodies and not from_geoms and all(
+        inertial is not None or body.find("geom") is None for body, inertial in zip(bodies, inertials)
+    ):
+        total_mass = round(sum(float(i.get("mass", 0)) for i in inertials if i is not None), 6)
+    return {
+        "dof": dof,
+        "total_mass": total_mass,
+        "link_count": len(bodies),
+        "joint_names": joint_names,
+        "mesh_bytes": mesh_bytes,
+        "mesh_count": mesh_count,
+        "tags": _tags([body.get("name", "") for body in bodies] + joint_names),
+    }
+
+
+def model_properties(path, model_format):
+    """Compute the catalog properties of one model file (parses the XML).
+
+    :param path: Model file path
+    :param model_format: 'urdf' or 'mjcf'
+    :return: Dict with 'dof', 'total_mass', 'link_count', 'joint_names',
+        'mesh_bytes', 'mesh_count' and 'tags'
+    """
+    if model_format == "urdf":
+        return _urdf_properties(path)
+    if model_format == "mjcf":
+        return _mjcf_properties(path)
+    raise ValueError(f"Unsupported model format: {model_format}. Use 'urdf' or 'mjcf'.")
+
+
+def _registered_models():
+    from . import iter_models
+
+    return list(iter_models("urdf")) + list(iter_models("mjcf"))
+
+
+def _relative(path):
+    return os.path.relpath(path, _PACKAGE_DIR).replace(os.sep, "/")
+
+
+def _entry(model):
+    entry = {key: model[key] for key in ("name", "version", "variant", "format")}
+    entry["path"] = _relative(model["path"])
+    entry.update(model_properties(model["path"], model["format"]))
+    return entry
+
+
+def _with_formats(entries):
+    """Fill each entry's 'formats' with all formats shipped for the same model."""
+    formats = {}
+    for entry in entries:
+        formats.setdefault((entry["name"], entry["version"], entry["variant"]), set()).add(entry["format"])
+    for entry in entries:
+        entry["formats"] = sorted(formats[(entry["name"], entry["version"], entry["variant"])])
+    return entries
+
+
+def build_index(only=None, previous=None):
+    """Build index entries for every registered model.
+
+    :param only: Model file paths to re-parse, optional. Other models reuse
+        their entry from ``previous`` when present (default: re-parse all)
+    :param previous: Entries of an earlier index, used together with ``only``
+    :return: List of entry dicts sorted by name, version, variant and format
+    """
+    reuse = {}
+    if only is not None:
+        stale = {_relative(os.path.abspath(p)) for p in only}
+        reuse = {e["path"]: e for e in previous or [] if e["path"] not in stale}
+    entries = []
+    for model in _registered_models():
+        entry = reuse.get(_relative(model["path"]))
+        if entry is not None and all(entry[key] == model[key] for key in ("name", "version", "variant", "format")):
+            entries.append(dict(entry))
+        else:
+            entries.append(_entry(model))
+    entries.sort(key=lambda e: (e["name"], e["version"] or "", e["variant"] or "", e["format"]))
+    return _with_formats(entries)
+
+
+def write_index(path=INDEX_PATH, only=None):
+    """Rebuild the index and write it to ``path``.
+
+    :param only: Model file paths to re-parse, optional; entries of the other
+        models are kept from the existing index (see :func:`build_index`)
+    :return: Number of indexed models
+    """
+    previous = None
+    if only is not None and os.path.exists(path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") == _INDEX_VERSION:
+            previous = data["models"]
+    if previous is None:
+        only = None
+    entries = build_index(only=only, previous=previous)
+    _cache.atomic_write(path, json.dumps({"version": _INDEX_VERSION, "models": entries}, indent=1) + "\n")
+    os.chmod(path, 0o644)
+    return len(entries)
+
+
+_index = None
+
+
+@_stats.timed("catalog.load_index")
+def load_index():
+    """Return the index entries of all registered models.
+
+    Reads ``catalog.json``; models registered since it was built are indexed
+    once and cached under ``<cache>/catalog`` (keyed by file size and mtime).
+    """
+    global _index
+    if _index is not None:
+        return _index
+    entries = []
+    if os.path.exists(INDEX_PATH):
+        with open(INDEX_PATH) as f:
+            data = json.load(f)
+        if data.get("version") == _INDEX_VERSION:
+            entries = data["models"]
+    indexed = {e["path"] for e in entries}
+    for model in _registered_models():
+        if _relative(model["path"]) in indexed:
+            continue
+        stat = os.stat(model["path"])
+        key = _cache.hash_key(_INDEX_VERSION, os.path.abspath(model["path"]), stat.st_size, stat.st_mtime)
+        cache_path = os.path.join(_cache.cache_dir("catalog"), f"{key}.json")
+        hit = os.path.exists(cache_path)
+        _stats.cache_event("catalog", hit)
+        if hit:
+            with open(cache_path) as f:
+                entry = json.load(f)
+        else:
+            entry = _entry(model)
+            _cache.atomic_write(cache_path, json.dumps(entry))
+        entries.append(entry)
+    _index = _with_formats([dict(e) for e in entries])
+    return _index
+
+
+def _match(entry, filters):
+    for key, arg in filters.items():
+        field, _, op = key.partition("__")
+        if field not in FIELDS:
+            raise ValueError(f"Unknown catalog field '{field}'. Available fields: {list(FIELDS)}")
+        if op and op not in _OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'. Available operators: {list(_OPERATORS)}")
+        if not _OPERATORS[op or "eq"](entry[field], arg):
+            return False
+    return True
+
+
+@_stats.timed("catalog.query")
+def query(where=None, sort_by=None, limit=None, **filters):
+    """Select models from the catalog.
+
+    :param where: Optional predicate called with each model (SimpleNamespace)
+    :param sort_by: Field name or list of field names; prefix with '-' for
+        descending order. Models with a ``None`` value sort last.
+    :param limit: Maximum number of results, optional
+    :param filters: Field filters, e.g. ``dof__ge=23``, ``format="mjcf"``,
+        ``tags__contains="humanoid"``
+    :return: List of SimpleNamespace with the fields in :data:`FIELDS`
+        (``path`` is absolute)
+    """
+    results = []
+    for entry in load_index():
+        if not _match(entry, filters):
+            continue
+        model = SimpleNamespace(**dict(entry, path=os.path.join(_PACKAGE_DIR, entry["path"])))
+        if where is None or where(model):
+            results.append(model)
+    if sort_by:
+        keys = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+        # Stable sorts applied from the last key to the first
+        for key in reversed(keys):
+            field = key.lstrip("-")
+            if field not in FIELDS:
+                raise ValueError(f"Unknown catalog field '{field}'. Available fields: {list(FIELDS)}")
+            descending = key.startswith("-")
+            present = [m for m in results if getattr(m, field) is not None]
+            missing = [m for m in results if getattr(m, field) is None]
+            present.sort(key=lambda m: getattr(m, field), reverse=descending)
+            results = present + missing
+    return results[:limit] if limit is not None else results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or check the model catalog index")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--only", nargs="*", metavar="PATH", default=None,
+                        help="build: only re-parse these model files, keep the other entries")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = write_index(only=args.only)
+        print(f"Indexed {count} models -> {INDEX_PATH}")
+        return 0
+    with open(INDEX_PATH) as f:
+        current = json.load(f)
+    if current != {"version": _INDEX_VERSION, "models": build_index()}:
+        print(f"{INDEX_PATH} is out of date; run: python -m openrd.catalog build")
+        return 1
+    print(f"{INDEX_PATH} is up to date")
+    return 0
+
+
+__all__ = [
+    "INDEX_PATH",
+    "FIELDS",
+    "model_properties",
+    "build_index",
+    "write_index",
+    "load_index",
+    "query",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""``openrd`` command line interface with JSON output for scripts.
+
+Installed as the ``openrd`` console script (also ``python -m openrd``):
+
+- ``openrd list``: one JSON record per model and line (NDJSON), streamed
+  as robot packages are scanned; ``--json`` prints a single array
+- ``openrd path``: the model file path (``--json`` for a record)
+- ``openrd info``: the catalog entry of a model (DOF, mass, joints, ...)
+- ``openrd prefetch``: materialize model files before a sweep (extract
+  pruned models from archives, build reduced / mirrored variants), one
+  NDJSON record per model
+
+Job launchers call the CLI many times, so it only imports what a command
+needs: ``openrd path unitree_g1`` imports the ``unitree_g1`` registration
+module but no other robot package, no numpy and no XML parser.
+
+Usage::
+
+    openrd list --format all --fields name variant format path
+    openrd path unitree_h1 --format mjcf
+    openrd path unitree_h1 --reduce '{"root": "pelvis"}' --json
+    openrd info unitree_g1
+    openrd prefetch unitree_g1 unitree_h1 --format all --mirror-meshes
+"""
+
+import argparse
+import json
+import sys
+import time
+
+_RECORD_FIELDS = ("name", "version", "variant", "format", "path")
+
+
+def _emit(record):
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def _formats(value):
+    return None if value == "all" else value
+
+
+def _reduction(text):
+    try:
+        options = json.loads(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"--reduce must be a JSON object: {error}")
+    if not isinstance(options, dict):
+        raise argparse.ArgumentTypeError("--reduce must be a JSON object, e.g. '{\"root\": \"pelvis\"}'")
+    return options
+
+
+def _list(args):
+    from . import iter_models
+
+    fields = args.fields or _RECORD_FIELDS
+    records = ({field: model[field] for field in fields} for model in iter_models(_formats(args.format), args.name))
+    if args.json:
+        print(json.dumps(list(records), indent=1))
+        return 0
+    for record in records:
+        _emit(record)
+    return 0
+
+
+def _path(args):
+    from . import get_model_path
+
+    path = get_model_path(args.name, version=args.version, variant=args.variant, model_format=args.format,
+                          reduction=args.reduce, mirror_meshes=args.mirror_meshes)
+    if args.json:
+        print(json.dumps({"name": args.name, "version": args.version, "variant": args.variant,
+                          "format": args.format, "path": path}))
+    else:
+        print(path)
+    return 0
+
+
+def _info(args):
+    from .catalog import FIELDS, query
+
+    filters = {"name": args.name, "format": args.format}
+    if args.version:
+        filters["version"] = args.version
+    if args.variant:
+        filters["variant"] = args.variant
+    models = query(**filters)
+    if not models:
+        raise ValueError(f"No {args.format.upper()} model matches {args.name}"
+                         f"{f' version {args.version}' if args.version else ''}"
+                         f"{f' variant {args.variant}' if args.variant else ''}. Run `openrd list` to see models.")
+    records = [{field: getattr(model, field) for field in FIELDS} for model in models]
+    print(json.dumps(records[0] if len(records) == 1 else records, indent=1))
+    return 0
+
+
+def _prefetch(args):
+    from . import get_model_path, iter_models
+
+    models = [m for name in (args.names or [None]) for m in iter_models(_formats(args.format), name)]
+    if args.names and not models:
+        raise ValueError(f"No model matches {', '.join(args.names)}. Run `openrd list` to see models.")
+    failed = 0
+    for model in models:
+        record = {field: model[field] for field in _RECORD_FIELDS}
+        start = time.perf_counter()
+        try:
+            record["path"] = get_model_path(model["name"], version=model["version"], variant=model["variant"],
+                                            model_format=model["format"], reduction=args.reduce,
+                                            mirror_meshes=args.mirror_meshes)
+        except Exception as error:  # report and keep prefetching the other models
+            failed += 1
+            record["error"] = f"{type(error).__name__}: {error}"
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        _emit(record)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="openrd", description="Open Robot Descriptions model registry")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List registered models as NDJSON records")
+    list_parser.add_argument("--format", choices=["urdf", "mjcf", "all"], default="urdf", help="Model format")
+    list_parser.add_argument("--name", default=None, help="Only list models of this robot")
+    list_parser.add_argument("--fields", nargs="+", choices=_RECORD_FIELDS, default=None,
+                             help="Fields of each record (default: all)")
+    list_parser.add_argument("--json", action="store_true", help="Print one JSON array instead of NDJSON")
+
+    def add_model_arguments(sub):
+        sub.add_argument("--version", default=None, help="Robot version")
+        sub.add_argument("--variant", default=None, help="Variant name")
+        sub.add_argument("--format", choices=["urdf", "mjcf"], default="urdf", help="Model format")
+
+    def add_variant_arguments(sub):
+        sub.add_argument("--reduce", type=_reduction, default=None, metavar="JSON",
+                         help="Reduction options, see openrd.reduce (e.g. '{\"root\": \"pelvis\"}')")
+        sub.add_argument("--mirror-meshes", action="store_true", help="Share mirrored meshes (see openrd.mirror)")
+
+    path_parser = commands.add_parser("path", help="Print the path of a model file")
+    path_parser.add_argument("name", help="Robot name, e.g. unitree_g1")
+    add_model_arguments(path_parser)
+    add_variant_arguments(path_parser)
+    path_parser.add_argument("--json", action="store_true", help="Print a JSON record instead of the bare path")
+
+    info_parser = commands.add_parser("info", help="Print the catalog entry of a model as JSON")
+    info_parser.add_argument("name", help="Robot name, e.g. unitree_g1")
+    add_model_arguments(info_parser)
+
+    prefetch_parser = commands.add_parser("prefetch", help="Materialize model files, one NDJSON record per model")
+    prefetch_parser.add_argument("names", nargs="*", help="Robot names (default: all)")
+    prefetch_parser.add_argument("--format", choices=["urdf", "mjcf", "all"], default="urdf", help="Model format")
+    add_variant_arguments(prefetch_parser)
+
+    args = parser.parse_args(argv)
+    handler = {"list": _list, "path": _path, "info": _info, "prefetch": _prefetch}[args.command]
+    try:
+        status = handler(args)
+    except ValueError as error:
+        parser.exit(1, f"openrd: error: {error}\n")
+    except BrokenPipeError:
+        # Output piped into e.g. `head`: stop quietly
+        sys.stderr.close()
+        status = 0
+    if status:
+        sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,702 @@
+"""URDF <-> MJCF conversion and kinematic equivalence checks.
+
+Every robot ships a hand-maintained URDF and MJCF, and the two drift apart.
+This module generates one format from the other and checks that both
+describe the same kinematics:
+
+- :func:`urdf_to_mjcf`: links become nested bodies framed at their parent
+  joint, mimic joints become ``<equality><joint>`` constraints and joint
+  efforts become motor control ranges. Visual geoms get the ``visual``
+  default class (no contacts), collision geoms the ``collision`` class.
+- :func:`mjcf_to_urdf`: bodies become links framed like the body. Bodies
+  with several joints, joint anchors off the body origin or non-zero
+  ``ref`` positions get massless intermediate links so that joint positions
+  keep their MJCF meaning. Capsules become a cylinder and two spheres,
+  joint equality constraints become mimic tags, free and ball joints are
+  dropped.
+- :func:`convert_file` caches outputs under ``<cache>/converted`` keyed by
+  the source hash; :func:`convert_catalog` converts the registered models
+  in worker processes.
+- :func:`compare_kinematics` evaluates forward kinematics of a URDF and an
+  MJCF over thousands of random configurations in one vectorized pass and
+  reports the worst position and orientation error per link.
+
+Usage::
+
+    from openrd.convert import check_model, convert_model
+
+    path = convert_model("unitree_h1")                 # URDF -> cached MJCF
+    path = convert_model("bruce", model_format="mjcf")  # MJCF -> cached URDF
+    report = check_model("unitree_h1")
+    assert report.equivalent, report.worst_link
+
+    python -m openrd.convert convert [--robots unitree_h1] [--from urdf] [--workers 4] [--check] [--install]
+    python -m openrd.convert check [--robots unitree_h1] [--samples 4096] [--tolerance 1e-5]
+"""
+
+import argparse
+import copy
+import functools
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from . import _cache, _stats
+from ._xml import MJCFDefaults, MJCFFrames, format_floats, set_inertial, set_mjcf_inertial, set_origin
+from .gltf import (
+    SceneKinematics,
+    _mjcf_assets,
+    _mjcf_couplings,
+    _mjcf_geom,
+    _mjcf_rgba,
+    _read_scene,
+    _urdf_materials,
+    _urdf_rgba,
+)
+from .kinematics import KinematicModel
+from .robot import _floats, load_urdf, parse_origin, tostring
+from .transforms import axis_angle_to_matrix, make_transform
+
+# Bump when the converter output changes so stale cache entries are ignored
+_CONVERTER_VERSION = 1
+
+_EXTENSIONS = {"urdf": ".urdf", "mjcf": ".xml"}
+_TARGETS = {"urdf": "mjcf", "mjcf": "urdf"}
+
+DEFAULT_SAMPLES = 4096
+# Worst link position error (m) and orientation error (rad) still considered equivalent
+DEFAULT_TOLERANCE = 1e-5
+
+
+def _check_format(source_format):
+    if source_format not in _TARGETS:
+        raise ValueError(f"Unsupported model format: {source_format}. Use 'urdf' or 'mjcf'.")
+
+
+def _unique_name(name, used):
+    candidate, k = name, 1
+    while candidate in used:
+        candidate = f"{name}_{k}"
+        k += 1
+    used.add(candidate)
+    return candidate
+
+
+def _mesh_filename(path, relative_to):
+    return os.path.relpath(path, relative_to) if relative_to else path
+
+
+# ---------------------------------------------------------------------------
+# URDF -> MJCF
+# ---------------------------------------------------------------------------
+
+def urdf_to_mjcf(path, free_joint=False, relative_to=None):
+    """Convert a URDF file to MJCF.
+
+    :param path: Path to the URDF file
+    :param free_joint: Give the root body a free joint (floating base)
+    :param relative_to: Write mesh paths relative to this directory
+        (default: absolute paths)
+    :return: MJCF XML text
+    """
+    model = load_urdf(path)
+    robot_el = model.tree.getroot()
+    named = _urdf_materials(robot_el)
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    mujoco = ET.Element("mujoco", model=robot_el.get("name") or stem)
+    ET.SubElement(mujoco, "compiler", angle="radian", autolimits="true")
+    default = ET.SubElement(mujoco, "default")
+    ET.SubElement(ET.SubElement(default, "default", {"class": "visual"}), "geom",
+                  contype="0", conaffinity="0", group="2", density="0")
+    ET.SubElement(ET.SubElement(default, "default", {"class": "collision"}), "geom", group="3")
+    asset = ET.SubElement(mujoco, "asset")
+    worldbody = ET.SubElement(mujoco, "worldbody")
+
+    meshes, materials = {}, {}
+    used = {"mesh": set(), "material": set(), "geom": set()}
+
+    def mesh_asset(filename, scale):
+        key = (filename, tuple(scale))
+        if key not in meshes:
+            name = _unique_name(os.path.splitext(os.path.basename(filename))[0], used["mesh"])
+            attrs = {"name": name, "file": _mesh_filename(filename, relative_to)}
+            if not np.allclose(scale, 1.0):
+                attrs["scale"] = format_floats(scale)
+            ET.SubElement(asset, "mesh", attrs)
+            meshes[key] = name
+        return meshes[key]
+
+    def material(rgba):
+        if rgba not in materials:
+            materials[rgba] = _unique_name(f"material_{len(materials)}", used["material"])
+            ET.SubElement(asset, "material", name=materials[rgba], rgba=format_floats(rgba))
+        return materials[rgba]
+
+    def add_geoms(body, link, kind):
+        for item in link.element.findall(kind):
+            geom = item.find("geometry")
+            attrs = {"class": kind}
+            if geom is None:
+                continue
+            if geom.find("mesh") is not None and geom.find("mesh").get("filename"):
+                mesh = geom.find("mesh")
+                scale = _floats(mesh.get("scale"), [1, 1, 1])
+                attrs.update(type="mesh", mesh=mesh_asset(model.resolve_filename(mesh.get("filename")), scale))
+            elif geom.find("box") is not None:
+                attrs.update(type="box", size=format_floats(_floats(geom.find("box").get("size"), [0, 0, 0]) / 2))
+            elif geom.find("cylinder") is not None:
+                cylinder = geom.find("cylinder")
+                attrs.update(type="cylinder",
+                             size=format_floats([float(cylinder.get("radius")), float(cylinder.get("length")) / 2]))
+            elif geom.find("sphere") is not None:
+                attrs.update(type="sphere", size=format_floats([float(geom.find("sphere").get("radius"))]))
+            else:
+                continue
+            if item.get("name"):
+                attrs["name"] = _unique_name(item.get("name"), used["geom"])
+            if kind == "visual":
+                attrs["material"] = material(_urdf_rgba(item, named))
+            el = ET.SubElement(body, "geom", attrs)
+            MJCFFrames.set_transform(el, parse_origin(item))
+
+    children = {}
+    for joint in model.joints.values():
+        children.setdefault(joint.parent, []).append(joint)
+
+    def add_body(parent_el, link_name, joint):
+        body = ET.SubElement(parent_el, "body", name=link_name)
+        if joint is not None:
+            MJCFFrames.set_transform(body, joint.origin)
+        link = model.links[link_name]
+        if link.mass > 0:
+            set_mjcf_inertial(body, link.mass, link.com, link.inertia)
+        if joint is None and free_joint:
+            ET.SubElement(body, "freejoint", name=f"{link_name}_freejoint")
+        elif joint is not None and joint.type in ("revolute", "continuous", "prismatic"):
+            attrs = {"name": joint.name, "type": "slide" if joint.type == "prismatic" else "hinge",
+                     "axis": format_floats(joint.axis)}
+            if joint.type != "continuous" and np.isfinite(joint.lower) and np.isfinite(joint.upper) \
+                    and joint.lower < joint.upper:
+                attrs["range"] = format_floats([joint.lower, joint.upper])
+            ET.SubElement(body, "joint", attrs)
+        add_geoms(body, link, "visual")
+        add_geoms(body, link, "collision")
+        for child in children.get(link_name, []):
+            add_body(body, child.child, child)
+
+    add_body(worldbody, model.root, None)
+
+    mimics = [j for j in model.joints.values() if j.mimic is not None and j.type != "fixed"]
+    if mimics:
+        equality = ET.SubElement(mujoco, "equality")
+        for joint in mimics:
+            source, multiplier, offset = joint.mimic
+            ET.SubElement(equality, "joint", joint1=joint.name, joint2=source,
+                          polycoef=format_floats([offset, multiplier, 0, 0, 0]))
+    actuated = [j for j in model.topological_joints() if j.is_actuated]
+    if actuated:
+        actuator = ET.SubElement(mujoco, "actuator")
+        for joint in actuated:
+            attrs = {"name": joint.name, "joint": joint.name}
+            if joint.effort:
+                attrs["ctrlrange"] = format_floats([-joint.effort, joint.effort])
+            ET.SubElement(actuator, "motor", attrs)
+    if not len(asset):
+        mujoco.remove(asset)
+    return tostring(mujoco)
+
+
+# ---------------------------------------------------------------------------
+# MJCF -> URDF
+# ---------------------------------------------------------------------------
+
+def _joint_motion(joint_type, axis, value):
+    if joint_type == "hinge":
+        return make_transform(axis_angle_to_matrix(axis, value))
+    return make_transform(p=axis * value)
+
+
+def _mjcf_efforts(root, defaults):
+    """Effort limit of every motor-driven joint from its actuator control range and gear."""
+    efforts = {}
+    for actuator in root.findall("actuator"):
+        for el in actuator:
+            attrs = defaults.resolve(el)
+            if not attrs.get("joint") or not attrs.get("ctrlrange") or attrs.get("ctrllimited") == "false":
+                continue
+            low, high = (abs(float(v)) for v in attrs["ctrlrange"].split())
+            gear = abs(float(attrs.get("gear", "1").split()[0]))
+            efforts[attrs["joint"]] = max(low, high) * gear
+    return efforts
+
+
+def _urdf_geometries(T, scale, shape, relative_to):
+    """Return ``[(origin, <geometry> element)]`` of a scene shape; capsules expand to three."""
+    kind = shape[0]
+    if kind == "capsule":
+        _, radius, length = shape
+        parts = _urdf_geometries(T, scale, ("cylinder", radius, length), relative_to)
+        for z in (-length / 2, length / 2):
+            parts += _urdf_geometries(T @ make_transform(p=[0.0, 0.0, z]), scale, ("sphere", radius), relative_to)
+        return parts
+    geometry = ET.Element("geometry")
+    if kind == "mesh":
+        attrs = {"filename": _mesh_filename(shape[1], relative_to)}
+        if not np.allclose(scale, 1.0):
+            attrs["scale"] = format_floats(scale)
+        ET.SubElement(geometry, "mesh", attrs)
+    elif kind == "box":
+        ET.SubElement(geometry, "box", size=format_floats(shape[1]))
+    elif kind == "cylinder":
+        ET.SubElement(geometry, "cylinder", radius=f"{shape[1]:.9g}", length=f"{shape[2]:.9g}")
+    else:
+        # Ellipsoids are bounded by a sphere of their largest semi-axis
+        ET.SubElement(geometry, "sphere", radius=f"{shape[1] * max(scale):.9g}")
+    return [(T, geometry)]
+
+
+def mjcf_to_urdf(path, relative_to=None):
+    """Convert an MJCF file to URDF.
+
+    The URDF root link is the single top-level body when it has no hinge or
+    slide joints, else a 'world' link to which the top-level bodies attach.
+
+    :param path: Path to the MJCF file
+    :param relative_to: Write mesh paths relative to this directory
+        (default: absolute paths)
+    :return: URDF XML text
+    """
+    root = ET.parse(path).getroot()
+    frames = MJCFFrames(root)
+    defaults = MJCFDefaults(root)
+    meshes, named_materials = _mjcf_assets(root, path, defaults)
+    efforts = _mjcf_efforts(root, defaults)
+    couplings = _mjcf_couplings(root, defaults)
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    robot = ET.Element("robot", name=root.get("model") or stem)
+    materials, links, geoms = {}, [], []
+    used = {"link": set(), "joint": set(), "material": set()}
+
+    def add_link(name):
+        link = ET.SubElement(robot, "link", name=_unique_name(name, used["link"]))
+        links.append(link)
+        return link
+
+    def add_joint(name, joint_type, parent, child, T):
+        joint = ET.SubElement(robot, "joint", name=_unique_name(name, used["joint"]), type=joint_type)
+        ET.SubElement(joint, "parent", link=parent)
+        ET.SubElement(joint, "child", link=child)
+        set_origin(joint, T)
+        return joint
+
+    def body_joints(body, childclass):
+        joints = []
+        for k, joint in enumerate(body.findall("joint")):
+            attrs = defaults.resolve(joint, childclass)
+            joint_type = attrs.get("type", "hinge")
+            if joint_type not in ("hinge", "slide"):
+                continue
+            axis = _floats(attrs.get("axis"), [0, 0, 1])
+            degrees = joint_type == "hinge" and frames.degrees
+            ref = float(attrs.get("ref", 0.0))
+            limits = None
+            if attrs.get("range") and attrs.get("limited", "auto") != "false":
+                limits = [float(v) for v in attrs["range"].split()]
+            joints.append({
+                "name": attrs.get("name") or f"{body.get('name')}_joint{k}",
+                "type": joint_type,
+                "axis": axis / np.linalg.norm(axis),
+                "anchor": _floats(attrs.get("pos"), [0, 0, 0]) if joint_type == "hinge" else np.zeros(3),
+                "ref": np.radians(ref) if degrees else ref,
+                "limits": np.radians(limits) if degrees and limits else limits,
+            })
+        return joints
+
+    def set_limits(joint_el, joint):
+        lower_upper = {}
+        if joint["limits"] is not None:
+            lower_upper = {"lower": f"{joint['limits'][0]:.9g}", "upper": f"{joint['limits'][1]:.9g}"}
+        ET.SubElement(joint_el, "limit", effort=f"{efforts.get(joint['name'], 0.0):.9g}", velocity="0",
+                      **lower_upper)
+
+    def visit(body, parent_link, childclass, T):
+        childclass = body.get("childclass") or childclass
+        name = body.get("name") or f"body{len(links)}"
+        link = add_link(name)
+        name = link.get("name")
+        if body.find("inertial") is not None:
+            set_inertial(link, *frames.inertial(body))
+
+        # Chain the joints through intermediate links: each joint frame sits at
+        # its anchor, rotated back by its reference position
+        previous, anchor, origin = parent_link, np.zeros(3), T
+        joints = body_joints(body, childclass) if parent_link is not None else []
+        for k, joint in enumerate(joints):
+            origin = origin @ make_transform(p=joint["anchor"] - anchor) \
+                @ _joint_motion(joint["type"], joint["axis"], -joint["ref"])
+            last = k == len(joints) - 1 and not joint["anchor"].any()
+            child = name if last else add_link(f"{name}__{joint['name']}").get("name")
+            if joint["type"] == "slide":
+                joint_type = "prismatic"
+            else:
+                joint_type = "revolute" if joint["limits"] is not None else "continuous"
+            joint_el = add_joint(joint["name"], joint_type, previous, child, origin)
+            ET.SubElement(joint_el, "axis", xyz=format_floats(joint["axis"]))
+            set_limits(joint_el, joint)
+            if joint["name"] in couplings:
+                source, multiplier, offset = couplings[joint["name"]]
+                ET.SubElement(joint_el, "mimic", joint=source, multiplier=f"{multiplier:.9g}",
+                              offset=f"{offset:.9g}")
+            previous, anchor, origin = child, joint["anchor"], np.eye(4)
+        if parent_link is not None and previous != name:
+            add_joint(f"{name}_fixed", "fixed", previous, name, origin @ make_transform(p=-anchor))
+
+        for geom in body.findall("geom"):
+            attrs = defaults.resolve(geom, childclass)
+            resolved = _mjcf_geom(attrs, frames, meshes)
+            if resolved is None:
+                continue
+            rgba = _mjcf_rgba(attrs, named_materials)
+            visual = attrs.get("contype", "1") == "0" and attrs.get("conaffinity", "1") == "0"
+            geoms.append((link, attrs.get("name"), resolved, rgba, visual))
+        for child in body.findall("body"):
+            visit(child, name, childclass, frames.transform(child))
+
+    worldbody = root.find("worldbody")
+    top = worldbody.findall("body")
+    world_geoms = [g for g in worldbody.findall("geom")
+                   if _mjcf_geom(defaults.resolve(g), frames, meshes) is not None]
+    if len(top) == 1 and not world_geoms and not body_joints(top[0], top[0].get("childclass")):
+        visit(top[0], None, None, np.eye(4))
+    else:
+        world = add_link("world")
+        for geom in world_geoms:
+            attrs = defaults.resolve(geom)
+            geoms.append((world, attrs.get("name"), _mjcf_geom(attrs, frames, meshes),
+                          _mjcf_rgba(attrs, named_materials), False))
+        for body in top:
+            visit(body, "world", None, frames.transform(body))
+
+    # Models without visual-only geoms draw their collision geoms
+    has_visual = any(visual for *_, visual in geoms)
+    for link, name, (T, scale, shape), rgba, visual in geoms:
+        kinds = ["visual"] if visual else ["collision"]
+        if not has_visual:
+            kinds = ["visual", "collision"]
+        parts = _urdf_geometries(T, scale, shape, relative_to)
+        for kind in kinds:
+            for origin, geometry in parts:
+                item = ET.SubElement(link, kind)
+                if name:
+                    item.set("name", name)
+                set_origin(item, origin)
+                item.append(copy.deepcopy(geometry))
+                if kind == "visual":
+                    if rgba not in materials:
+                        materials[rgba] = _unique_name(f"material_{len(materials)}", used["material"])
+                    ET.SubElement(item, "material", name=materials[rgba])
+
+    for k, (rgba, name) in enumerate(materials.items()):
+        material = ET.Element("material", name=name)
+        ET.SubElement(material, "color", rgba=format_floats(rgba))
+        robot.insert(k, material)
+    return tostring(robot)
+
+
+# ---------------------------------------------------------------------------
+# Cached and batch conversion
+# ---------------------------------------------------------------------------
+
+@_stats.timed("convert.convert_file")
+def convert_file(path, source_format="urdf", **options):
+    """Convert the model file at ``path`` to the other format and return the cached output path.
+
+    :param path: Path to a URDF or MJCF file
+    :param source_format: Format of ``path``, 'urdf' or 'mjcf'
+    :param options: Converter options (``free_joint`` for URDF sources)
+    :return: Absolute path of the converted model (``.xml`` or ``.urdf``) in the openrd cache
+    """
+    _check_format(source_format)
+    converter = urdf_to_mjcf if source_format == "urdf" else mjcf_to_urdf
+    key = _cache.hash_key(_CONVERTER_VERSION, _cache.hash_file(path), os.path.abspath(path), source_format,
+                          sorted(options.items()))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    out_path = os.path.join(_cache.cache_dir("converted"), f"{stem}-{key}{_EXTENSIONS[_TARGETS[source_format]]}")
+    hit = os.path.exists(out_path)
+    _stats.cache_event("converted", hit)
+    if hit:
+        return out_path
+    return _cache.atomic_write(out_path, converter(path, **options))
+
+
+def convert_model(name, version=None, variant=None, model_format="urdf", **options):
+    """Convert a bundled model to the other format and return the cached output path.
+
+    :param name: Robot name, e.g. 'unitree_h1'
+    :param version: Robot version, optional
+    :param variant: Variant name, optional
+    :param model_format: Format to convert from, 'urdf' or 'mjcf'
+    :param options: Converter options, see :func:`convert_file`
+    :return: Absolute path of the converted model file
+    """
+    from . import get_model_path
+
+    path = get_model_path(name, version=version, variant=variant, model_format=model_format)
+    return convert_file(path, source_format=model_format, **options)
+
+
+def _label(model):
+    return "/".join(v for v in (model["name"], model["version"], model["variant"]) if v)
+
+
+def _convert_one(model, source_format, check, comparison, options):
+    result = SimpleNamespace(name=model["name"], version=model["version"], variant=model["variant"],
+                             label=_label(model), source=model["path"], path=None, report=None, error=None)
+    try:
+        result.path = convert_file(model["path"], source_format, **options)
+        if check:
+            urdf_path, mjcf_path = (model["path"], result.path) if source_format == "urdf" \
+                else (result.path, model["path"])
+            result.report = compare_kinematics(urdf_path, mjcf_path, **comparison)
+    except Exception as error:  # one broken model should not abort the batch
+        result.error = f"{type(error).__name__}: {error}"
+    return result
+
+
+def convert_catalog(robots=None, source_format="urdf", workers=None, check=False, samples=DEFAULT_SAMPLES,
+                    tolerance=DEFAULT_TOLERANCE, **options):
+    """Convert every registered model of one format, in worker processes.
+
+    Outputs are cached by source hash, so re-runs only convert models that
+    changed. Failures are reported per model instead of raised.
+
+    :param robots: Robot names to convert (default: all)
+    :param source_format: Format to convert from, 'urdf' or 'mjcf'
+    :param workers: Worker processes (default: CPU count); 0 or 1 runs in-process
+    :param check: Also compare the kinematics of source and output
+    :param samples: Random configurations per model for the check
+    :param tolerance: Accepted position (m) and orientation (rad) error of the check
+    :param options: Converter options, see :func:`convert_file`
+    :return: List of SimpleNamespace with ``name``, ``version``, ``variant``,
+        ``label``, ``source``, ``path``, ``report`` (see
+        :func:`compare_kinematics`, if ``check``) and ``error`` (None on success)
+    """
+    from . import iter_models
+
+    _check_format(source_format)
+    models = [m for m in iter_models(source_format) if not robots or m["name"] in robots]
+    comparison = {"samples": samples, "tolerance": tolerance}
+    run = functools.partial(_convert_one, source_format=source_format, check=check, comparison=comparison,
+                            options=options)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(models) <= 1:
+        return [run(model) for model in models]
+    with ProcessPoolExecutor(min(workers, len(models))) as pool:
+        return list(pool.map(run, models))
+
+
+# ---------------------------------------------------------------------------
+# Kinematic equivalence
+# ---------------------------------------------------------------------------
+
+def compare_kinematics(urdf_path, mjcf_path, samples=DEFAULT_SAMPLES, seed=0, tolerance=DEFAULT_TOLERANCE,
+                       chunk=1024):
+    """Compare the forward kinematics of a URDF and an MJCF description.
+
+    Joints present in both files are sampled uniformly within the URDF limits
+    ([-pi, pi] where unlimited); the other joints stay at zero (URDF) or
+    their reference position (MJCF). Link poses are compared for links
+    present in both files, relative to the URDF root link (the MJCF body of
+    the same name, else its single top-level body), so floating-base offsets
+    and fixed links the MJCF merged away do not count as drift.
+
+    :param urdf_path: Path to the URDF file
+    :param mjcf_path: Path to the MJCF file
+    :param samples: Number of random configurations
+    :param seed: Random seed
+    :param tolerance: Worst position (m) and orientation (rad) error accepted
+        as equivalent
+    :param chunk: Configurations evaluated per vectorized batch
+    :return: SimpleNamespace with ``equivalent``, ``position_error`` and
+        ``rotation_error`` (worst over all links), ``worst_link``, ``errors``
+        (link -> (position error, rotation error)), ``joints`` (compared),
+        ``urdf_only_joints``, ``mjcf_only_joints``, ``urdf_only_links``,
+        ``mjcf_only_links`` and ``samples``
+    """
+    kinematics = KinematicModel(urdf_path)
+    nodes, _, mjcf_joints = _read_scene(mjcf_path, "mjcf", "visual")
+    joints = [name for name in kinematics.joint_names if name in set(mjcf_joints)]
+    scene = SceneKinematics([node["name"] for node in nodes], [node["parent"] for node in nodes],
+                            [node["origin"] for node in nodes], [node["joints"] for node in nodes], joints)
+
+    urdf_root = kinematics.link_names[0]
+    mjcf_index = {name: i for i, name in enumerate(scene.link_names)}
+    if urdf_root not in mjcf_index:
+        tops = [i for i, parent in enumerate(scene.parent) if parent == 0]
+        if len(tops) != 1:
+            raise ValueError(f"URDF root link '{urdf_root}' has no counterpart in {mjcf_path}.")
+        mjcf_index[urdf_root] = tops[0]
+    links = [name for name in kinematics.link_names if name in mjcf_index]
+    urdf_ids = kinematics.link_ids(links)
+    mjcf_ids = [mjcf_index[name] for name in links]
+    root_id = mjcf_index[urdf_root]
+
+    q_index = [kinematics.joint_names.index(name) for name in joints]
+    lower = np.where(np.isfinite(kinematics.lower[q_index]), kinematics.lower[q_index], -np.pi)
+    upper = np.where(np.isfinite(kinematics.upper[q_index]), kinematics.upper[q_index], np.pi)
+    rng = np.random.default_rng(seed)
+    position_error, rotation_error = np.zeros(len(links)), np.zeros(len(links))
+    for start in range(0, samples, chunk):
+        q = rng.uniform(lower, upper, (min(chunk, samples - start), len(joints)))
+        q_urdf = np.zeros((len(q), kinematics.nq))
+        q_urdf[:, q_index] = q
+        a = kinematics.forward(q_urdf)[:, urdf_ids]
+        poses = scene.link_poses(q)
+        b = np.linalg.inv(poses[:, root_id])[:, None] @ poses[:, mjcf_ids]
+        position_error = np.maximum(position_error,
+                                    np.linalg.norm(a[..., :3, 3] - b[..., :3, 3], axis=-1).max(axis=0))
+        cos = (np.einsum("bnij,bnij->bn", a[..., :3, :3], b[..., :3, :3]) - 1.0) / 2.0
+        rotation_error = np.maximum(rotation_error, np.arccos(np.clip(cos, -1.0, 1.0)).max(axis=0))
+
+    worst = int(np.argmax(np.maximum(position_error, rotation_error))) if links else None
+    urdf_only_joints = [name for name in kinematics.joint_names if name not in set(joints)]
+    mjcf_only_joints = [name for name in mjcf_joints if name not in set(joints)]
+    position, rotation = float(position_error.max(initial=0.0)), float(rotation_error.max(initial=0.0))
+    return SimpleNamespace(
+        equivalent=position <= tolerance and rotation <= tolerance and not urdf_only_joints
+        and not mjcf_only_joints,
+        position_error=position,
+        rotation_error=rotation,
+        worst_link=None if worst is None else links[worst],
+        errors={name: (float(p), float(r)) for name, p, r in zip(links, position_error, rotation_error)},
+        joints=joints,
+        urdf_only_joints=urdf_only_joints,
+        mjcf_only_joints=mjcf_only_joints,
+        urdf_only_links=[name for name in kinematics.link_names if name not in mjcf_index],
+        mjcf_only_links=[name for i, name in enumerate(scene.link_names)
+                         if i not in (0, root_id) and name not in set(links)],
+        samples=samples,
+    )
+
+
+def check_model(name, version=None, variant=None, **options):
+    """Compare the bundled URDF and MJCF of a robot, see :func:`compare_kinematics`.
+
+    :param name: Robot name, e.g. 'unitree_h1'
+    :param version: Robot version, optional
+    :param variant: Variant name, optional
+    :param options: ``samples``, ``seed``, ``tolerance``
+    :return: SimpleNamespace report
+    """
+    from . import get_model_path
+
+    urdf_path = get_model_path(name, version=version, variant=variant, model_format="urdf")
+    mjcf_path = get_model_path(name, version=version, variant=variant, model_format="mjcf")
+    return compare_kinematics(urdf_path, mjcf_path, **options)
+
+
+def _describe(report):
+    text = (f"{len(report.joints)} joints, {len(report.errors)} links, "
+            f"max {report.position_error * 1e3:.3g} mm / {np.degrees(report.rotation_error):.3g}°")
+    if not report.equivalent and report.worst_link:
+        text += f" (worst: {report.worst_link})"
+    for label, names in (("URDF only", report.urdf_only_joints), ("MJCF only", report.mjcf_only_joints)):
+        if names:
+            text += f"; {label}: {', '.join(names)}"
+    return text
+
+
+def _install(result, source_format):
+    """Write a converted model into the package tree next to the hand-maintained files."""
+    target = _TARGETS[source_format]
+    robot_dir = os.path.join(os.path.dirname(__file__), target, result.name)
+    stem = os.path.splitext(os.path.basename(result.source))[0]
+    out_path = os.path.join(robot_dir, stem + _EXTENSIONS[target])
+    if os.path.exists(out_path):
+        return None
+    converter = urdf_to_mjcf if source_format == "urdf" else mjcf_to_urdf
+    return _cache.atomic_write(out_path, converter(result.source, relative_to=robot_dir))
+
+
+def main(argv=None):
+    from . import iter_models
+
+    parser = argparse.ArgumentParser(description="URDF <-> MJCF conversion and kinematic equivalence checks")
+    parser.add_argument("command", choices=["convert", "check"])
+    parser.add_argument("--robots", nargs="+", default=None, help="Robot names (default: all)")
+    parser.add_argument("--from", dest="source_format", choices=["urdf", "mjcf"], default="urdf",
+                        help="Format to convert from (convert only)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--check", action="store_true", help="Compare kinematics of every conversion")
+    parser.add_argument("--install", action="store_true",
+                        help="Write conversions into openrd/<format>/<robot>/ where that file does not exist")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Random configurations per model")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Accepted position (m) and orientation (rad) error")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    start = time.perf_counter()
+    if args.command == "convert":
+        results = convert_catalog(args.robots, args.source_format, args.workers, check=args.check,
+                                  samples=args.samples, tolerance=args.tolerance)
+        for result in results:
+            if result.error:
+                failed += 1
+                print(f"✗ {result.label}: {result.error}")
+                continue
+            line = f"{'✓' if result.report is None or result.report.equivalent else '✗'} {result.label}: {result.path}"
+            if result.report is not None:
+                failed += not result.report.equivalent
+                line += f"\n  {_describe(result.report)}"
+            print(line)
+            if args.install:
+                installed = _install(result, args.source_format)
+                if installed:
+                    print(f"  → {installed}")
+        if args.install:
+            print("Run `python auto_generate_init.py` to register installed models.")
+        print(f"{len(results)} models in {time.perf_counter() - start:.2f}s")
+    else:
+        mjcf_paths = {(m["name"], m["version"], m["variant"]): m["path"] for m in iter_models("mjcf")}
+        models = [m for m in iter_models("urdf") if (not args.robots or m["name"] in args.robots)
+                  and (m["name"], m["version"], m["variant"]) in mjcf_paths]
+        for model in models:
+            try:
+                report = compare_kinematics(model["path"], mjcf_paths[(model["name"], model["version"],
+                                                                        model["variant"])],
+                                            samples=args.samples, tolerance=args.tolerance)
+            except Exception as error:
+                failed += 1
+                print(f"✗ {_label(model)}: {type(error).__name__}: {error}")
+                continue
+            failed += not report.equivalent
+            print(f"{'✓' if report.equivalent else '✗'} {_label(model)}: {_describe(report)}")
+        print(f"{len(models)} models in {time.perf_counter() - start:.2f}s")
+    if failed:
+        sys.exit(1)
+
+
+__all__ = [
+    "DEFAULT_SAMPLES",
+    "DEFAULT_TOLERANCE",
+    "urdf_to_mjcf",
+    "mjcf_to_urdf",
+    "convert_file",
+    "convert_model",
+    "convert_catalog",
+    "compare_kinematics",
+    "check_model",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Batched inverse dynamics (recursive Newton-Euler) over URDF inertial data.
+
+:class:`InverseDynamics` parses a URDF's ``<inertial>`` and ``<joint>`` data
+once (through :class:`openrd.kinematics.KinematicModel`) and evaluates joint
+torques for whole batches of ``(q, qd, qdd)`` samples: the recursion runs
+once per link, every step vectorized over the batch.
+
+The root link is fixed to the world (fixed-base dynamics, the usual
+convention for torque labels). All quantities are expressed in the root
+frame; gravity defaults to ``(0, 0, -9.81)``.
+
+Usage::
+
+    from openrd.dynamics import InverseDynamics
+
+    dyn = InverseDynamics.from_model("unitree_h1")
+    tau = dyn.inverse(q, qd, qdd)      # (B, nq)
+    tau_g = dyn.gravity_torques(q)     # static holding torques, fast path
+"""
+
+import numpy as np
+
+from .kinematics import _PRISMATIC, _REVOLUTE, KinematicModel
+
+
+def _cross(a, b):
+    """Row-wise cross product of (B, 3) arrays (cheaper than np.cross for small rows)."""
+    out = np.empty(np.broadcast_shapes(a.shape, b.shape))
+    out[..., 0] = a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1]
+    out[..., 1] = a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2]
+    out[..., 2] = a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+    return out
+
+
+def _rotate(R, v):
+    """``R @ v`` for stacks of 3x3 matrices and 3-vectors (einsum beats stacked matmul)."""
+    return np.einsum("...ij,...j->...i", R, v)
+
+
+def _rotate_back(R, v):
+    """``R^T @ v`` for stacks of 3x3 matrices and 3-vectors."""
+    return np.einsum("...ji,...j->...i", R, v)
+
+
+class InverseDynamics:
+    """Vectorized RNEA for a fixed-base URDF model.
+
+    :param model: :class:`openrd.kinematics.KinematicModel`, :class:`openrd.robot.RobotModel`
+        or path to a URDF file
+    :param joint_names: Order of the configuration vector, optional (default:
+        actuated joints in topological order)
+    :param gravity: Gravity vector in the root frame
+    """
+
+    def __init__(self, model, joint_names=None, gravity=(0.0, 0.0, -9.81)):
+        if not isinstance(model, KinematicModel):
+            model = KinematicModel(model, joint_names=joint_names)
+        self.kinematics = model
+        links = [model.model.links[name] for name in model.link_names]
+        self.mass = np.array([link.mass for link in links])
+        self.com = np.array([link.com for link in links])
+        self.inertia = np.array([link.inertia for link in links])
+        self.gravity = np.asarray(gravity, dtype=float)
+        # Total mass below each link; massless subtrees produce no torque
+        self._subtree_mass = self.mass.copy()
+        for i in range(len(links) - 1, 0, -1):
+            self._subtree_mass[model.parent[i]] += self._subtree_mass[i]
+
+    @classmethod
+    def from_model(cls, name, version=None, variant=None, joint_names=None, **kwargs):
+        """Build inverse dynamics for a bundled URDF model.
+
+        :param name: Robot name, e.g. 'unitree_h1'
+        :param joint_names: Configuration order, optional (default: actuated joints)
+        :param kwargs: Extra options for :class:`InverseDynamics`
+        """
+        from . import get_model_path
+
+        path = get_model_path(name, version=version, variant=variant)
+        return cls(KinematicModel(path, joint_names=joint_names), **kwargs)
+
+    @property
+    def joint_names(self):
+        return self.kinematics.joint_names
+
+    @property
+    def nq(self):
+        return self.kinematics.nq
+
+    def _project(self, torque_per_link, batch):
+        """Map per-link joint torques (n_links, B) onto the configuration (B, nq); mimic joints add up."""
+        km = self.kinematics
+        moving = km._moving
+        tau = np.zeros((batch, km.nq))
+        np.add.at(tau.T, km.source[moving], torque_per_link[moving] * km.multiplier[moving][:, None])
+        return tau
+
+    def _chunked(self, fn, arrays, chunk_size):
+        """Apply ``fn`` to batch slices of ``arrays`` so temporaries stay bounded."""
+        single = np.ndim(arrays[0]) == 1
+        arrays = [np.atleast_2d(np.asarray(x, dtype=float)) for x in arrays]
+        if any(x.shape != arrays[0].shape for x in arrays):
+            raise ValueError(f"Inputs must have the same shape, got {[x.shape for x in arrays]}")
+        if arrays[0].shape[1] != self.nq:
+            raise ValueError(f"Expected {self.nq} joint values per sample, got {arrays[0].shape[1]}")
+        batch = arrays[0].shape[0]
+        if batch <= chunk_size:
+            tau = fn(*arrays)
+        else:
+            tau = np.empty((batch, self.nq))
+            for start in range(0, batch, chunk_size):
+                tau[start:start + chunk_size] = fn(*(x[start:start + chunk_size] for x in arrays))
+        return tau[0] if single else tau
+
+    def inverse(self, q, qd, qdd, chunk_size=4096):
+        """Joint torques for a batch of states and accelerations.
+
+        :param q: Joint positions, shape (B, nq) or (nq,)
+        :param qd: Joint velocities, same shape as ``q``
+        :param qdd: Joint accelerations, same shape as ``q``
+        :param chunk_size: Samples processed per vectorized pass (bounds memory)
+        :return: Joint torques (forces for prismatic joints), same shape as ``q``
+        """
+        return self._chunked(self._inverse, (q, qd, qdd), chunk_size)
+
+    def _inverse(self, q, qd, qdd):
+        km = self.kinematics
+        batch, n = q.shape[0], len(km.link_names)
+        R, p = km._link_poses(q)
+
+        # Joint axes and rates of every link, link-major (zero for fixed joints)
+        moving = km.source >= 0
+        axis = _rotate(R, km.axis[:, None]) * moving[:, None, None]
+        rate = (qd[:, km.source] * km.multiplier).T[..., None] * axis
+        rate_dot = (qdd[:, km.source] * km.multiplier).T[..., None] * axis
+        revolute = km.kind == _REVOLUTE
+
+        # Forward pass: link velocities and accelerations in the root frame.
+        # Gravity enters as an upward acceleration of the fixed root.
+        omega = np.zeros((n, batch, 3))
+        alpha = np.zeros((n, batch, 3))
+        acc = np.zeros((n, batch, 3))
+        acc[0] = -self.gravity
+        for i in range(1, n):
+            parent = km.parent[i]
+            r = p[i] - p[parent]
+            w_p = omega[parent]
+            acc[i] = acc[parent] + _cross(alpha[parent], r) + _cross(w_p, _cross(w_p, r))
+            if revolute[i]:
+                omega[i] = w_p + rate[i]
+                alpha[i] = alpha[parent] + rate_dot[i] + _cross(w_p, rate[i])
+            else:
+                omega[i] = w_p
+                alpha[i] = alpha[parent]
+                if km.kind[i] == _PRISMATIC:
+                    acc[i] += rate_dot[i] + 2.0 * _cross(w_p, rate[i])
+
+        # Newton-Euler equations at every center of mass at once; moments about link origins
+        c = _rotate(R, self.com[:, None])
+        acc_c = acc + _cross(alpha, c) + _cross(omega, _cross(omega, c))
+        force = self.mass[:, None, None] * acc_c
+        # R I R^T x evaluated as R (I (R^T x))
+        inertia = self.inertia[:, None]
+        I_alpha = _rotate(R, _rotate(inertia, _rotate_back(R, alpha)))
+        I_omega = _rotate(R, _rotate(inertia, _rotate_back(R, omega)))
+        moment = I_alpha + _cross(omega, I_omega) + _cross(c, force)
+
+        # Backward pass: accumulate wrenches (about each link origin) towards the root
+        torque = np.zeros((n, batch))
+        for i in range(n - 1, 0, -1):
+            if moving[i]:
+                wrench = moment[i] if revolute[i] else force[i]
+                torque[i] = (axis[i] * wrench).sum(axis=1)
+            parent = km.parent[i]
+            force[parent] += force[i]
+            moment[parent] += moment[i] + _cross(p[i] - p[parent], force[i])
+        return self._project(torque, batch)
+
+    def gravity_torques(self, q, chunk_size=4096):
+        """Torques holding the robot static against gravity (``qd = qdd = 0``).
+
+        Fast path of :meth:`inverse`: only subtree masses and centers of mass
+        are propagated, no velocities, accelerations or inertia tensors.
+
+        :param q: Joint positions, shape (B, nq) or (nq,)
+        :param chunk_size: Samples processed per vectorized pass (bounds memory)
+        :return: Joint torques, same shape as ``q``
+        """
+        return self._chunked(self._gravity_torques, (q,), chunk_size)
+
+    def _gravity_torques(self, q):
+        km = self.kinematics
+        batch, n = q.shape[0], len(km.link_names)
+        R, p = km._link_poses(q)
+        # First moment of mass sum(m_k c_k) of each subtree, in the root frame
+        first_moment = self.mass[:, None, None] * (p + _rotate(R, self.com[:, None]))
+        subtree_mass = self._subtree_mass
+        torque = np.zeros((n, batch))
+        for i in range(n - 1, 0, -1):
+            if subtree_mass[i] == 0.0:
+                continue
+            if km.source[i] >= 0:
+                a = _rotate(R[i], km.axis[i])
+                # Subtree weight -m g acting at its center of mass
+                if km.kind[i] == _PRISMATIC:
+                    torque[i] = -subtree_mass[i] * (a @ self.gravity)
+                else:
+                    moment = _cross(first_moment[i] - subtree_mass[i] * p[i], -self.gravity)
+                    torque[i] = (a * moment).sum(axis=1)
+            first_moment[km.parent[i]] += first_moment[i]
+        return self._project(torque, batch)
+
+
+__all__ = [
+    "InverseDynamics",
+]
@@ -0,0 +1,799 @@
+"""Binary glTF (GLB) export with shared mesh buffers.
+
+Batch renderers that draw many robot instances should upload every mesh
+once. :func:`export_glb` turns a URDF or MJCF model and its meshes into a
+single ``.glb`` file:
+
+- one node per link/body, nested like the kinematic tree; visual geometry
+  hangs below its link node
+- every mesh file (or primitive shape) is stored once and shared by all
+  nodes referencing it, whatever their scale or material
+- per-vertex normals are precomputed (smooth, split at creases)
+- with ``quantize=True`` positions and normals are stored as 16-bit
+  integers (``KHR_mesh_quantization``); the dequantization transform is
+  folded into the visual node matrix and cancelled out of the normals
+- exports are cached under ``<cache>/gltf`` keyed by the content hash of
+  the model file, its meshes and the export options
+
+The joint data needed to pose the link nodes is stored in the node
+``extras``, so :class:`GlbScene` can compute node transforms for a batch of
+joint configurations, or write a posed copy of the file that only rewrites
+the JSON node matrices and reuses the binary chunk as is.
+
+Usage::
+
+    from openrd.gltf import export_model, GlbScene
+
+    path = export_model("unitree_g1", quantize=True)
+    scene = GlbScene(path)
+    local = scene.node_matrices(q)      # (B, n_links, 4, 4) for q of shape (B, nq)
+    scene.save("g1_posed.glb", q[0])
+
+    python -m openrd.gltf unitree_g1 [--format mjcf] [--quantize] [--output g1.glb]
+"""
+
+import argparse
+import json
+import os
+import struct
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from . import _cache, _stats
+from ._xml import MJCFDefaults, MJCFFrames
+from .mesh_loader import mesh_hash
+from .robot import _floats, load_urdf, parse_origin
+from .transforms import axis_angle_to_matrix, make_transform
+
+# Bump when the exported file layout changes
+_GLTF_VERSION = 2
+
+# Corners whose smooth normal deviates more than this from the face normal get a flat normal
+CREASE_ANGLE = np.radians(30.0)
+
+_GLB_MAGIC = 0x46546C67
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+
+_UNSIGNED_SHORT, _UNSIGNED_INT, _FLOAT, _SHORT = 5123, 5125, 5126, 5122
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+# Rotates the robot convention (z up) into the glTF convention (y up)
+_Z_UP_TO_Y_UP = make_transform(axis_angle_to_matrix([1.0, 0.0, 0.0], -np.pi / 2))
+
+_URDF_DEFAULT_RGBA = (0.7, 0.7, 0.7, 1.0)
+_MJCF_DEFAULT_RGBA = (0.5, 0.5, 0.5, 1.0)
+
+
+# ---------------------------------------------------------------------------
+# Scene description
+# ---------------------------------------------------------------------------
+#
+# Readers return ``(nodes, visuals, joint_names)``:
+#   nodes: dicts with 'name', 'parent' (index, -1 for the root), 'origin'
+#       (4x4 in the parent frame) and 'joints' (applied in order after the
+#       origin; dicts with 'name', 'type', 'axis', 'anchor', 'ref',
+#       'source', 'multiplier', 'offset'). Parents precede their children.
+#   visuals: ``(node index, name, T (4x4), scale (3,), shape, rgba)`` with
+#       shape ``("mesh", path)``, ``("box", extents)``, ``("sphere", radius)``,
+#       ``("cylinder", radius, length)`` or ``("capsule", radius, length)``
+#   joint_names: order of the configuration vector
+
+
+def _joint(name, joint_type, axis, anchor=(0.0, 0.0, 0.0), ref=0.0, source=None, multiplier=1.0, offset=0.0):
+    return {
+        "name": name,
+        "type": joint_type,
+        "axis": [float(v) for v in axis],
+        "anchor": [float(v) for v in anchor],
+        "ref": float(ref),
+        "source": source or name,
+        "multiplier": float(multiplier),
+        "offset": float(offset),
+    }
+
+
+def _urdf_rgba(item, named):
+    material = item.find("material")
+    if material is None:
+        return _URDF_DEFAULT_RGBA
+    color = material.find("color")
+    if color is not None and color.get("rgba"):
+        return tuple(float(v) for v in color.get("rgba").split())
+    return named.get(material.get("name"), _URDF_DEFAULT_RGBA)
+
+
+def _urdf_materials(robot_el):
+    """Top-level URDF materials with a color: name -> rgba."""
+    named = {}
+    for material in robot_el.findall("material"):
+        color = material.find("color")
+        if color is not None and color.get("rgba"):
+            named[material.get("name")] = tuple(float(v) for v in color.get("rgba").split())
+    return named
+
+
+def _urdf_scene(path, geometry):
+    model = load_urdf(path)
+    named = _urdf_materials(model.tree.getroot())
+
+    joints = model.topological_joints()
+    nodes = [{"name": model.root, "parent": -1, "origin": np.eye(4), "joints": []}]
+    index = {model.root: 0}
+    for joint in joints:
+        index[joint.child] = len(nodes)
+        node = {"name": joint.child, "parent": index[joint.parent], "origin": joint.origin, "joints": []}
+        if joint.type in ("revolute", "continuous", "prismatic"):
+            kind = "prismatic" if joint.type == "prismatic" else "revolute"
+            source, multiplier, offset = joint.mimic or (joint.name, 1.0, 0.0)
+            node["joints"].append(_joint(joint.name, kind, joint.axis, source=source, multiplier=multiplier,
+                                         offset=offset))
+        nodes.append(node)
+
+    visuals = []
+    for name, i in index.items():
+        for k, item in enumerate(model.links[name].element.findall(geometry)):
+            geom = item.find("geometry")
+            shape, scale = None, np.ones(3)
+            if geom is None:
+                continue
+            if geom.find("mesh") is not None and geom.find("mesh").get("filename"):
+                mesh = geom.find("mesh")
+                shape = ("mesh", model.resolve_filename(mesh.get("filename")))
+                scale = _floats(mesh.get("scale"), [1, 1, 1])
+            elif geom.find("box") is not None:
+                shape = ("box", tuple(_floats(geom.find("box").get("size"), [0, 0, 0])))
+            elif geom.find("cylinder") is not None:
+                cylinder = geom.find("cylinder")
+                shape = ("cylinder", float(cylinder.get("radius")), float(cylinder.get("length")))
+            elif geom.find("sphere") is not None:
+                shape = ("sphere", float(geom.find("sphere").get("radius")))
+            if shape is not None:
+                visuals.append((i, item.get("name") or f"{name}_{geometry}_{k}", parse_origin(item), scale, shape,
+                                _urdf_rgba(item, named)))
+    return nodes, visuals, [j.name for j in joints if j.is_actuated]
+
+
+def _z_axis_rotation(direction):
+    z = direction / np.linalg.norm(direction)
+    axis = np.cross([0.0, 0.0, 1.0], z)
+    s = np.linalg.norm(axis)
+    if s < 1e-12:
+        return np.eye(3) if z[2] > 0 else np.diag([1.0, -1.0, -1.0])
+    return axis_angle_to_matrix(axis / s, np.arctan2(s, z[2]))
+
+
+def _mjcf_geom(attrs, frames, meshes):
+    """Return ``(T, scale, shape)`` of a resolved MJCF geom, or None if it is not drawable."""
+    geom_type = attrs.get("type") or ("mesh" if attrs.get("mesh") else "sphere")
+    size = [float(v) for v in attrs.get("size", "0 0 0").split()]
+    element = ET.Element("geom", attrs)
+    T, scale = frames.transform(element), np.ones(3)
+    if attrs.get("fromto") and geom_type in ("capsule", "cylinder"):
+        v = np.array([float(t) for t in attrs["fromto"].split()])
+        T = make_transform(_z_axis_rotation(v[3:] - v[:3]), (v[:3] + v[3:]) / 2)
+        length = float(np.linalg.norm(v[3:] - v[:3]))
+    else:
+        length = 2 * size[1] if len(size) > 1 else 0.0
+    if geom_type == "mesh":
+        if attrs.get("mesh") not in meshes:
+            return None
+        path, scale = meshes[attrs["mesh"]]
+        return T, scale, ("mesh", path)
+    if geom_type == "sphere":
+        return T, scale, ("sphere", size[0])
+    if geom_type == "ellipsoid":
+        return T, np.array(size[:3]), ("sphere", 1.0)
+    if geom_type == "box":
+        return T, scale, ("box", tuple(2 * s for s in size[:3]))
+    if geom_type in ("capsule", "cylinder"):
+        return T, scale, (geom_type, size[0], length)
+    # plane, hfield, sdf: not part of the robot
+    return None
+
+
+def _mjcf_assets(root, path, defaults):
+    """Return ``(meshes, materials)``: mesh name -> (absolute path, scale), material name -> rgba."""
+    base_dir = os.path.dirname(os.path.abspath(path))
+    compiler = root.find("compiler")
+    meshdir = ""
+    if compiler is not None:
+        meshdir = compiler.get("meshdir") or compiler.get("assetdir") or ""
+    meshes, materials = {}, {}
+    for asset in root.findall("asset"):
+        for mesh in asset.findall("mesh"):
+            attrs = defaults.resolve(mesh)
+            if not attrs.get("file"):
+                continue
+            name = attrs.get("name") or os.path.splitext(os.path.basename(attrs["file"]))[0]
+            mesh_path = os.path.normpath(os.path.join(base_dir, meshdir, attrs["file"]))
+            meshes[name] = (mesh_path, _floats(attrs.get("scale"), [1, 1, 1]))
+        for material in asset.findall("material"):
+            attrs = defaults.resolve(material)
+            materials[material.get("name")] = tuple(float(v) for v in attrs.get("rgba", "1 1 1 1").split())
+    return meshes, materials
+
+
+def _mjcf_rgba(attrs, materials):
+    if attrs.get("rgba"):
+        return tuple(float(v) for v in attrs["rgba"].split())
+    return materials.get(attrs.get("material"), _MJCF_DEFAULT_RGBA)
+
+
+def _mjcf_couplings(root, defaults):
+    """Linear joint equality constraints: joint1 -> (joint2, multiplier, offset)."""
+    couplings = {}
+    for equality in root.findall("equality"):
+        for el in equality.findall("joint"):
+            attrs = defaults.resolve(el)
+            coef = [float(v) for v in attrs.get("polycoef", "0 1 0 0 0").split()] + [0.0] * 5
+            if attrs.get("active", "true") == "false" or not attrs.get("joint2") or any(coef[2:5]):
+                continue
+            couplings[attrs["joint1"]] = (attrs["joint2"], coef[1], coef[0])
+    return couplings
+
+
+def _mjcf_scene(path, geometry):
+    root = ET.parse(path).getroot()
+    frames = MJCFFrames(root)
+    defaults = MJCFDefaults(root)
+    meshes, materials = _mjcf_assets(root, path, defaults)
+
+    nodes, geoms, joint_names = [], [], []
+
+    def visit(body, parent, childclass):
+        i = len(nodes)
+        is_world = body.tag == "worldbody"
+        node = {"name": "world" if is_world else body.get("name", f"body{i}"), "parent": parent,
+                "origin": np.eye(4) if is_world else frames.transform(body), "joints": []}
+        nodes.append(node)
+        childclass = body.get("childclass") or childclass
+        for joint in body.findall("joint"):
+            attrs = defaults.resolve(joint, childclass)
+            joint_type = attrs.get("type", "hinge")
+            if joint_type not in ("hinge", "slide"):
+                # Free and ball joints are held at their reference pose
+                continue
+            ref = float(attrs.get("ref", 0.0))
+            if joint_type == "hinge" and frames.degrees:
+                ref = np.radians(ref)
+            axis = _floats(attrs.get("axis"), [0, 0, 1])
+            name = attrs.get("name") or f"{node['name']}_joint{len(node['joints'])}"
+            node["joints"].append(_joint(name, "revolute" if joint_type == "hinge" else "prismatic",
+                                         axis / np.linalg.norm(axis), _floats(attrs.get("pos"), [0, 0, 0]), ref))
+            joint_names.append(name)
+        for k, geom in enumerate(body.findall("geom")):
+            attrs = defaults.resolve(geom, childclass)
+            resolved = _mjcf_geom(attrs, frames, meshes)
+            if resolved is None:
+                continue
+            rgba = _mjcf_rgba(attrs, materials)
+            visual = attrs.get("contype", "1") == "0" and attrs.get("conaffinity", "1") == "0"
+            geoms.append((i, attrs.get("name") or f"{node['name']}_geom{k}", resolved, rgba, visual))
+        for child in body.findall("body"):
+            visit(child, i, childclass)
+
+    if root.find("worldbody") is None:
+        raise ValueError(f"{path} is not an MJCF model (no <worldbody>).")
+    visit(root.find("worldbody"), -1, None)
+
+    # Joints coupled by a linear <equality><joint> follow their source joint
+    for joint1, (joint2, multiplier, offset) in _mjcf_couplings(root, defaults).items():
+        for node in nodes:
+            for joint in node["joints"]:
+                if joint["name"] == joint1 and joint2 in joint_names:
+                    joint.update(source=joint2, multiplier=multiplier, offset=offset + joint["ref"])
+                    joint_names.remove(joint1)
+
+    # Models without visual-only geoms draw their collision geoms
+    has_visual = any(visual for *_, visual in geoms)
+    wanted = (geometry == "visual") if has_visual else None
+    visuals = [(i, name, T, scale, shape, rgba)
+               for i, name, (T, scale, shape), rgba, visual in geoms if wanted is None or visual == wanted]
+    return nodes, visuals, joint_names
+
+
+def _read_scene(path, model_format, geometry):
+    if geometry not in ("visual", "collision"):
+        raise ValueError(f"Unsupported geometry: {geometry}. Use 'visual' or 'collision'.")
+    if model_format == "urdf":
+        return _urdf_scene(path, geometry)
+    if model_format == "mjcf":
+        return _mjcf_scene(path, geometry)
+    raise ValueError(f"Unsupported model format: {model_format}. Use 'urdf' or 'mjcf'.")
+
+
+# ---------------------------------------------------------------------------
+# Geometry
+# ---------------------------------------------------------------------------
+
+def _shape_mesh(shape):
+    """Return ``(vertices, faces)`` of a scene shape."""
+    import trimesh
+
+    kind = shape[0]
+    if kind == "mesh":
+        from .mesh_loader import load_mesh
+
+        mesh = load_mesh(shape[1])
+    elif kind == "box":
+        mesh = trimesh.creation.box(extents=shape[1])
+    elif kind == "sphere":
+        mesh = trimesh.creation.icosphere(subdivisions=3, radius=shape[1])
+    elif kind == "cylinder":
+        mesh = trimesh.creation.cylinder(radius=shape[1], height=shape[2], sections=32)
+    else:
+        mesh = trimesh.creation.capsule(height=shape[2], radius=shape[1], count=[32, 16])
+    return np.asarray(mesh.vertices, dtype=float), np.asarray(mesh.faces, dtype=np.int64)
+
+
+def shade(vertices, faces, crease_angle=CREASE_ANGLE):
+    """Compute per-vertex normals, splitting vertices at sharp creases.
+
+    The normal of a face corner is the area-weighted average of the normals
+    of the faces around its vertex that deviate at most ``crease_angle``
+    from its own face. Corners of a vertex with the same normal share one
+    output vertex, so CAD meshes keep sharp edges while curved surfaces stay
+    smooth. Degenerate faces are dropped.
+
+    :param vertices: Array of shape (V, 3)
+    :param faces: Integer array of shape (F, 3)
+    :param crease_angle: Split threshold in radians
+    :return: ``(vertices, normals, faces)`` with one row per distinct (vertex, normal)
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces, dtype=np.int64)
+    corners = vertices[faces]
+    cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    area = np.linalg.norm(cross, axis=1)
+    keep = area > 0
+    faces, cross, area = faces[keep], cross[keep], area[keep]
+    face_normals = cross / area[:, None]
+
+    # Pair every corner with every corner of the same vertex
+    corner_vertex = faces.ravel()
+    order = np.argsort(corner_vertex, kind="stable")
+    counts = np.bincount(corner_vertex, minlength=len(vertices))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    degree = counts[corner_vertex[order]]
+    first = np.repeat(order, degree)
+    offsets = np.arange(degree.sum()) - np.repeat(np.cumsum(degree) - degree, degree)
+    second = order[np.repeat(starts[corner_vertex[order]], degree) + offsets]
+    face_a, face_b = first // 3, second // 3
+    smooth = np.einsum("ij,ij->i", face_normals[face_a], face_normals[face_b]) >= np.cos(crease_angle)
+    normals = np.column_stack([
+        np.bincount(first[smooth], weights=cross[face_b[smooth], c], minlength=faces.size) for c in range(3)
+    ])
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+
+    # One output vertex per distinct (vertex, normal)
+    packed = np.round(normals * 1000).astype(np.int64) + 1000
+    keys = ((corner_vertex * 2001 + packed[:, 0]) * 2001 + packed[:, 1]) * 2001 + packed[:, 2]
+    _, unique, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return vertices[corner_vertex[unique]], normals[unique], inverse.reshape(faces.shape)
+
+
+class _BufferBuilder:
+    """Accumulate aligned buffer views and accessors of one GLB binary chunk."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.views = []
+        self.accessors = []
+
+    def add(self, data, target, stride=None):
+        data = np.ascontiguousarray(data).tobytes()
+        view = {"buffer": 0, "byteOffset": self.size, "byteLength": len(data), "target": target}
+        if stride is not None:
+            view["byteStride"] = stride
+        self.chunks.append(data)
+        self.chunks.append(b"\0" * (-len(data) % 4))
+        self.size += len(data) + (-len(data) % 4)
+        self.views.append(view)
+        return len(self.views) - 1
+
+    def accessor(self, view, component, count, kind, **extra):
+        self.accessors.append({"bufferView": view, "componentType": component, "count": int(count), "type": kind,
+                               **extra})
+        return len(self.accessors) - 1
+
+    def tobytes(self):
+        return b"".join(self.chunks)
+
+
+def _add_geometry(buffers, vertices, normals, faces, quantize):
+    """Store one shape; return its primitive attributes, index accessor and dequantization matrix."""
+    dequantize = np.eye(4)
+    if quantize:
+        lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+        step = np.maximum(hi - lo, 1e-12) / 65535.0
+        positions = np.zeros((len(vertices), 4), dtype=np.uint16)
+        positions[:, :3] = np.round((vertices - lo) / step)
+        dequantize = make_transform(np.diag(step), lo)
+        view = buffers.add(positions, _ARRAY_BUFFER, stride=8)
+        position = buffers.accessor(view, _UNSIGNED_SHORT, len(vertices), "VEC3",
+                                    min=positions[:, :3].min(axis=0).tolist(),
+                                    max=positions[:, :3].max(axis=0).tolist())
+        # Renderers transform normals by the inverse transpose of diag(step): pre-scale to cancel
+        # it. That amplifies rounding errors by the aspect ratio of the mesh, too much for int8.
+        scaled = normals * step
+        scaled /= np.maximum(np.linalg.norm(scaled, axis=1), 1e-12)[:, None]
+        packed = np.zeros((len(normals), 4), dtype=np.int16)
+        packed[:, :3] = np.round(scaled * 32767.0)
+        view = buffers.add(packed, _ARRAY_BUFFER, stride=8)
+        normal = buffers.accessor(view, _SHORT, len(normals), "VEC3", normalized=True)
+    else:
+        positions = vertices.astype(np.float32)
+        view = buffers.add(positions, _ARRAY_BUFFER)
+        position = buffers.accessor(view, _FLOAT, len(vertices), "VEC3", min=positions.min(axis=0).tolist(),
+                                    max=positions.max(axis=0).tolist())
+        view = buffers.add(normals.astype(np.float32), _ARRAY_BUFFER)
+        normal = buffers.accessor(view, _FLOAT, len(normals), "VEC3")
+    small = len(vertices) <= 0xFFFF
+    view = buffers.add(faces.astype(np.uint16 if small else np.uint32), _ELEMENT_ARRAY_BUFFER)
+    indices = buffers.accessor(view, _UNSIGNED_SHORT if small else _UNSIGNED_INT, faces.size, "SCALAR")
+    return {"POSITION": position, "NORMAL": normal}, indices, dequantize
+
+
+def _matrix(T):
+    """glTF stores node matrices column-major."""
+    return [float(v) for v in np.asarray(T).T.ravel()]
+
+
+def _pack_glb(gltf, binary):
+    text = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    text += b" " * (-len(text) % 4)
+    binary = bytes(binary) + b"\0" * (-len(binary) % 4)
+    length = 12 + 8 + len(text) + 8 + len(binary)
+    return b"".join([
+        struct.pack("<III", _GLB_MAGIC, 2, length),
+        struct.pack("<II", len(text), _CHUNK_JSON), text,
+        struct.pack("<II", len(binary), _CHUNK_BIN), binary,
+    ])
+
+
+def _build_glb(nodes, visuals, joint_names, source, quantize, y_up, available):
+    buffers = _BufferBuilder()
+    shapes, materials, meshes, missing = {}, {}, {}, []
+    gltf_materials, gltf_meshes = [], []
+    gltf_nodes = []
+    for node in nodes:
+        extras = {"origin": node["origin"].tolist()}
+        if node["joints"]:
+            extras["joints"] = node["joints"]
+        gltf_nodes.append({"name": node["name"], "matrix": _matrix(node["origin"]), "extras": extras})
+
+    for i, name, T, scale, shape, rgba in visuals:
+        if shape[0] == "mesh" and not available(shape[1]):
+            missing.append(shape[1])
+            continue
+        if shape not in shapes:
+            vertices, normals, faces = shade(*_shape_mesh(shape))
+            shapes[shape] = _add_geometry(buffers, vertices, normals, faces, quantize)
+        attributes, indices, dequantize = shapes[shape]
+        rgba = tuple(float(v) for v in rgba)
+        if rgba not in materials:
+            materials[rgba] = len(gltf_materials)
+            material = {"pbrMetallicRoughness": {"baseColorFactor": list(rgba), "metallicFactor": 0.0,
+                                                 "roughnessFactor": 0.8}}
+            if rgba[3] < 1.0:
+                material["alphaMode"] = "BLEND"
+            gltf_materials.append(material)
+        key = (shape, rgba)
+        if key not in meshes:
+            # glTF meshes bind a material; the accessors are shared across materials
+            meshes[key] = len(gltf_meshes)
+            gltf_meshes.append({"primitives": [{"attributes": attributes, "indices": indices,
+                                                "material": materials[rgba]}]})
+        gltf_node = {"name": name, "mesh": meshes[key],
+                     "matrix": _matrix(T @ np.diag(np.append(scale, 1.0)) @ dequantize)}
+        gltf_nodes[i].setdefault("children", []).append(len(gltf_nodes))
+        gltf_nodes.append(gltf_node)
+
+    for i, node in enumerate(nodes):
+        if node["parent"] >= 0:
+            gltf_nodes[node["parent"]].setdefault("children", []).append(i)
+    roots = [i for i, node in enumerate(nodes) if node["parent"] < 0]
+    if y_up:
+        gltf_nodes.append({"name": "openrd_y_up", "matrix": _matrix(_Z_UP_TO_Y_UP), "children": roots})
+        roots = [len(gltf_nodes) - 1]
+
+    binary = buffers.tobytes()
+    gltf = {
+        "asset": {"version": "2.0", "generator": "openrd"},
+        "scene": 0,
+        "scenes": [{"nodes": roots, "extras": {"openrd": {
+            "version": _GLTF_VERSION, "source": source, "links": len(nodes), "joint_names": joint_names,
+            "missing": sorted(set(missing)),
+        }}}],
+        "nodes": gltf_nodes,
+        "meshes": gltf_meshes,
+        "materials": gltf_materials,
+        "accessors": buffers.accessors,
+        "bufferViews": buffers.views,
+        "buffers": [{"byteLength": len(binary)}],
+    }
+    if quantize:
+        gltf["extensionsUsed"] = gltf["extensionsRequired"] = ["KHR_mesh_quantization"]
+    return _pack_glb(gltf, binary)
+
+
+# ---------------------------------------------------------------------------
+# Cached entry points
+# ---------------------------------------------------------------------------
+
+@_stats.timed("gltf.export_glb")
+def export_glb(path, model_format="urdf", geometry="visual", quantize=False, y_up=True):
+    """Export a model file to GLB and return the cached output path.
+
+    :param path: Path to a URDF or MJCF file
+    :param model_format: 'urdf' or 'mjcf'
+    :param geometry: Which geometry to export, 'visual' or 'collision'. MJCF
+        models without visual-only geoms (``contype=conaffinity=0``) always
+        export all geoms.
+    :param quantize: Store positions and normals as integers (``KHR_mesh_quantization``)
+    :param y_up: Wrap the model in a node rotating z-up into the glTF y-up convention
+    :return: Absolute path to the GLB file in the openrd cache. Meshes missing
+        on disk are skipped and listed in the scene extras.
+    """
+    nodes, visuals, joint_names = _read_scene(path, model_format, geometry)
+    mesh_keys = {}
+    for *_, shape, _ in visuals:
+        if shape[0] == "mesh" and shape[1] not in mesh_keys:
+            try:
+                mesh_keys[shape[1]] = mesh_hash(shape[1])
+            except FileNotFoundError:
+                mesh_keys[shape[1]] = None
+    key = _cache.hash_key(_GLTF_VERSION, _cache.hash_file(path), os.path.abspath(path), model_format, geometry,
+                          bool(quantize), bool(y_up), sorted(mesh_keys.items()))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    out_path = os.path.join(_cache.cache_dir("gltf"), f"{stem}-{key}.glb")
+    hit = os.path.exists(out_path)
+    _stats.cache_event("gltf", hit)
+    if hit:
+        return out_path
+    data = _build_glb(nodes, visuals, joint_names, os.path.basename(path), quantize, y_up,
+                      lambda mesh_path: mesh_keys[mesh_path] is not None)
+    return _cache.atomic_write(out_path, data)
+
+
+def export_model(name, version=None, variant=None, model_format="urdf", **options):
+    """Export a bundled model to GLB and return the path of the cached file.
+
+    :param name: Robot name, e.g. 'unitree_g1'
+    :param version: Robot version, optional
+    :param variant: Variant name, optional
+    :param model_format: 'urdf' or 'mjcf', default is 'urdf'
+    :param options: Export options (``geometry``, ``quantize``, ``y_up``), see :func:`export_glb`
+    :return: Absolute path to the GLB file
+    """
+    from . import get_model_path
+
+    path = get_model_path(name, version=version, variant=variant, model_format=model_format)
+    return export_glb(path, model_format=model_format, **options)
+
+
+# ---------------------------------------------------------------------------
+# Posing exported files
+# ---------------------------------------------------------------------------
+
+def read_glb(data):
+    """Split GLB bytes into the parsed JSON document and the binary chunk.
+
+    :param data: Contents of a ``.glb`` file
+    :return: ``(gltf, binary)``
+    """
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    if magic != _GLB_MAGIC or version != 2:
+        raise ValueError("Not a glTF 2.0 binary file.")
+    json_length, json_type = struct.unpack_from("<II", data, 12)
+    if json_type != _CHUNK_JSON:
+        raise ValueError("GLB file does not start with a JSON chunk.")
+    gltf = json.loads(bytes(data[20:20 + json_length]))
+    binary = b""
+    offset = 20 + json_length
+    if offset < length:
+        bin_length, bin_type = struct.unpack_from("<II", data, offset)
+        if bin_type == _CHUNK_BIN:
+            binary = data[offset + 8:offset + 8 + bin_length]
+    return gltf, binary
+
+
+class SceneKinematics:
+    """Batched forward kinematics of a link tree whose nodes carry joint lists.
+
+    Each link pose is its origin followed by the motions of its joints (see
+    the scene description above), so MJCF bodies with several joints, joint
+    anchors and reference positions are handled as well as URDF joints.
+
+    :param link_names: Link names, parents before children
+    :param parent: Parent index of every link (-1 for roots)
+    :param origin: Link origins in the parent frame, shape (n_links, 4, 4)
+    :param node_joints: Joint dicts of every link
+    :param joint_names: Order of the configuration vector; joints left out
+        are held at their reference position
+    """
+
+    def __init__(self, link_names, parent, origin, node_joints, joint_names):
+        self.link_names = list(link_names)
+        self.parent = np.asarray(parent, dtype=int)
+        self.origin = np.asarray(origin, dtype=float)
+        self.joint_names = list(joint_names)
+
+        # Group driven joints into layers: layer k holds the k-th joint of every node
+        q_index = {name: i for i, name in enumerate(self.joint_names)}
+        self._layers = []
+        for i, joints in enumerate(node_joints):
+            for k, joint in enumerate(joints):
+                if joint["source"] not in q_index:
+                    continue
+                while len(self._layers) <= k:
+                    self._layers.append([])
+                self._layers[k].append((i, joint, q_index[joint["source"]]))
+        self._layers = [self._pack(layer) for layer in self._layers if layer]
+        self._moving = sorted({int(i) for layer in self._layers for i in layer["node"]})
+
+    @classmethod
+    def from_file(cls, path, model_format="urdf", joint_names=None):
+        """Build the kinematics of a URDF or MJCF file.
+
+        MJCF models are rooted at a 'world' link; free and ball joints are
+        held at their reference pose.
+
+        :param joint_names: Order of the configuration vector, optional
+            (default: actuated URDF joints or MJCF hinge/slide joints)
+        """
+        nodes, _, all_joints = _read_scene(path, model_format, "visual")
+        joint_names = all_joints if joint_names is None else joint_names
+        return cls([node["name"] for node in nodes], [node["parent"] for node in nodes],
+                   [node["origin"] for node in nodes], [node["joints"] for node in nodes], joint_names)
+
+    @staticmethod
+    def _pack(layer):
+        return {
+            "node": np.array([i for i, _, _ in layer], dtype=int),
+            "source": np.array([s for _, _, s in layer], dtype=int),
+            "prismatic": np.array([j["type"] == "prismatic" for _, j, _ in layer]),
+            "axis": np.array([j["axis"] for _, j, _ in layer], dtype=float),
+            "anchor": np.array([j["anchor"] for _, j, _ in layer], dtype=float),
+            "ref": np.array([j["ref"] for _, j, _ in layer], dtype=float),
+            "multiplier": np.array([j["multiplier"] for _, j, _ in layer], dtype=float),
+            "offset": np.array([j["offset"] for _, j, _ in layer], dtype=float),
+        }
+
+    @property
+    def nq(self):
+        """Size of the configuration vector."""
+        return len(self.joint_names)
+
+    def node_matrices(self, q):
+        """Local transforms of all link nodes (relative to their parent node).
+
+        :param q: Joint positions, shape (B, nq) or (nq,)
+        :return: Array of shape (B, n_links, 4, 4) (or (n_links, 4, 4) for 1-D input)
+        """
+        q = np.asarray(q, dtype=float)
+        single = q.ndim == 1
+        q = np.atleast_2d(q)
+        if q.shape[1] != self.nq:
+            raise ValueError(f"Expected {self.nq} joint positions, got {q.shape[1]}.")
+        M = np.repeat(self.origin[None], len(q), axis=0)
+        for layer in self._layers:
+            value = q[:, layer["source"]] * layer["multiplier"] + layer["offset"] - layer["ref"]
+            prismatic = layer["prismatic"]
+            T = np.zeros(value.shape + (4, 4))
+            T[..., 3, 3] = 1.0
+            R = axis_angle_to_matrix(layer["axis"], np.where(prismatic, 0.0, value))
+            T[..., :3, :3] = R
+            # Rotation about the anchor a: p = a - R a; translation along the axis for slides
+            T[..., :3, 3] = layer["anchor"] - np.einsum("bjik,jk->bji", R, layer["anchor"])
+            T[..., :3, 3] += np.where(prismatic, value, 0.0)[..., None] * layer["axis"]
+            M[:, layer["node"]] = M[:, layer["node"]] @ T
+        return M[0] if single else M
+
+    def link_poses(self, q):
+        """Poses of all link nodes in the model root frame.
+
+        :param q: Joint positions, shape (B, nq) or (nq,)
+        :return: Array of shape (B, n_links, 4, 4) (or (n_links, 4, 4) for 1-D input)
+        """
+        local = np.asarray(self.node_matrices(q))
+        single = local.ndim == 3
+        local = local[None] if single else local
+        poses = local.copy()
+        for i in range(len(self.link_names)):
+            if self.parent[i] >= 0:
+                poses[:, i] = poses[:, self.parent[i]] @ local[:, i]
+        return poses[0] if single else poses
+
+
+class GlbScene(SceneKinematics):
+    """An exported GLB file whose link nodes can be posed from joint configurations.
+
+    :param source: Path of a GLB file written by :func:`export_glb`
+    :ivar link_names: Names of the link nodes (node indices ``0..n_links-1``)
+    :ivar joint_names: Order of the configuration vector; joints left out are
+        held at their reference position
+    """
+
+    def __init__(self, source):
+        with open(source, "rb") as f:
+            self.data = f.read()
+        self.gltf, self.binary = read_glb(self.data)
+        info = self.gltf["scenes"][0].get("extras", {}).get("openrd")
+        if info is None:
+            raise ValueError(f"{source} was not exported by openrd.gltf.")
+        n = info["links"]
+        nodes = self.gltf["nodes"][:n]
+        parent = np.full(n, -1, dtype=int)
+        for i, node in enumerate(nodes):
+            for child in node.get("children", ()):
+                if child < n:
+                    parent[child] = i
+        super().__init__([node["name"] for node in nodes], parent,
+                         [node["extras"]["origin"] for node in nodes],
+                         [node["extras"].get("joints", ()) for node in nodes], info["joint_names"])
+
+    def posed(self, q):
+        """Return GLB bytes with the link nodes posed at ``q``.
+
+        Only the matrices of nodes driven by a joint are rewritten; the
+        binary chunk is reused unchanged.
+
+        :param q: Joint positions, shape (nq,)
+        """
+        local = self.node_matrices(np.asarray(q, dtype=float).reshape(self.nq))
+        nodes = list(self.gltf["nodes"])
+        for i in self._moving:
+            nodes[i] = dict(nodes[i], matrix=_matrix(local[i]))
+        return _pack_glb(dict(self.gltf, nodes=nodes), self.binary)
+
+    def save(self, path, q=None):
+        """Write the scene to ``path``, posed at ``q`` if given.
+
+        :param path: Output ``.glb`` path
+        :param q: Joint positions, shape (nq,), optional
+        :return: ``path``
+        """
+        return _cache.atomic_write(path, self.data if q is None else self.posed(q))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export robot models to binary glTF (GLB)")
+    parser.add_argument("robot", help="Robot name, e.g. unitree_g1")
+    parser.add_argument("--version", default=None, help="Robot version")
+    parser.add_argument("--variant", default=None, help="Variant name")
+    parser.add_argument("--format", choices=["urdf", "mjcf"], default="urdf", help="Source model format")
+    parser.add_argument("--geometry", choices=["visual", "collision"], default="visual", help="Geometry to export")
+    parser.add_argument("--quantize", action="store_true", help="Quantize positions and normals")
+    parser.add_argument("--z-up", action="store_true", help="Keep the z-up robot frame as the scene frame")
+    parser.add_argument("--output", default=None, help="Copy the export to this path")
+    args = parser.parse_args(argv)
+
+    path = export_model(args.robot, version=args.version, variant=args.variant, model_format=args.format,
+                        geometry=args.geometry, quantize=args.quantize, y_up=not args.z_up)
+    scene = GlbScene(path)
+    missing = scene.gltf["scenes"][0]["extras"]["openrd"]["missing"]
+    for mesh_path in missing:
+        print(f"  ⚠ missing mesh {mesh_path}")
+    if args.output:
+        path = scene.save(args.output)
+    print(f"✓ {len(scene.link_names)} links, {len(scene.gltf['meshes'])} meshes, "
+          f"{os.path.getsize(path) / 1e6:.1f} MB → {path}")
+
+
+__all__ = [
+    "CREASE_ANGLE",
+    "shade",
+    "export_glb",
+    "export_model",
+    "read_glb",
+    "SceneKinematics",
+    "GlbScene",
+]
+
+
+if __name__ == "__main__":
+    main()
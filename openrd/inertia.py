@@ -0,0 +1,377 @@
+"""Mesh-derived mass properties and verification of URDF ``<inertial>`` data.
+
+Inertial blocks exported from CAD are sometimes wrong (swapped axes, wrong
+units, a COM in the wrong frame, tensors violating the triangle inequality)
+and destabilize simulation. This module integrates the link meshes with
+``trimesh`` to get volume, center of mass and inertia tensor, assuming a
+uniform density (given, or implied by the URDF link mass), and compares them
+with the URDF values.
+
+Per-mesh properties are computed for unit density in worker processes and
+cached under ``<cache>/inertia`` keyed by the mesh content hash, so re-runs
+over the mesh library only integrate meshes that changed.
+
+Usage::
+
+    from openrd.inertia import verify_model, correct_model
+
+    for report in verify_model("unitree_g1"):
+        if report.flagged:
+            print(report.link, report.com_error, report.inertia_error)
+    path = correct_model("unitree_g1")  # cached URDF with mesh-derived inertials
+
+    python -m openrd.inertia meshes [--robots unitree_g1] [--workers 4]
+    python -m openrd.inertia check [--robots unitree_g1] [--density 1000] [--write]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from . import _cache, _stats
+from .mesh_loader import mesh_hash
+from .robot import RobotModel, load_urdf, tostring
+from .transforms import combine_inertias
+
+MESHES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "meshes")
+
+# Bump when the cached per-mesh properties change
+_INERTIA_VERSION = 1
+
+# Default flagging thresholds: COM distance in meters, relative Frobenius error of the tensor
+DEFAULT_COM_TOLERANCE = 0.02
+DEFAULT_INERTIA_TOLERANCE = 0.5
+# Lighter links carry placeholder inertials and are only checked for physical validity
+DEFAULT_MIN_MASS = 1e-3
+
+_MESH_EXTENSIONS = (".stl", ".obj", ".ply", ".dae")
+
+
+def _compute_mesh_properties(path):
+    from .mesh_loader import load_mesh
+
+    mesh = load_mesh(path)
+    properties = mesh.mass_properties
+    volume = float(properties["volume"])
+    center = np.asarray(properties["center_mass"], dtype=float)
+    inertia = np.asarray(properties["inertia"], dtype=float)
+    if volume < 0:
+        # Inward-facing triangles: the divergence integrals change sign
+        volume, inertia = -volume, -inertia
+    return {
+        "volume": volume,
+        "center_mass": center.tolist(),
+        "inertia": inertia.tolist(),
+        "watertight": bool(mesh.is_watertight),
+        "faces": int(len(mesh.faces)),
+    }
+
+
+def _cached_mesh_properties(path):
+    """Unit-density properties of one mesh, read from or written to the cache."""
+    key = _cache.hash_key(_INERTIA_VERSION, mesh_hash(path))
+    cache_path = os.path.join(_cache.cache_dir("inertia"), f"{key}.json")
+    hit = os.path.exists(cache_path)
+    _stats.cache_event("inertia", hit)
+    if hit:
+        with open(cache_path) as f:
+            properties = json.load(f)
+    else:
+        properties = _compute_mesh_properties(path)
+        _cache.atomic_write(cache_path, json.dumps(properties))
+    properties["key"] = key
+    return properties
+
+
+def mesh_properties(paths, workers=None):
+    """Volume, center of mass and inertia of meshes, for unit density.
+
+    Meshes are hashed and (on a cache miss) integrated in parallel.
+
+    :param paths: Mesh file paths
+    :param workers: Worker processes (default: CPU count); 0 or 1 runs in-process
+    :return: Dict of path -> dict with 'volume', 'center_mass' (3,),
+        'inertia' (3x3, about the center of mass, mesh frame), 'watertight',
+        'faces' and the cache 'key'
+    """
+    paths = list(dict.fromkeys(paths))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        results = [_cached_mesh_properties(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_cached_mesh_properties, paths, chunksize=max(1, len(paths) // (4 * workers))))
+    for properties in results:
+        properties["center_mass"] = np.asarray(properties["center_mass"], dtype=float)
+        properties["inertia"] = np.asarray(properties["inertia"], dtype=float)
+    return dict(zip(paths, results))
+
+
+def _transform_properties(properties, T, scale):
+    """Unit-density (volume, com, inertia) of a mesh placed by ``T`` with per-axis ``scale``."""
+    S = np.diag(scale)
+    det = abs(float(np.prod(scale)))
+    inertia = properties["inertia"]
+    # Second moment about the COM, which scales as |det S| S C S
+    second_moment = det * S @ (0.5 * np.trace(inertia) * np.eye(3) - inertia) @ S
+    R = T[:3, :3]
+    second_moment = R @ second_moment @ R.T
+    com = R @ (S @ properties["center_mass"]) + T[:3, 3]
+    return properties["volume"] * det, com, np.trace(second_moment) * np.eye(3) - second_moment
+
+
+def _is_physical(inertia, eps=1e-12):
+    """Positive principal moments satisfying the triangle inequality."""
+    if not np.allclose(inertia, inertia.T, atol=eps):
+        return False
+    moments = np.linalg.eigvalsh(inertia)
+    return bool(moments[0] > 0 and moments[0] + moments[1] >= moments[2] - eps * max(1.0, moments[2]))
+
+
+def _load(model):
+    return model if isinstance(model, RobotModel) else load_urdf(model)
+
+
+def _link_meshes(model, geometry):
+    """Link name -> [(origin, absolute mesh path, scale)] for links with meshes.
+
+    :return: ``(meshes, missing)``; links referencing a mesh file that is not
+        available are listed in ``missing`` instead
+    """
+    from .archive import find_member
+    from .mesh_loader import mirror_reference
+
+    meshes, missing = {}, []
+    for link in model.links.values():
+        items = [
+            (T, model.resolve_filename(filename), scale)
+            for _, T, filename, scale in link.meshes(tag=(geometry,))
+        ]
+        if any(not os.path.exists(path) and find_member(path) is None and mirror_reference(path) is None
+               for _, path, _ in items):
+            missing.append(link.name)
+        elif items:
+            meshes[link.name] = items
+    return meshes, missing
+
+
+def verify_urdf(model, density=None, geometry="visual", workers=None, com_tolerance=DEFAULT_COM_TOLERANCE,
+                inertia_tolerance=DEFAULT_INERTIA_TOLERANCE, min_mass=DEFAULT_MIN_MASS):
+    """Compare URDF inertials with properties integrated from the link meshes.
+
+    The mesh density is ``density`` if given, otherwise implied by the URDF
+    link mass (links without mass then only get their volume reported).
+    Links whose mesh files are missing are skipped.
+
+    :param model: Path to a URDF file or :class:`openrd.robot.RobotModel`
+    :param density: Uniform density in kg/m^3, optional
+    :param geometry: Which meshes to integrate, 'visual' or 'collision'
+    :param workers: Worker processes for mesh integration (default: CPU count)
+    :param com_tolerance: COM distance (m) above which a link is flagged
+    :param inertia_tolerance: Relative tensor error above which a link is flagged
+    :param min_mass: URDF mass (kg) below which links are only flagged for a
+        non-physical tensor
+    :return: List of SimpleNamespace per link with meshes: 'link', 'mass'
+        (URDF), 'volume', 'density', 'mesh_mass', 'com', 'mesh_com',
+        'com_error', 'inertia', 'mesh_inertia', 'inertia_error', 'watertight',
+        'physical' (URDF tensor is positive definite and satisfies the triangle
+        inequality) and 'flagged'
+    """
+    return _verify(_load(model), density, geometry, workers, com_tolerance, inertia_tolerance, min_mass)[0]
+
+
+def _verify(model, density, geometry, workers, com_tolerance=DEFAULT_COM_TOLERANCE,
+            inertia_tolerance=DEFAULT_INERTIA_TOLERANCE, min_mass=DEFAULT_MIN_MASS):
+    """:func:`verify_urdf` also returning the per-mesh properties and the links with missing meshes."""
+    if geometry not in ("visual", "collision"):
+        raise ValueError(f"Unsupported geometry: {geometry}. Use 'visual' or 'collision'.")
+    link_meshes, missing = _link_meshes(model, geometry)
+    properties = mesh_properties([path for items in link_meshes.values() for _, path, _ in items], workers)
+
+    reports = []
+    for name, items in link_meshes.items():
+        link = model.links[name]
+        placed = [_transform_properties(properties[path], T, scale) for T, path, scale in items]
+        volume, com, unit_inertia = combine_inertias(*zip(*placed))
+        if density is not None:
+            link_density = float(density)
+        else:
+            link_density = link.mass / volume if volume > 0 and link.mass > 0 else None
+        watertight = all(properties[path]["watertight"] for _, path, _ in items)
+        report = SimpleNamespace(
+            link=name,
+            mass=link.mass,
+            volume=volume,
+            density=link_density,
+            mesh_mass=None,
+            com=link.com,
+            mesh_com=com,
+            com_error=float(np.linalg.norm(com - link.com)),
+            inertia=link.inertia,
+            mesh_inertia=None,
+            inertia_error=None,
+            watertight=watertight,
+            physical=link.mass <= 0 or _is_physical(link.inertia),
+            flagged=False,
+        )
+        if link_density is not None:
+            report.mesh_mass = link_density * volume
+            report.mesh_inertia = link_density * unit_inertia
+            scale = np.linalg.norm(report.mesh_inertia)
+            if scale > 0:
+                report.inertia_error = float(np.linalg.norm(report.mesh_inertia - link.inertia) / scale)
+        mismatch = link.mass >= min_mass and watertight and (
+            report.com_error > com_tolerance
+            or (report.inertia_error is not None and report.inertia_error > inertia_tolerance)
+        )
+        report.flagged = bool(not report.physical or mismatch)
+        reports.append(report)
+    return reports, properties, missing
+
+
+def correct_urdf(path, density=None, links=None, geometry="visual", workers=None, **tolerances):
+    """Write a URDF variant whose inertials are replaced by mesh-derived ones.
+
+    :param path: Path to a URDF file
+    :param density: Uniform density in kg/m^3, optional. Without it every
+        corrected link keeps its URDF mass
+    :param links: Names of the links to correct (default: flagged links, see
+        :func:`verify_urdf`)
+    :param geometry: Which meshes to integrate, 'visual' or 'collision'
+    :param workers: Worker processes for mesh integration (default: CPU count)
+    :param tolerances: ``com_tolerance`` / ``inertia_tolerance`` / ``min_mass`` for flagging
+    :return: Absolute path to the corrected URDF in the openrd cache (``path``
+        itself if no link needs a correction)
+    """
+    from ._xml import absolutize_urdf_paths, set_inertial
+
+    model = load_urdf(path)
+    reports, properties, _ = _verify(model, density, geometry, workers, **tolerances)
+    reports = {r.link: r for r in reports}
+    if links is None:
+        selected = [r for r in reports.values() if r.flagged]
+    else:
+        unknown = [name for name in links if name not in reports]
+        if unknown:
+            raise ValueError(f"Links without {geometry} meshes or not in the model: {unknown}")
+        selected = [reports[name] for name in links]
+    # Without a density, massless links have no implied density to correct with
+    selected = [r for r in selected if r.mesh_inertia is not None]
+    if not selected:
+        return path
+
+    mesh_keys = sorted(props["key"] for props in properties.values())
+    key = _cache.hash_key(_INERTIA_VERSION, _cache.hash_file(path), os.path.abspath(path),
+                          density, geometry, sorted(r.link for r in selected), mesh_keys, tolerances)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    out_path = os.path.join(_cache.cache_dir("inertia"), f"{stem}-{key}{ext}")
+    hit = os.path.exists(out_path)
+    _stats.cache_event("inertia", hit)
+    if hit:
+        return out_path
+
+    root = model.tree.getroot()
+    for report in selected:
+        set_inertial(model.links[report.link].element, report.mesh_mass, report.mesh_com, report.mesh_inertia)
+    absolutize_urdf_paths(root, model.base_dir)
+    return _cache.atomic_write(out_path, tostring(root))
+
+
+def verify_model(name, version=None, variant=None, **options):
+    """Verify the inertials of a bundled URDF model, see :func:`verify_urdf`.
+
+    :param name: Robot name, e.g. 'unitree_g1'
+    :param version: Robot version, optional
+    :param variant: Variant name, optional
+    """
+    from . import get_model_path
+
+    return verify_urdf(get_model_path(name, version=version, variant=variant), **options)
+
+
+def correct_model(name, version=None, variant=None, **options):
+    """Correct the inertials of a bundled URDF model, see :func:`correct_urdf`.
+
+    :param name: Robot name, e.g. 'unitree_g1'
+    :param version: Robot version, optional
+    :param variant: Variant name, optional
+    :return: Absolute path to the corrected URDF
+    """
+    from . import get_model_path
+
+    return correct_urdf(get_model_path(name, version=version, variant=variant), **options)
+
+
+def _library_meshes(robots):
+    names = robots or sorted(d for d in os.listdir(MESHES_DIR) if os.path.isdir(os.path.join(MESHES_DIR, d)))
+    paths = []
+    for name in names:
+        for directory, _, files in os.walk(os.path.join(MESHES_DIR, name)):
+            paths.extend(os.path.join(directory, f) for f in sorted(files) if f.lower().endswith(_MESH_EXTENSIONS))
+    return paths
+
+
+def main(argv=None):
+    from . import iter_models
+
+    parser = argparse.ArgumentParser(description="Mesh-derived mass properties and URDF inertial verification")
+    parser.add_argument("command", choices=["meshes", "check"])
+    parser.add_argument("--robots", nargs="+", default=None, help="Robot names (default: all)")
+    parser.add_argument("--density", type=float, default=None,
+                        help="Uniform density in kg/m^3 (default: implied by the URDF link mass)")
+    parser.add_argument("--geometry", choices=["visual", "collision"], default="visual",
+                        help="Meshes to integrate (check only)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--write", action="store_true", help="Write corrected URDF variants (check only)")
+    args = parser.parse_args(argv)
+
+    if args.command == "meshes":
+        paths = _library_meshes(args.robots)
+        start = time.perf_counter()
+        properties = mesh_properties(paths, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        open_meshes = [p for p, props in properties.items() if not props["watertight"]]
+        for path in open_meshes:
+            print(f"  ⚠ {os.path.relpath(path, MESHES_DIR)} is not watertight")
+        print(f"✓ {len(paths)} meshes in {elapsed:.2f}s, {len(open_meshes)} not watertight")
+        return
+
+    models = [m for m in iter_models("urdf") if not args.robots or m["name"] in args.robots]
+    for model in models:
+        label = "/".join(v for v in (model["name"], model["version"], model["variant"]) if v)
+        reports, _, missing = _verify(load_urdf(model["path"]), args.density, args.geometry, args.workers)
+        flagged = [r for r in reports if r.flagged]
+        for r in flagged:
+            inertia_error = "-" if r.inertia_error is None else f"{r.inertia_error:.2f}"
+            print(f"  {label}/{r.link}: mass={r.mass:.3f} mesh_mass="
+                  f"{'-' if r.mesh_mass is None else f'{r.mesh_mass:.3f}'} com_error={r.com_error * 1e3:.1f}mm "
+                  f"inertia_error={inertia_error}{'' if r.physical else ' NON-PHYSICAL'}")
+        if missing:
+            print(f"  ⚠ {label}: skipped {len(missing)} links with missing meshes")
+        print(f"✓ {label}: {len(flagged)} of {len(reports)} links flagged")
+        if args.write and flagged:
+            out_path = correct_urdf(model["path"], density=args.density, geometry=args.geometry,
+                                    workers=args.workers)
+            print(f"  → {out_path}")
+
+
+__all__ = [
+    "DEFAULT_COM_TOLERANCE",
+    "DEFAULT_INERTIA_TOLERANCE",
+    "DEFAULT_MIN_MASS",
+    "mesh_properties",
+    "verify_urdf",
+    "correct_urdf",
+    "verify_model",
+    "correct_model",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Vectorized forward kinematics over batches of joint configurations.
+
+:class:`KinematicModel` flattens a :class:`openrd.robot.RobotModel` into
+arrays once, so forward kinematics and Jacobians for thousands of
+configurations cost one NumPy pass per link rather than one Python loop per
+configuration.
+
+Joint positions are ordered like ``KinematicModel.joint_names`` (actuated
+joints in topological order by default). Mimic joints follow their source
+joint; fixed joints are folded into constant transforms. All poses are
+expressed in the root-link frame.
+"""
+
+import numpy as np
+
+from .robot import RobotModel, load_urdf
+from .transforms import axis_angle_to_matrix
+
+_FIXED, _REVOLUTE, _PRISMATIC = 0, 1, 2
+
+
+class KinematicModel:
+    """Array form of a URDF kinematic tree.
+
+    :param model: :class:`openrd.robot.RobotModel` or path to a URDF file
+    :param joint_names: Order of the configuration vector, optional. Joints
+        left out are held at zero.
+    """
+
+    def __init__(self, model, joint_names=None):
+        if not isinstance(model, RobotModel):
+            model = load_urdf(model)
+        self.model = model
+        joints = model.topological_joints()
+        if joint_names is None:
+            joint_names = [j.name for j in joints if j.is_actuated]
+        unknown = [name for name in joint_names if name not in model.joints]
+        if unknown:
+            raise ValueError(f"Unknown joints: {unknown}. Available joints: {list(model.joints)}")
+        self.joint_names = list(joint_names)
+        q_index = {name: i for i, name in enumerate(self.joint_names)}
+
+        self.link_names = [model.root] + [j.child for j in joints]
+        self.link_index = {name: i for i, name in enumerate(self.link_names)}
+        n = len(self.link_names)
+        self.parent = np.full(n, -1, dtype=int)
+        self.origin = np.tile(np.eye(4), (n, 1, 1))
+        self.axis = np.zeros((n, 3))
+        self.kind = np.zeros(n, dtype=int)
+        # Each moving link is driven by q[source] * multiplier + offset
+        self.source = np.full(n, -1, dtype=int)
+        self.multiplier = np.ones(n)
+        self.offset = np.zeros(n)
+        for i, joint in enumerate(joints, start=1):
+            self.parent[i] = self.link_index[joint.parent]
+            self.origin[i] = joint.origin
+            self.axis[i] = joint.axis
+            if joint.type in ("revolute", "continuous"):
+                self.kind[i] = _REVOLUTE
+            elif joint.type == "prismatic":
+                self.kind[i] = _PRISMATIC
+            if self.kind[i] == _FIXED:
+                continue
+            name, multiplier, offset = joint.name, 1.0, 0.0
+            if joint.mimic is not None:
+                name, multiplier, offset = joint.mimic
+            if name in q_index:
+                self.source[i] = q_index[name]
+                self.multiplier[i] = multiplier
+                self.offset[i] = offset
+
+        self.lower = np.array([model.joints[name].lower for name in self.joint_names])
+        self.upper = np.array([model.joints[name].upper for name in self.joint_names])
+        # ancestors[i, k] is True if link k lies on the path root -> link i (inclusive)
+        self.ancestors = np.zeros((n, n), dtype=bool)
+        for i in range(n):
+            k = i
+            while k >= 0:
+                self.ancestors[i, k] = True
+                k = self.parent[k]
+        self._moving = np.flatnonzero(self.source >= 0)
+        # Fast paths: identity origin rotations and axis-aligned joints
+        self._origin_identity = np.all(np.abs(self.origin[:, :3, :3] - np.eye(3)) < 1e-12, axis=(1, 2))
+        self._plane = [None] * n
+        for i in range(n):
+            k = np.flatnonzero(np.abs(self.axis[i]) > 1e-12)
+            if self.kind[i] == _REVOLUTE and len(k) == 1:
+                # Columns (a, b) mixed by a rotation about axis k, and its sign
+                a, b = {0: (1, 2), 1: (2, 0), 2: (0, 1)}[k[0]]
+                self._plane[i] = (a, b, np.sign(self.axis[i, k[0]]))
+
+    @property
+    def nq(self):
+        """Size of the configuration vector."""
+        return len(self.joint_names)
+
+    def clamp(self, q):
+        """Clip ``q`` to the URDF position limits (unlimited joints untouched)."""
+        return np.clip(q, self.lower, self.upper)
+
+    def link_ids(self, names):
+        """Map link names to indices in :attr:`link_names`."""
+        missing = [name for name in names if name not in self.link_index]
+        if missing:
+            raise ValueError(f"Links not found: {missing}. Available links: {self.link_names}")
+        return np.array([self.link_index[name] for name in names], dtype=int)
+
+    def forward(self, q):
+        """Compute root-frame poses of all links.
+
+        :param q: Joint positions, shape (B, nq) or (nq,)
+        :return: Array of shape (B, n_links, 4, 4) (or (n_links, 4, 4) for 1-D input)
+        """
+        q = np.asarray(q, dtype=float)
+        single = q.ndim == 1
+        R, p = self._link_poses(np.atleast_2d(q))
+        n, batch = p.shape[:2]
+        poses = np.zeros((batch, n, 4, 4))
+        poses[..., :3, :3] = R.transpose(1, 0, 2, 3)
+        poses[..., :3, 3] = p.transpose(1, 0, 2)
+        poses[..., 3, 3] = 1.0
+        return poses[0] if single else poses
+
+    def _link_poses(self, q):
+        """Link-major rotations (n_links, B, 3, 3) and positions (n_links, B, 3) for q (B, nq)."""
+        batch = q.shape[0]
+        n = len(self.link_names)
+        # Compose rotations and translations separately (batched 3x3 products
+        # are cheaper than 4x4 ones), link-major so per-link slices are contiguous
+        R = np.empty((n, batch, 3, 3))
+        p = np.empty((n, batch, 3))
+        R[0] = np.eye(3)
+        p[0] = 0.0
+        for i in range(1, n):
+            parent = self.parent[i]
+            R_parent = R[parent]
+            p[i] = p[parent] + R_parent @ self.origin[i, :3, 3]
+            if self._origin_identity[i]:
+                R_joint = R_parent.copy()
+            else:
+                R_joint = R_parent @ self.origin[i, :3, :3]
+            if self.source[i] >= 0:
+                value = q[:, self.source[i]] * self.multiplier[i] + self.offset[i]
+                if self._plane[i] is not None:
+                    a, b, sign = self._plane[i]
+                    c, s = np.cos(value)[:, None], sign * np.sin(value)[:, None]
+                    col_a, col_b = R_joint[:, :, a].copy(), R_joint[:, :, b]
+                    R_joint[:, :, a] = c * col_a + s * col_b
+                    R_joint[:, :, b] = c * col_b - s * col_a
+                elif self.kind[i] == _REVOLUTE:
+                    R_joint = R_joint @ axis_angle_to_matrix(self.axis[i], value)
+                else:
+                    p[i] += value[:, None] * (R_joint @ self.axis[i])
+            R[i] = R_joint
+        return R, p
+
+    def jacobian(self, poses, link_ids, points=None, rotation=False):
+        """Geometric Jacobians of points fixed on the given links.
+
+        :param poses: Output of :meth:`forward`, shape (B, n_links, 4, 4)
+        :param link_ids: Link indices, shape (K,)
+        :param points: World-frame points (B, K, 3), defaults to the link origins
+        :param rotation: If True, also return the angular Jacobian
+        :return: Linear Jacobian (B, K, 3, nq), and angular Jacobian (B, K, 3, nq) if requested
+        """
+        batch = poses.shape[0]
+        link_ids = np.asarray(link_ids, dtype=int)
+        if points is None:
+            points = poses[:, link_ids][..., :3, 3]
+        moving = self._moving
+        # Only joints on the path to each target link move it; work on those
+        # (target, joint) pairs only
+        pair_k, pair_j = np.nonzero(self.ancestors[np.ix_(link_ids, moving)])
+        joint_ids = moving[pair_j]
+        axes = np.einsum("bpkl,pl->bpk", poses[:, joint_ids, :3, :3], self.axis[joint_ids])
+        revolute = (self.kind[joint_ids] == _REVOLUTE)[None, :, None]
+        lever = points[:, pair_k] - poses[:, joint_ids][..., :3, 3]
+        scale = self.multiplier[joint_ids][None, :, None]
+        linear = np.where(revolute, np.cross(axes, lever), axes) * scale
+        columns = self.source[joint_ids]
+        # Mimic joints add to the column of their source joint
+        unique = len(set(zip(pair_k.tolist(), columns.tolist()))) == len(columns)
+        J = np.zeros((batch, len(link_ids), 3, self.nq))
+        if unique:
+            J[:, pair_k, :, columns] = linear.transpose(1, 0, 2)
+        else:
+            np.add.at(J, (slice(None), pair_k, slice(None), columns), linear.transpose(1, 0, 2))
+        if not rotation:
+            return J
+        angular = np.where(revolute, axes, 0.0) * scale
+        Jr = np.zeros_like(J)
+        if unique:
+            Jr[:, pair_k, :, columns] = angular.transpose(1, 0, 2)
+        else:
+            np.add.at(Jr, (slice(None), pair_k, slice(None), columns), angular.transpose(1, 0, 2))
+        return J, Jr
+
+
+__all__ = [
+    "KinematicModel",
+]
@@ -0,0 +1,183 @@
+"""Mesh access helpers that understand mirrored (de-duplicated) meshes.
+
+Meshes missing on disk may also be served from a packed archive (see
+:mod:`openrd.archive`): :func:`load_mesh` parses them straight from the
+mapped archive, :func:`resolve_mesh_path` extracts them into the cache.
+
+Mesh directories may contain a ``mirrors.json`` manifest written by
+:mod:`openrd.mirror`. It records meshes that are reflections of a canonical
+mesh. Such meshes may be missing on disk (pruned distribution); the helpers
+below rebuild them on demand:
+
+- :func:`load_mesh` returns a ``trimesh.Trimesh``, reflecting in memory
+- :func:`resolve_mesh_path` returns a real file path, materializing the
+  mirrored mesh into the openrd cache if necessary
+- :func:`mirror_reference` returns ``(canonical_path, scale)`` for consumers
+  that can use a ``scale="1 -1 1"`` mesh reference directly
+"""
+
+import json
+import os
+
+from . import _cache, _stats
+
+MANIFEST_NAME = "mirrors.json"
+
+# Mesh formats trimesh can write; rebuilt meshes of other formats (COLLADA) are written as STL
+WRITABLE_MESH_TYPES = ("stl", "obj", "ply")
+
+_manifests = {}
+
+
+def read_manifest(mesh_dir):
+    """Return the mirror entries of ``mesh_dir`` (empty dict if none).
+
+    :param mesh_dir: Directory containing the meshes
+    :return: Dict of mirrored file name -> entry with 'source' and 'scale'
+    """
+    mesh_dir = os.path.abspath(mesh_dir)
+    manifest_path = os.path.join(mesh_dir, MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(manifest_path)
+    except OSError:
+        from .archive import read_member
+
+        data = read_member(manifest_path)
+        return json.loads(data).get("mirrors", {}) if data is not None else {}
+    cached = _manifests.get(mesh_dir)
+    if cached is None or cached[0] != mtime:
+        with open(manifest_path) as f:
+            cached = (mtime, json.load(f).get("mirrors", {}))
+        _manifests[mesh_dir] = cached
+    return cached[1]
+
+
+def mirror_reference(path):
+    """Return ``(canonical_path, scale)`` if ``path`` is a mirrored mesh, else None.
+
+    :param path: Absolute path of a mesh file (which may not exist on disk)
+    """
+    entry = read_manifest(os.path.dirname(path)).get(os.path.basename(path))
+    if entry is None:
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(path)), entry["source"]), tuple(entry["scale"])
+
+
+def reflect_mesh(mesh, scale):
+    """Return a reflected copy of ``mesh`` with outward-facing normals.
+
+    :param mesh: ``trimesh.Trimesh``
+    :param scale: Per-axis scale, e.g. ``(1, -1, 1)``
+    """
+    import numpy as np
+    import trimesh
+
+    vertices = mesh.vertices * np.asarray(scale, dtype=float)
+    faces = mesh.faces
+    if np.prod(scale) < 0:
+        # An odd number of reflections turns the surface inside out
+        faces = faces[:, ::-1]
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+def mesh_hash(path):
+    """Content hash of a mesh file.
+
+    Archived meshes use the hash stored in the archive index; pruned mirrored
+    meshes hash their canonical mesh and the reflection.
+
+    :param path: Path of a mesh file (which may not exist on disk)
+    :return: Hex digest
+    """
+    if os.path.exists(path):
+        return _cache.hash_file(path)
+    from .archive import find_member
+
+    found = find_member(path)
+    if found is not None:
+        archive, name = found
+        return archive.members[name][2]
+    reference = mirror_reference(path)
+    if reference is None:
+        raise FileNotFoundError(f"Mesh not found: {path}")
+    source, scale = reference
+    return _cache.hash_key(mesh_hash(source), scale)
+
+
+@_stats.timed("mesh_loader.load_mesh")
+def load_mesh(path):
+    """Load a mesh, rebuilding it from its canonical copy if it is mirrored.
+
+    :param path: Path of a mesh file
+    :return: ``trimesh.Trimesh``
+    """
+    import trimesh
+
+    if os.path.exists(path):
+        _stats.add_bytes(path)
+        return trimesh.load(path, force="mesh")
+    from .archive import find_member
+
+    found = find_member(path)
+    if found is not None:
+        import io
+
+        archive, name = found
+        _stats.add_bytes(name, archive.members[name][1])
+        file_type = os.path.splitext(name)[1][1:].lower()
+        return trimesh.load(io.BytesIO(archive.view(name)), file_type=file_type, force="mesh")
+    reference = mirror_reference(path)
+    if reference is None:
+        raise FileNotFoundError(f"Mesh not found: {path}")
+    source, scale = reference
+    return reflect_mesh(load_mesh(source), scale)
+
+
+@_stats.timed("mesh_loader.resolve_mesh_path")
+def resolve_mesh_path(path):
+    """Return a path on disk holding the mesh at ``path``.
+
+    Existing files are returned unchanged. Meshes packed in an archive are
+    extracted into ``<cache>/archive``; pruned mirrored meshes are rebuilt
+    once into ``<cache>/mirrored`` and served from there, in the format of
+    their extension (STL for formats trimesh cannot write).
+
+    :param path: Path of a mesh file
+    :return: Absolute path of a readable mesh file
+    """
+    if os.path.exists(path):
+        return path
+    from .archive import extract_path
+
+    extracted = extract_path(path)
+    if extracted is not None:
+        return extracted
+    reference = mirror_reference(path)
+    if reference is None:
+        raise FileNotFoundError(f"Mesh not found: {path}")
+    source, scale = reference
+    source = resolve_mesh_path(source)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    file_type = ext[1:].lower() if ext[1:].lower() in WRITABLE_MESH_TYPES else "stl"
+    key = _cache.hash_key(_cache.hash_file(source), scale, file_type)
+    out_path = os.path.join(_cache.cache_dir("mirrored"), f"{stem}-{key}.{file_type}")
+    hit = os.path.exists(out_path)
+    _stats.cache_event("mirrored", hit)
+    if not hit:
+        import trimesh
+
+        mesh = reflect_mesh(trimesh.load(source, force="mesh"), scale)
+        _cache.atomic_write(out_path, mesh.export(file_type=file_type))
+    return out_path
+
+
+__all__ = [
+    "MANIFEST_NAME",
+    "WRITABLE_MESH_TYPES",
+    "read_manifest",
+    "mirror_reference",
+    "reflect_mesh",
+    "mesh_hash",
+    "load_mesh",
+    "resolve_mesh_path",
+]
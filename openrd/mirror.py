@@ -0,0 +1,319 @@
+"""Detect and de-duplicate left/right mirror-image meshes.
+
+Humanoid mesh sets ship both sides of every limb (``hip_yaw_link_l.STL`` /
+``hip_yaw_link_r.STL``, ``left_*`` / ``right_*``, ``L_*`` / ``R_*``). When the
+right mesh is a reflection of the left one (up to a tolerance), only the left
+mesh needs to be shipped: the right one is recorded in the directory's
+``mirrors.json`` manifest as ``{"source": <left file>, "scale": [1, -1, 1]}``.
+
+Consumers either rebuild the mesh on demand (:mod:`openrd.mesh_loader`) or
+reference the canonical mesh with a negative scale (URDF
+``<mesh scale="1 -1 1">`` / MJCF ``<mesh scale="1 -1 1">``), see
+:func:`mirror_model_references` and ``get_model_path(..., mirror_meshes=True)``.
+
+Usage:
+    python -m openrd.mirror detect [--robots bruce unitree_g1] [--tolerance 1e-4] [--write]
+    python -m openrd.mirror prune [--robots ...]      # delete mirrored files
+    python -m openrd.mirror restore [--robots ...]    # rebuild deleted files
+"""
+
+import argparse
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from . import _cache, _stats
+from .mesh_loader import MANIFEST_NAME, WRITABLE_MESH_TYPES, read_manifest, reflect_mesh
+from .robot import tostring
+
+MESHES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "meshes")
+
+# Default matching tolerance in meters (0.1 mm)
+DEFAULT_TOLERANCE = 1e-4
+
+# Only formats restore() can write back under the same name
+_MESH_EXTENSIONS = tuple(f".{file_type}" for file_type in WRITABLE_MESH_TYPES)
+_SIDE_TOKENS = {"left": "right", "Left": "Right", "LEFT": "RIGHT", "l": "r", "L": "R"}
+
+# Reflections tried in order; robots are usually mirrored about the sagittal (y) plane
+_REFLECTIONS = ((1.0, -1.0, 1.0), (-1.0, 1.0, 1.0), (1.0, 1.0, -1.0))
+
+
+def partner_name(file_name):
+    """Return the right-side counterpart of a left-side mesh file name, or None.
+
+    Side tokens are matched between ``_``, ``-`` and ``.`` separators, so
+    ``hip_yaw_link_l.STL``, ``left_knee_link.STL`` and ``L_hand_base_link.STL``
+    all map to their right-side names.
+    """
+    parts = re.split(r"([_.\-])", file_name)
+    swapped = False
+    for i, part in enumerate(parts):
+        if part in _SIDE_TOKENS:
+            parts[i] = _SIDE_TOKENS[part]
+            swapped = True
+    return "".join(parts) if swapped else None
+
+
+def find_candidate_pairs(mesh_dir):
+    """Return ``[(left_name, right_name), ...]`` for name-matched mesh pairs in ``mesh_dir``."""
+    files = sorted(f for f in os.listdir(mesh_dir) if f.lower().endswith(_MESH_EXTENSIONS))
+    available = set(files)
+    pairs = []
+    for name in files:
+        partner = partner_name(name)
+        if partner and partner != name and partner in available:
+            pairs.append((name, partner))
+    return pairs
+
+
+def _voxel_keys(points, cell):
+    cells = np.floor(points / cell).astype(np.int64)
+    # Pack three 21-bit signed cell indices into one int64
+    cells += 1 << 20
+    return (cells[:, 0] << 42) | (cells[:, 1] << 21) | cells[:, 2]
+
+
+_NEIGHBOR_OFFSETS = np.array(
+    [(dx << 42) + (dy << 21) + dz for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)],
+    dtype=np.int64,
+)
+
+
+def _covered(points, reference, tol):
+    """True if every point lies in a voxel neighboring a reference vertex."""
+    ref_keys = np.unique(_voxel_keys(reference, tol))
+    dilated = np.unique((ref_keys[:, None] + _NEIGHBOR_OFFSETS[None, :]).ravel())
+    return bool(np.isin(_voxel_keys(points, tol), dilated).all())
+
+
+def _max_nearest_distance(a, b, chunk=2048):
+    b_sq = (b * b).sum(axis=1)
+    worst = 0.0
+    for start in range(0, len(a), chunk):
+        x = a[start:start + chunk]
+        d2 = (x * x).sum(axis=1)[:, None] + b_sq[None, :] - 2.0 * x @ b.T
+        worst = max(worst, float(np.sqrt(max(d2.min(axis=1).max(), 0.0))))
+    return worst
+
+
+def match_reflection(mesh_a, mesh_b, tolerance=DEFAULT_TOLERANCE):
+    """Find a plane reflection mapping ``mesh_a`` onto ``mesh_b``.
+
+    Both vertex sets must cover each other within ``tolerance`` after the
+    reflection (a voxel-hash test, followed by an exact nearest-vertex
+    distance for accepted matches).
+
+    :param mesh_a: Canonical ``trimesh.Trimesh``
+    :param mesh_b: Candidate mirrored ``trimesh.Trimesh``
+    :param tolerance: Maximum vertex distance in model units
+    :return: ``(scale, max_error)`` or None
+    """
+    a, b = np.asarray(mesh_a.vertices), np.asarray(mesh_b.vertices)
+    if len(a) == 0 or len(b) == 0:
+        return None
+    extents_a, extents_b = np.ptp(a, axis=0), np.ptp(b, axis=0)
+    if np.abs(extents_a - extents_b).max() > 2 * tolerance:
+        return None
+    for scale in _REFLECTIONS:
+        reflected = a * np.asarray(scale)
+        if np.abs(reflected.min(axis=0) - b.min(axis=0)).max() > 2 * tolerance:
+            continue
+        if np.abs(reflected.max(axis=0) - b.max(axis=0)).max() > 2 * tolerance:
+            continue
+        if not (_covered(reflected, b, tolerance) and _covered(b, reflected, tolerance)):
+            continue
+        error = max(_max_nearest_distance(reflected, b), _max_nearest_distance(b, reflected))
+        if error <= tolerance:
+            return scale, error
+    return None
+
+
+def detect_mirrors(mesh_dir, tolerance=DEFAULT_TOLERANCE):
+    """Detect mirrored mesh pairs in ``mesh_dir``.
+
+    Pairs already recorded in the manifest whose mirrored file has been
+    pruned are kept as they are.
+
+    :param mesh_dir: Directory of one robot's meshes
+    :param tolerance: Maximum vertex distance in model units
+    :return: Dict of mirrored file name -> manifest entry
+    """
+    import trimesh
+
+    mirrors = {
+        name: entry
+        for name, entry in read_manifest(mesh_dir).items()
+        if not os.path.exists(os.path.join(mesh_dir, name))
+    }
+    for left, right in find_candidate_pairs(mesh_dir):
+        mesh_a = trimesh.load(os.path.join(mesh_dir, left), force="mesh")
+        mesh_b = trimesh.load(os.path.join(mesh_dir, right), force="mesh")
+        match = match_reflection(mesh_a, mesh_b, tolerance)
+        if match is None:
+            continue
+        scale, error = match
+        mirrors[right] = {
+            "source": left,
+            "scale": list(scale),
+            "max_error": float(f"{error:.3g}"),
+            "bytes": os.path.getsize(os.path.join(mesh_dir, right)),
+        }
+    return mirrors
+
+
+def write_manifest(mesh_dir, mirrors, tolerance=DEFAULT_TOLERANCE):
+    """Write (or remove, if empty) the ``mirrors.json`` manifest of ``mesh_dir``."""
+    path = os.path.join(mesh_dir, MANIFEST_NAME)
+    if not mirrors:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    manifest = {"version": 1, "tolerance": tolerance, "mirrors": dict(sorted(mirrors.items()))}
+    return _cache.atomic_write(path, json.dumps(manifest, indent=2) + "\n")
+
+
+def prune(mesh_dir):
+    """Delete mirrored meshes listed in the manifest; return bytes freed."""
+    freed = 0
+    for name in read_manifest(mesh_dir):
+        path = os.path.join(mesh_dir, name)
+        if os.path.exists(path):
+            freed += os.path.getsize(path)
+            os.remove(path)
+    return freed
+
+
+def restore(mesh_dir):
+    """Rebuild pruned mirrored meshes in place; return the restored file names."""
+    import trimesh
+
+    restored = []
+    for name, entry in read_manifest(mesh_dir).items():
+        path = os.path.join(mesh_dir, name)
+        if os.path.exists(path):
+            continue
+        mesh = reflect_mesh(trimesh.load(os.path.join(mesh_dir, entry["source"]), force="mesh"), entry["scale"])
+        _cache.atomic_write(path, mesh.export(file_type=os.path.splitext(name)[1][1:].lower()))
+        restored.append(name)
+    return restored
+
+
+def _mirror_scale(path, scale_text):
+    from .mesh_loader import mirror_reference
+
+    reference = mirror_reference(path)
+    if reference is None:
+        return None
+    source, mirror = reference
+    scale = np.array([float(v) for v in scale_text.split()]) if scale_text else np.ones(3)
+    return source, " ".join(f"{v:g}" for v in scale * np.asarray(mirror))
+
+
+def mirror_model_references(path, model_format="urdf"):
+    """Return a cached copy of a model that references canonical meshes with negative scale.
+
+    :param path: Path to a URDF or MJCF file
+    :param model_format: 'urdf' or 'mjcf'
+    :return: Absolute path of the rewritten model (``path`` itself if nothing is mirrored)
+    """
+    from ._xml import absolutize_mjcf_paths, absolutize_urdf_paths
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    root = ET.parse(path, parser=ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))).getroot()
+    changed = False
+    if model_format == "urdf":
+        absolutize_urdf_paths(root, base_dir)
+        for mesh in root.iter("mesh"):
+            rewrite = _mirror_scale(mesh.get("filename", ""), mesh.get("scale"))
+            if rewrite:
+                mesh.set("filename", rewrite[0])
+                mesh.set("scale", rewrite[1])
+                changed = True
+    elif model_format == "mjcf":
+        absolutize_mjcf_paths(root, base_dir)
+        compiler = root.find("compiler")
+        mesh_dir = compiler.get("meshdir") or compiler.get("assetdir") or base_dir
+        for mesh in root.iter("mesh"):
+            file_name = mesh.get("file")
+            if not file_name:
+                continue
+            rewrite = _mirror_scale(os.path.join(mesh_dir, file_name), mesh.get("scale"))
+            if rewrite:
+                # The implicit asset name is the file stem; pin it before swapping files
+                mesh.set("name", mesh.get("name") or os.path.splitext(os.path.basename(file_name))[0])
+                mesh.set("file", rewrite[0])
+                mesh.set("scale", rewrite[1])
+                changed = True
+    else:
+        raise ValueError(f"Unsupported model format: {model_format}. Use 'urdf' or 'mjcf'.")
+    if not changed:
+        return path
+    text = tostring(root)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    out_path = os.path.join(_cache.cache_dir("mirrored"), f"{stem}-{_cache.hash_key(text)}{ext}")
+    hit = os.path.exists(out_path)
+    _stats.cache_event("mirrored", hit)
+    if not hit:
+        _cache.atomic_write(out_path, text)
+    return out_path
+
+
+def _robot_dirs(robots):
+    names = robots or sorted(
+        d for d in os.listdir(MESHES_DIR) if os.path.isdir(os.path.join(MESHES_DIR, d))
+    )
+    return [(name, os.path.join(MESHES_DIR, name)) for name in names]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detect and de-duplicate mirror-image meshes")
+    parser.add_argument("command", choices=["detect", "prune", "restore"])
+    parser.add_argument("--robots", nargs="+", default=None, help="Robot mesh directories (default: all)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Match tolerance in meters")
+    parser.add_argument("--write", action="store_true", help="Write mirrors.json manifests (detect only)")
+    args = parser.parse_args(argv)
+
+    total_bytes = total_pairs = 0
+    for name, mesh_dir in _robot_dirs(args.robots):
+        if args.command == "detect":
+            mirrors = detect_mirrors(mesh_dir, args.tolerance)
+            for right, entry in sorted(mirrors.items()):
+                print(f"  {name}/{right} = reflect({entry['source']}, {entry['scale']}) "
+                      f"max_error={entry['max_error']:g}")
+            saved = sum(entry["bytes"] for entry in mirrors.values())
+            total_bytes += saved
+            total_pairs += len(mirrors)
+            print(f"✓ {name}: {len(mirrors)} mirrored meshes, {saved / 1e6:.2f} MB de-duplicable")
+            if args.write:
+                write_manifest(mesh_dir, mirrors, args.tolerance)
+        elif args.command == "prune":
+            freed = prune(mesh_dir)
+            total_bytes += freed
+            print(f"✓ {name}: freed {freed / 1e6:.2f} MB")
+        else:
+            restored = restore(mesh_dir)
+            print(f"✓ {name}: restored {len(restored)} meshes")
+    if args.command == "detect":
+        print(f"\nTotal: {total_pairs} mirrored meshes, {total_bytes / 1e6:.2f} MB")
+
+
+__all__ = [
+    "DEFAULT_TOLERANCE",
+    "partner_name",
+    "find_candidate_pairs",
+    "match_reflection",
+    "detect_mirrors",
+    "write_manifest",
+    "prune",
+    "restore",
+    "mirror_model_references",
+]
+
+
+if __name__ == "__main__":
+    main()
+
@@ -1,11 +1,6 @@
-# This line makes the sub-folders available as attributes of this module
-from . import bruce
-from . import fourier_gr3
-from . import rewr1_1
-from . import smpl
-from . import tienkung_1
-from . import unitree_g1
-from . import unitree_h1
+# The sub-folders are available as attributes of this module; each one is
+# imported on first access
+import importlib
 
 __all__ = [
     "bruce",
@@ -16,3 +11,13 @@ __all__ = [
     "unitree_g1",
     "unitree_h1",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return list(__all__)
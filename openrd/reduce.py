@@ -0,0 +1,553 @@
+"""Model reduction: fixed-joint lumping, sub-tree extraction and joint locking.
+
+Every body in a simulated model costs time on each step, and the bundled
+descriptions carry many auxiliary frames (``imu_link``, ``logo_link``,
+``pelvis_contour_link``, ...) that are attached by fixed joints. The reducer
+produces leaner URDF/MJCF variants:
+
+- ``lump_fixed``: merge links attached by fixed joints into their parent,
+  combining mass, center of mass and inertia with the parallel-axis theorem
+  and moving their visual/collision geometry along.
+- ``root`` / ``tips``: keep only the sub-tree below ``root`` (optionally
+  restricted to the branches leading to ``tips``), e.g. an arm or the legs.
+- ``lock``: freeze joints at given positions (turns them into fixed joints,
+  which ``lump_fixed`` then merges away).
+- ``fixed_base``: drop the floating base joint.
+
+Reduced variants are cached on disk and are also reachable through
+``get_model_path(..., reduction={...})``.
+
+Usage::
+
+    from openrd.reduce import reduce_model
+
+    path = reduce_model("unitree_g1")  # lump fixed links only
+    legs = reduce_model("unitree_h1", root="pelvis",
+                        tips=["left_ankle_link", "right_ankle_link"])
+    arm = reduce_model("unitree_g1", model_format="mjcf", root="torso_link",
+                       tips=["left_elbow_roll_link"], lock={"left_elbow_pitch_joint": 0.5})
+"""
+
+import copy
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from . import _cache, _stats
+from ._xml import (
+    MJCFDefaults,
+    MJCFFrames,
+    absolutize_mjcf_paths,
+    absolutize_urdf_paths,
+    set_inertial,
+    set_mjcf_inertial,
+    set_origin,
+)
+from .robot import Link, RobotModel, load_urdf, parse_origin, tostring
+from .transforms import axis_angle_to_matrix, combine_inertias, make_transform
+
+# Bump when the reducer output changes so stale cache entries are ignored
+_REDUCER_VERSION = 2
+
+_OPTION_NAMES = ("lump_fixed", "root", "tips", "lock", "keep", "fixed_base")
+
+
+def _normalize_options(lump_fixed=True, root=None, tips=None, lock=None, keep=None, fixed_base=False):
+    return {
+        "lump_fixed": bool(lump_fixed),
+        "root": root,
+        "tips": sorted(tips) if tips else None,
+        "lock": {k: float(v) for k, v in sorted((lock or {}).items())},
+        "keep": sorted(keep) if keep else [],
+        "fixed_base": bool(fixed_base),
+    }
+
+
+# ---------------------------------------------------------------------------
+# URDF
+# ---------------------------------------------------------------------------
+
+def _drop_references(robot_el, removed_links, removed_joints):
+    for transmission in robot_el.findall("transmission"):
+        joint_names = {j.get("name") for j in transmission.findall("joint")}
+        if joint_names & removed_joints:
+            robot_el.remove(transmission)
+    for gazebo in robot_el.findall("gazebo"):
+        if gazebo.get("reference") in removed_links | removed_joints:
+            robot_el.remove(gazebo)
+
+
+def reduce_urdf(model, lump_fixed=True, root=None, tips=None, lock=None, keep=None, fixed_base=False):
+    """Reduce a URDF model and return the reduced URDF text.
+
+    :param model: :class:`openrd.robot.RobotModel` or path to a URDF file
+    :param lump_fixed: Merge links attached by fixed joints into their parent
+    :param root: Link to use as the new root, optional
+    :param tips: Links whose branches (from ``root``) are kept, optional
+    :param lock: Dict of joint name -> position; these joints become fixed
+    :param keep: Link names that must survive lumping (e.g. sensor frames)
+    :param fixed_base: Remove ``floating`` joints (and an empty ``world`` link)
+    :return: Reduced URDF as a string, with mesh paths made absolute
+    """
+    if not isinstance(model, RobotModel):
+        model = load_urdf(model)
+    # Work on a private copy so the caller's model stays untouched
+    robot_el = copy.deepcopy(model.tree.getroot())
+    links = {el.get("name"): el for el in robot_el.findall("link")}
+    joints = {el.get("name"): el for el in robot_el.findall("joint")}
+    keep = set(keep or ())
+    removed_links, removed_joints = set(), set()
+
+    def parent_of(joint_el):
+        return joint_el.find("parent").get("link")
+
+    def child_of(joint_el):
+        return joint_el.find("child").get("link")
+
+    def remove_link(name):
+        robot_el.remove(links.pop(name))
+        removed_links.add(name)
+
+    def remove_joint(name):
+        robot_el.remove(joints.pop(name))
+        removed_joints.add(name)
+
+    if fixed_base:
+        for name, joint_el in list(joints.items()):
+            if joint_el.get("type") == "floating":
+                parent = parent_of(joint_el)
+                remove_joint(name)
+                link_el = links.get(parent)
+                if link_el is not None and len(link_el) == 0 and not any(
+                    parent_of(j) == parent for j in joints.values()
+                ):
+                    remove_link(parent)
+
+    # Lock joints (and the joints that mimic them) at the requested values
+    lock = dict(lock or {})
+    for name in lock:
+        if name not in joints:
+            raise ValueError(f"Cannot lock unknown joint '{name}'. Available joints: {sorted(joints)}")
+    for name, joint_el in joints.items():
+        mimic = joint_el.find("mimic")
+        if mimic is not None and mimic.get("joint") in lock and name not in lock:
+            lock[name] = lock[mimic.get("joint")] * float(mimic.get("multiplier", 1.0)) + float(
+                mimic.get("offset", 0.0)
+            )
+    for name, value in lock.items():
+        joint = model.joints[name]
+        joint_el = joints[name]
+        set_origin(joint_el, joint.origin @ joint.motion(value))
+        joint_el.set("type", "fixed")
+        for tag in ("axis", "limit", "dynamics", "mimic", "safety_controller", "calibration"):
+            for child in joint_el.findall(tag):
+                joint_el.remove(child)
+
+    # Sub-tree extraction
+    if root is not None or tips:
+        root = root or model.root
+        if root not in links:
+            raise ValueError(f"Root link not found: {root}. Available links: {sorted(links)}")
+        if tips:
+            kept = set()
+            for tip in tips:
+                kept.update(j.child for j in model.chain(tip, root))
+                kept.update(model.subtree_links(tip))
+            kept.add(root)
+        else:
+            kept = set(model.subtree_links(root))
+        for name in list(joints):
+            joint_el = joints[name]
+            if child_of(joint_el) not in kept or parent_of(joint_el) not in kept:
+                remove_joint(name)
+        for name in list(links):
+            if name not in kept:
+                remove_link(name)
+
+    # Lump fixed joints, deepest first so inertias accumulate bottom-up
+    if lump_fixed:
+        depth = {}
+
+        def link_depth(name):
+            if name not in depth:
+                parents = [j for j in joints.values() if child_of(j) == name]
+                depth[name] = 0 if not parents else link_depth(parent_of(parents[0])) + 1
+            return depth[name]
+
+        fixed = [
+            name
+            for name, joint_el in joints.items()
+            if joint_el.get("type") == "fixed" and child_of(joint_el) not in keep
+        ]
+        fixed.sort(key=lambda n: -link_depth(child_of(joints[n])))
+        for name in fixed:
+            joint_el = joints[name]
+            child, parent = child_of(joint_el), parent_of(joint_el)
+            T = parse_origin(joint_el)
+            child_el, parent_el = links[child], links[parent]
+            _merge_urdf_link(parent_el, child_el, T)
+            for other in joints.values():
+                if parent_of(other) == child:
+                    other.find("parent").set("link", parent)
+                    set_origin(other, T @ parse_origin(other))
+            remove_joint(name)
+            remove_link(child)
+
+    _drop_references(robot_el, removed_links, removed_joints)
+    absolutize_urdf_paths(robot_el, model.base_dir)
+    robot_el.insert(0, ET.Comment(
+        f" Reduced by openrd.reduce from {os.path.basename(model.path or 'string')}: "
+        f"removed {len(removed_links)} links, {len(removed_joints)} joints "
+    ))
+    return tostring(robot_el)
+
+
+def _merge_urdf_link(parent_el, child_el, T):
+    """Merge ``child_el`` (at pose ``T`` in the parent frame) into ``parent_el``."""
+    parent, child = Link(parent_el), Link(child_el)
+    if child.mass > 0:
+        R = T[:3, :3]
+        child_com = R @ child.com + T[:3, 3]
+        mass, com, inertia = combine_inertias(
+            [parent.mass, child.mass],
+            [parent.com, child_com],
+            [parent.inertia, R @ child.inertia @ R.T],
+        )
+        set_inertial(parent_el, mass, com, inertia)
+    for kind in ("visual", "collision"):
+        for item in child_el.findall(kind):
+            set_origin(item, T @ parse_origin(item))
+            # Keep element order: inertial, visual..., collision...
+            parent_el.append(item)
+
+
+# ---------------------------------------------------------------------------
+# MJCF
+# ---------------------------------------------------------------------------
+
+# Child elements whose local frame moves with a lumped body
+_FRAME_TAGS = ("geom", "site", "camera", "light", "body", "frame")
+
+
+def _has_joint(body_el):
+    return body_el.find("joint") is not None or body_el.find("freejoint") is not None
+
+
+# Attributes in actuator/sensor/equality/contact/tendon sections that name
+# bodies, joints, sites or tendons
+_REFERENCE_ATTRS = {
+    "body": ("body", "body1", "body2", "target"),
+    "joint": ("joint", "joint1", "joint2", "jointinparent"),
+    "site": ("site", "site1", "site2", "cranksite", "slidersite"),
+    "geom": ("geom", "geom1", "geom2"),
+}
+
+
+def _prune_mjcf_references(mujoco_el, removed):
+    """Drop elements that reference removed bodies, joints, sites or geoms."""
+    sections = ("actuator", "sensor", "equality", "contact", "tendon")
+    removed_tendons = set()
+    for section in ("tendon",) + sections:
+        for parent in mujoco_el.findall(section):
+            for el in list(parent):
+                dangling = any(
+                    el.get(attr) in removed[kind]
+                    for kind, attrs in _REFERENCE_ATTRS.items()
+                    for attr in attrs
+                )
+                if el.get("objname") is not None:
+                    objtype = el.get("objtype", "")
+                    kind = "body" if objtype in ("body", "xbody") else objtype
+                    dangling = dangling or el.get("objname") in removed.get(kind, ())
+                if el.get("tendon") in removed_tendons:
+                    dangling = True
+                if section == "tendon":
+                    for ref in list(el):
+                        if ref.tag == "joint" and ref.get("joint") in removed["joint"]:
+                            el.remove(ref)
+                        elif ref.tag == "site" and ref.get("site") in removed["site"]:
+                            dangling = True
+                    if len(el) == 0:
+                        dangling = True
+                if dangling:
+                    parent.remove(el)
+                    if section == "tendon" and el.get("name"):
+                        removed_tendons.add(el.get("name"))
+
+
+def _prune_unused_meshes(mujoco_el):
+    """Drop mesh assets that no geom references any more."""
+    used = {geom.get("mesh") for geom in mujoco_el.iter("geom") if geom.get("mesh")}
+    for asset in mujoco_el.findall("asset"):
+        for mesh in asset.findall("mesh"):
+            name = mesh.get("name") or os.path.splitext(os.path.basename(mesh.get("file", "")))[0]
+            if name not in used:
+                asset.remove(mesh)
+
+
+def _rename_body_references(mujoco_el, old, new):
+    for section in ("contact", "equality", "sensor", "actuator"):
+        for parent in mujoco_el.findall(section):
+            for el in list(parent):
+                for attr in _REFERENCE_ATTRS["body"]:
+                    if el.get(attr) == old:
+                        el.set(attr, new)
+                if el.get("objname") == old and el.get("objtype") in ("body", "xbody"):
+                    el.set("objname", new)
+                if el.tag == "exclude" and el.get("body1") == el.get("body2"):
+                    parent.remove(el)
+    for el in mujoco_el.iter():
+        if el.tag in ("camera", "light") and el.get("target") == old:
+            el.set("target", new)
+
+
+def _collect_names(body_el, removed):
+    for el in body_el.iter():
+        name = el.get("name")
+        if name is None:
+            continue
+        if el.tag == "body":
+            removed["body"].add(name)
+        elif el.tag in ("joint", "freejoint"):
+            removed["joint"].add(name)
+        elif el.tag in ("site", "geom"):
+            removed[el.tag].add(name)
+
+
+def reduce_mjcf(path, lump_fixed=True, root=None, tips=None, lock=None, keep=None, fixed_base=False):
+    """Reduce an MJCF model and return the reduced XML text.
+
+    Options have the same meaning as in :func:`reduce_urdf`; in MJCF a body
+    without joints is the analogue of a link attached by a fixed joint.
+    Bodies are only lumped when their mass can be combined exactly: both
+    bodies carry an explicit ``<inertial>``, or both rely on geom-derived
+    inertia. Keyframes are dropped when the joint set changes.
+
+    :param path: Path to the MJCF file
+    :return: Reduced MJCF as a string, with asset directories made absolute
+    """
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+    mujoco_el = ET.parse(path, parser=parser).getroot()
+    frames = MJCFFrames(mujoco_el)
+    defaults = MJCFDefaults(mujoco_el)
+    worldbody = mujoco_el.find("worldbody")
+    keep = set(keep or ())
+    removed = {"body": set(), "joint": set(), "site": set(), "geom": set()}
+    parent_map = {child: parent for parent in mujoco_el.iter() for child in parent}
+    bodies = {el.get("name"): el for el in worldbody.iter("body") if el.get("name")}
+    joint_changes = False
+
+    if fixed_base:
+        for body_el in worldbody.findall("body"):
+            for el in list(body_el):
+                if el.tag == "freejoint" or (el.tag == "joint" and el.get("type") == "free"):
+                    body_el.remove(el)
+                    if el.get("name"):
+                        removed["joint"].add(el.get("name"))
+                    joint_changes = True
+
+    # Lock joints by folding their motion into the body frame
+    lock = dict(lock or {})
+    joint_owner = {
+        el.get("name"): body_el
+        for body_el in worldbody.iter("body")
+        for el in body_el.findall("joint")
+        if el.get("name")
+    }
+    for name in lock:
+        if name not in joint_owner:
+            raise ValueError(f"Cannot lock unknown joint '{name}'. Available joints: {sorted(joint_owner)}")
+    for name, value in lock.items():
+        body_el = joint_owner[name]
+        body_joints = body_el.findall("joint")
+        if len(body_joints) > 1 and not all(j.get("name") in lock for j in body_joints):
+            raise ValueError(
+                f"Joint '{name}' shares body '{body_el.get('name')}' with other joints; "
+                f"lock all of {[j.get('name') for j in body_joints]} together."
+            )
+    for body_el in {id(b): b for b in (joint_owner[n] for n in lock)}.values():
+        T = frames.transform(body_el)
+        childclass, el = None, body_el
+        while el is not worldbody and childclass is None:
+            childclass, el = el.get("childclass"), parent_map[el]
+        for joint_el in body_el.findall("joint"):
+            attrs = defaults.resolve(joint_el, childclass)
+            jtype = attrs.get("type", "hinge")
+            ref = float(attrs.get("ref", 0.0))
+            if jtype == "hinge" and frames.degrees:
+                ref = np.radians(ref)
+            # The body frame as written corresponds to qpos == ref
+            value = lock[joint_el.get("name")] - ref
+            axis = np.array([float(v) for v in attrs.get("axis", "0 0 1").split()])
+            axis /= np.linalg.norm(axis)
+            p = np.array([float(v) for v in attrs.get("pos", "0 0 0").split()])
+            if jtype == "hinge":
+                R = axis_angle_to_matrix(axis, value)
+                M = make_transform(R, p - R @ p)
+            elif jtype == "slide":
+                M = make_transform(None, axis * value)
+            else:
+                raise ValueError(f"Cannot lock {jtype} joint '{joint_el.get('name')}'.")
+            T = T @ M
+            body_el.remove(joint_el)
+            removed["joint"].add(joint_el.get("name"))
+        frames.set_transform(body_el, T)
+        joint_changes = True
+
+    # Sub-tree extraction
+    if root is not None or tips:
+        if root is None:
+            raise ValueError("MJCF sub-tree extraction requires an explicit root body.")
+        if root not in bodies:
+            raise ValueError(f"Root body not found: {root}. Available bodies: {sorted(bodies)}")
+        root_el = bodies[root]
+        if tips:
+            kept = {id(root_el)}
+            for tip in tips:
+                if tip not in bodies:
+                    raise ValueError(f"Tip body not found: {tip}.")
+                el = bodies[tip]
+                kept.update(id(sub) for sub in el.iter("body"))
+                while el is not root_el:
+                    kept.add(id(el))
+                    el = parent_map.get(el)
+                    if el is None or el is worldbody:
+                        raise ValueError(f"Body '{tip}' is not a descendant of '{root}'.")
+            for body_el in list(root_el.iter("body")):
+                if id(body_el) not in kept and id(parent_map[body_el]) in kept:
+                    parent_map[body_el].remove(body_el)
+                    _collect_names(body_el, removed)
+        # The new root is welded to the world like a URDF root link
+        for el in list(root_el):
+            if el.tag == "joint" or (el.tag == "freejoint" and fixed_base):
+                root_el.remove(el)
+                removed["joint"].add(el.get("name"))
+        parent_map[root_el].remove(root_el)
+        for el in list(worldbody):
+            if el.tag == "body":
+                worldbody.remove(el)
+                _collect_names(el, removed)
+        frames.set_transform(root_el, np.eye(4))
+        worldbody.append(root_el)
+        parent_map[root_el] = worldbody
+        removed["body"].discard(root)
+        joint_changes = True
+
+    # Lump joint-less bodies into their parents, deepest first
+    if lump_fixed:
+        candidates = [
+            el for el in worldbody.iter("body")
+            if not _has_joint(el) and parent_map.get(el) is not worldbody and el.get("name") not in keep
+        ]
+        for body_el in reversed(candidates):
+            parent_el = parent_map.get(body_el)
+            if parent_el is None or body_el not in list(parent_el):
+                continue
+            child_explicit = body_el.find("inertial") is not None
+            parent_explicit = parent_el.find("inertial") is not None
+            child_geoms = body_el.find("geom") is not None
+            parent_geoms = parent_el.find("geom") is not None
+            if child_explicit != parent_explicit and (
+                (child_explicit and parent_geoms) or (parent_explicit and child_geoms)
+            ):
+                # Mixed explicit/geom-derived inertia cannot be merged exactly
+                continue
+            T = frames.transform(body_el)
+            if child_explicit:
+                c_mass, c_com, c_inertia = frames.inertial(body_el)
+                R = T[:3, :3]
+                if parent_explicit:
+                    p_mass, p_com, p_inertia = frames.inertial(parent_el)
+                else:
+                    p_mass, p_com, p_inertia = 0.0, np.zeros(3), np.zeros((3, 3))
+                mass, com, inertia = combine_inertias(
+                    [p_mass, c_mass],
+                    [p_com, R @ c_com + T[:3, 3]],
+                    [p_inertia, R @ c_inertia @ R.T],
+                )
+                set_mjcf_inertial(parent_el, mass, com, inertia)
+            index = list(parent_el).index(body_el)
+            moved = []
+            for el in list(body_el):
+                if el.tag == "inertial":
+                    continue
+                body_el.remove(el)
+                if el.tag in _FRAME_TAGS:
+                    frames.apply(el, T)
+                if el.tag == "body":
+                    parent_map[el] = parent_el
+                moved.append(el)
+            parent_el.remove(body_el)
+            for offset, el in enumerate(moved):
+                parent_el.insert(index + offset, el)
+            name = body_el.get("name")
+            if name:
+                _rename_body_references(mujoco_el, name, parent_el.get("name"))
+
+    _prune_mjcf_references(mujoco_el, removed)
+    _prune_unused_meshes(mujoco_el)
+    if joint_changes:
+        for keyframe in mujoco_el.findall("keyframe"):
+            mujoco_el.remove(keyframe)
+    absolutize_mjcf_paths(mujoco_el, os.path.dirname(os.path.abspath(path)))
+    mujoco_el.insert(0, ET.Comment(f" Reduced by openrd.reduce from {os.path.basename(path)} "))
+    return tostring(mujoco_el)
+
+
+# ---------------------------------------------------------------------------
+# Cached entry point
+# ---------------------------------------------------------------------------
+
+@_stats.timed("reduce.reduce_file")
+def reduce_file(path, model_format="urdf", **options):
+    """Reduce the model file at ``path`` and return the cached output path.
+
+    :param path: Path to a URDF or MJCF file
+    :param model_format: 'urdf' or 'mjcf'
+    :param options: Reduction options, see :func:`reduce_urdf`
+    :return: Absolute path to the reduced model in the openrd cache
+    """
+    unknown = set(options) - set(_OPTION_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown reduction options: {sorted(unknown)}. Use {list(_OPTION_NAMES)}.")
+    if model_format not in ("urdf", "mjcf"):
+        raise ValueError(f"Unsupported model format: {model_format}. Use 'urdf' or 'mjcf'.")
+    normalized = _normalize_options(**options)
+    key = _cache.hash_key(_REDUCER_VERSION, _cache.hash_file(path), os.path.abspath(path), normalized)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    out_path = os.path.join(_cache.cache_dir("reduced"), f"{stem}-{key}{ext}")
+    hit = os.path.exists(out_path)
+    _stats.cache_event("reduced", hit)
+    if hit:
+        return out_path
+    if model_format == "urdf":
+        text = reduce_urdf(path, **normalized)
+    else:
+        text = reduce_mjcf(path, **normalized)
+    return _cache.atomic_write(out_path, text)
+
+
+def reduce_model(name, version=None, variant=None, model_format="urdf", **options):
+    """Reduce a bundled model and return the path of the cached variant.
+
+    :param name: Robot name, e.g. 'unitree_g1'
+    :param version: Robot version, optional
+    :param variant: Variant name, optional
+    :param model_format: 'urdf' or 'mjcf', default is 'urdf'
+    :param options: Reduction options (``lump_fixed``, ``root``, ``tips``,
+        ``lock``, ``keep``, ``fixed_base``), see :func:`reduce_urdf`
+    :return: Absolute path to the reduced model file
+    """
+    from . import get_model_path
+
+    path = get_model_path(name, version=version, variant=variant, model_format=model_format)
+    return reduce_file(path, model_format=model_format, **options)
+
+
+__all__ = [
+    "reduce_urdf",
+    "reduce_mjcf",
+    "reduce_file",
+    "reduce_model",
+]
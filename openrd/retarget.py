@@ -0,0 +1,443 @@
+"""Streaming retargeting of SMPL / SMPL-H motion onto the bundled robots.
+
+Motion datasets are read chunk by chunk (``.npy`` files are memory-mapped),
+each chunk is retargeted with :class:`openrd.ik.BatchIK` in a process pool,
+and results are written into memory-mapped ``.npy`` files as chunks finish.
+Memory use is bounded by ``chunk_size`` times the number of chunks in flight,
+independent of the dataset length. A ``progress.json`` next to the outputs
+records finished chunks so interrupted jobs resume where they stopped.
+
+Poses are SMPL axis-angle rotations in joint order, shape (T, 24 * 3) for
+SMPL or (T, 52 * 3) for SMPL-H (as in AMASS), with optional root
+translations (T, 3). The skeleton is taken from the bundled
+``smpl_humanoid`` / ``smplh_humanoid`` MJCF models.
+
+Each frame is expressed relative to the pelvis, rotated into the robot
+convention (z up, x forward), scaled by the ratio of robot to SMPL leg
+length and solved for the mapped robot links (:data:`JOINT_MAPS`).
+
+Usage::
+
+    from openrd.retarget import retarget_stream
+
+    result = retarget_stream("walk.npz", "unitree_h1", "out/walk_h1", workers=4)
+    print(result.q.shape, result.joint_names)
+
+    python -m openrd.retarget walk.npz --robot unitree_h1 --output out/walk_h1 --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from types import SimpleNamespace
+
+import numpy as np
+
+from . import _cache
+from .ik import BatchIK
+from .transforms import axis_angle_to_matrix
+
+# SMPL joint order of the pose vector (names of the bundled MJCF bodies)
+SMPL_JOINTS = [
+    "Pelvis", "L_Hip", "R_Hip", "Torso", "L_Knee", "R_Knee", "Spine", "L_Ankle",
+    "R_Ankle", "Chest", "L_Toe", "R_Toe", "Neck", "L_Thorax", "R_Thorax", "Head",
+    "L_Shoulder", "R_Shoulder", "L_Elbow", "R_Elbow", "L_Wrist", "R_Wrist", "L_Hand", "R_Hand",
+]
+_HAND_JOINTS = [f"{finger}{i}" for finger in ("Index", "Middle", "Pinky", "Ring", "Thumb") for i in (1, 2, 3)]
+SMPLH_JOINTS = SMPL_JOINTS[:22] + [f"L_{n}" for n in _HAND_JOINTS] + [f"R_{n}" for n in _HAND_JOINTS]
+
+# Layout name -> (bundled MJCF skeleton, joint order)
+LAYOUTS = {
+    "smpl": ("smpl_humanoid", SMPL_JOINTS),
+    "smplh": ("smplh_humanoid", SMPLH_JOINTS),
+}
+
+# SMPL frames are y-up with x pointing left; robot frames are z-up with x forward
+SMPL_TO_ROBOT = np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+
+# SMPL joint -> robot link whose origin tracks it
+JOINT_MAPS = {
+    "unitree_h1": {
+        "L_Knee": "left_knee_link", "R_Knee": "right_knee_link",
+        "L_Ankle": "left_ankle_link", "R_Ankle": "right_ankle_link",
+        "L_Elbow": "left_elbow_link", "R_Elbow": "right_elbow_link",
+    },
+    "unitree_g1": {
+        "L_Knee": "left_knee_link", "R_Knee": "right_knee_link",
+        "L_Ankle": "left_ankle_roll_link", "R_Ankle": "right_ankle_roll_link",
+        "L_Elbow": "left_elbow_pitch_link", "R_Elbow": "right_elbow_pitch_link",
+        "L_Wrist": "left_palm_link", "R_Wrist": "right_palm_link",
+    },
+    "tienkung_1": {
+        "L_Knee": "knee_pitch_l_link", "R_Knee": "knee_pitch_r_link",
+        "L_Ankle": "ankle_roll_l_link", "R_Ankle": "ankle_roll_r_link",
+        "L_Elbow": "elbow_l_link", "R_Elbow": "elbow_r_link",
+        "L_Wrist": "L_hand_base_link", "R_Wrist": "R_hand_base_link",
+    },
+}
+
+# Intermediate joints guide the posture; end effectors dominate
+_JOINT_WEIGHTS = {"Knee": 0.5, "Elbow": 0.5}
+
+PROGRESS_NAME = "progress.json"
+
+
+def load_skeleton(layout="smpl"):
+    """Read the rest skeleton of an SMPL layout from the bundled MJCF model.
+
+    :param layout: 'smpl' or 'smplh'
+    :return: (parents (J,), offsets (J, 3)) in pose order, offsets in the SMPL frame
+    """
+    from .mjcf import smpl
+
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Available layouts: {list(LAYOUTS)}")
+    model_name, joint_names = LAYOUTS[layout]
+    worldbody = ET.parse(getattr(smpl, model_name).xml).getroot().find("worldbody")
+    bodies = {}
+
+    def visit(element, parent):
+        for body in element.findall("body"):
+            pos = [float(v) for v in body.get("pos", "0 0 0").split()]
+            bodies[body.get("name")] = (parent, pos)
+            visit(body, body.get("name"))
+
+    visit(worldbody, None)
+    index = {name: i for i, name in enumerate(joint_names)}
+    parents = np.array([index.get(bodies[name][0], -1) for name in joint_names], dtype=int)
+    offsets = np.array([bodies[name][1] for name in joint_names])
+    offsets[0] = 0.0
+    return parents, offsets
+
+
+def smpl_forward(poses, trans, parents, offsets, joints=None):
+    """Global joint rotations and positions of SMPL poses.
+
+    :param poses: Axis-angle rotations, shape (T, J, 3)
+    :param trans: Root translations, shape (T, 3), optional
+    :param parents: Parent index per joint, shape (J,)
+    :param offsets: Rest offsets from the parent joint, shape (J, 3)
+    :param joints: Joints to evaluate (their ancestors are added), default all
+    :return: (rotations (T, J, 3, 3), positions (T, J, 3)); joints not
+        evaluated are left as zeros
+    """
+    poses = np.asarray(poses, dtype=float)
+    frames, n = poses.shape[:2]
+    needed = np.zeros(n, dtype=bool)
+    for j in range(n) if joints is None else joints:
+        while j >= 0 and not needed[j]:
+            needed[j] = True
+            j = parents[j]
+    angle = np.linalg.norm(poses, axis=-1)
+    axis = poses / np.where(angle > 1e-12, angle, 1.0)[..., None]
+    R = np.zeros((frames, n, 3, 3))
+    p = np.zeros((frames, n, 3))
+    # Parents precede their children in SMPL order
+    for j in np.flatnonzero(needed):
+        local = axis_angle_to_matrix(axis[:, j], angle[:, j])
+        if parents[j] < 0:
+            R[:, j] = local
+            p[:, j] = 0.0 if trans is None else trans
+        else:
+            R[:, j] = R[:, parents[j]] @ local
+            p[:, j] = p[:, parents[j]] + R[:, parents[j]] @ offsets[j]
+    return R, p
+
+
+def infer_layout(poses):
+    """Guess the SMPL layout from the pose array shape."""
+    size = int(np.prod(poses.shape[1:]))
+    for layout, (_, joint_names) in LAYOUTS.items():
+        if size == 3 * len(joint_names):
+            return layout
+    raise ValueError(f"Cannot infer SMPL layout from {size} pose values per frame; expected 72 (smpl) or 156 (smplh)")
+
+
+class Retargeter:
+    """Retarget SMPL pose chunks onto a robot.
+
+    :param robot: Robot name, e.g. 'unitree_h1'
+    :param layout: 'smpl' or 'smplh'
+    :param joint_map: SMPL joint -> robot link, default ``JOINT_MAPS[robot]``
+    :param version: Model version, optional
+    :param variant: Model variant, optional
+    :param batch_size: Segments solved in parallel by :meth:`BatchIK.solve_sequence`
+    :param max_iters: IK iterations for cold-started frames
+    :param warm_iters: IK iterations for warm-started frames
+    :param restart_tol: Error in meters above which a warm-started frame is
+        re-solved cold. Human and robot proportions differ, so residuals of
+        several centimeters are normal; only clearly lost frames are retried.
+    """
+
+    def __init__(self, robot, layout="smpl", joint_map=None, version=None, variant=None,
+                 batch_size=64, max_iters=100, warm_iters=20, restart_tol=0.2):
+        joint_map = joint_map or JOINT_MAPS.get(robot)
+        if not joint_map:
+            raise ValueError(f"No SMPL joint map for '{robot}'. Robots with a default map: {list(JOINT_MAPS)}")
+        self.layout = layout
+        self.parents, self.offsets = load_skeleton(layout)
+        joint_names = LAYOUTS[layout][1]
+        unknown = [name for name in joint_map if name not in joint_names]
+        if unknown:
+            raise ValueError(f"Unknown {layout} joints: {unknown}")
+        self.smpl_ids = np.array([joint_names.index(name) for name in joint_map], dtype=int)
+        weights = [_JOINT_WEIGHTS.get(name[2:], 1.0) for name in joint_map]
+        self.ik = BatchIK.from_model(robot, list(joint_map.values()), version=version, variant=variant,
+                                     weights=weights)
+        self.batch_size = batch_size
+        self.max_iters = max_iters
+        self.warm_iters = warm_iters
+        self.restart_tol = restart_tol
+        self.scale = self._leg_scale(list(joint_map))
+
+    @property
+    def joint_names(self):
+        return self.ik.joint_names
+
+    def _leg_scale(self, smpl_names):
+        """Robot / SMPL pelvis-to-ankle height ratio in the rest pose (1 if no ankles are mapped)."""
+        ankles = [k for k, name in enumerate(smpl_names) if name.endswith("_Ankle")]
+        if not ankles:
+            return 1.0
+        _, rest = smpl_forward(np.zeros((1, len(self.parents), 3)), None, self.parents, self.offsets,
+                               joints=self.smpl_ids[ankles])
+        smpl_height = -(rest[0, self.smpl_ids[ankles]] @ SMPL_TO_ROBOT.T)[:, 2].mean()
+        km = self.ik.kinematics
+        robot_height = -km.forward(km.clamp(np.zeros(km.nq)))[self.ik.target_ids[ankles], 2, 3].mean()
+        return robot_height / smpl_height
+
+    def targets(self, poses):
+        """Robot target positions in the pelvis frame, shape (T, K, 3)."""
+        poses = np.asarray(poses, dtype=float).reshape(len(poses), -1, 3)
+        R, p = smpl_forward(poses, None, self.parents, self.offsets, joints=self.smpl_ids)
+        # R_pelvis^T (p_joint - p_pelvis), then into the robot axes
+        local = np.einsum("tba,tkb->tka", R[:, 0], p[:, self.smpl_ids] - p[:, :1])
+        return self.scale * local @ SMPL_TO_ROBOT.T
+
+    def root(self, poses, trans=None):
+        """Robot root trajectory (x, y, z, qw, qx, qy, qz), shape (T, 7)."""
+        poses = np.asarray(poses, dtype=float).reshape(len(poses), -1, 3)
+        root = np.zeros((len(poses), 7))
+        if trans is not None:
+            root[:, :3] = self.scale * np.asarray(trans, dtype=float) @ SMPL_TO_ROBOT.T
+        # Changing axes conjugates the rotation: the rotation vector is simply re-expressed
+        rotvec = poses[:, 0] @ SMPL_TO_ROBOT.T
+        angle = np.linalg.norm(rotvec, axis=-1)
+        root[:, 3] = np.cos(angle / 2)
+        root[:, 4:] = rotvec * (np.sinc(angle / (2 * np.pi)) / 2)[:, None]
+        return root
+
+    def __call__(self, poses, trans=None):
+        """Retarget a chunk of frames.
+
+        :param poses: SMPL poses, shape (T, J * 3) or (T, J, 3)
+        :param trans: Root translations, shape (T, 3), optional
+        :return: SimpleNamespace with ``q`` (T, nq), ``root`` (T, 7) and
+            ``error`` (T,) largest target position error in meters
+        """
+        result = self.ik.solve_sequence(self.targets(poses), batch_size=self.batch_size,
+                                        max_iters=self.max_iters, warm_iters=self.warm_iters,
+                                        restart_tol=self.restart_tol)
+        return SimpleNamespace(q=result.q, root=self.root(poses, trans), error=result.error)
+
+
+def open_motion(path):
+    """Open a motion file without loading it eagerly where possible.
+
+    Supported sources:
+
+    - ``.npy`` file of poses (memory-mapped)
+    - directory with ``poses.npy`` and optionally ``trans.npy`` (memory-mapped)
+    - ``.npz`` archive with ``poses`` and optionally ``trans`` (AMASS style;
+      members are read on access, so prefer ``.npy`` for very long sequences)
+
+    :param path: Motion file or directory
+    :return: (poses, trans or None) array-likes
+    """
+    if os.path.isdir(path):
+        trans_path = os.path.join(path, "trans.npy")
+        trans = np.load(trans_path, mmap_mode="r") if os.path.exists(trans_path) else None
+        return np.load(os.path.join(path, "poses.npy"), mmap_mode="r"), trans
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r"), None
+    if path.endswith(".npz"):
+        archive = np.load(path)
+        return archive["poses"], archive["trans"] if "trans" in archive.files else None
+    raise ValueError(f"Unsupported motion file: {path}. Expected a .npy/.npz file or a directory")
+
+
+def iter_pose_chunks(poses, trans=None, chunk_size=1024, skip=()):
+    """Yield ``(chunk_index, poses, trans)`` chunks as in-memory arrays.
+
+    Only one chunk is materialized at a time, so memory-mapped sources stay
+    on disk until needed.
+
+    :param poses: Array-like of shape (T, ...)
+    :param trans: Array-like of shape (T, 3), optional
+    :param chunk_size: Frames per chunk
+    :param skip: Chunk indices to skip (already finished)
+    """
+    for index, start in enumerate(range(0, len(poses), chunk_size)):
+        if index in skip:
+            continue
+        stop = start + chunk_size
+        yield (
+            index,
+            np.array(poses[start:stop], dtype=float),
+            None if trans is None else np.array(trans[start:stop], dtype=float),
+        )
+
+
+_worker = None
+
+
+def _init_worker(options):
+    global _worker
+    _worker = Retargeter(**options)
+
+
+def _retarget_chunk(index, poses, trans):
+    result = _worker(poses, trans)
+    return index, result.q, result.root, result.error
+
+
+def retarget_stream(source, robot, output_dir, layout=None, chunk_size=1024, workers=None,
+                    resume=True, **options):
+    """Retarget a motion dataset chunk by chunk into memory-mapped arrays.
+
+    Writes ``q.npy`` (T, nq) joint positions, ``root.npy`` (T, 7) root poses
+    and ``error.npy`` (T,) IK errors (float32) plus ``progress.json`` into
+    ``output_dir``.
+
+    :param source: Motion path (see :func:`open_motion`) or ``(poses, trans)`` arrays
+    :param robot: Robot name, e.g. 'unitree_h1'
+    :param output_dir: Output directory
+    :param layout: 'smpl' or 'smplh', default inferred from the pose shape
+    :param chunk_size: Frames per chunk
+    :param workers: Worker processes (default: CPU count); 0 or 1 runs in-process
+    :param resume: Skip chunks recorded as finished by a previous run
+    :param options: Extra options for :class:`Retargeter`
+    :return: SimpleNamespace with read-only memmaps ``q``, ``root``, ``error``
+        and ``joint_names``, ``frames``, ``chunks``, ``processed`` (frames
+        retargeted by this call), ``elapsed`` and ``fps``
+    """
+    start_time = time.perf_counter()
+    if isinstance(source, (str, os.PathLike)):
+        poses, trans = open_motion(os.fspath(source))
+    elif isinstance(source, tuple):
+        poses, trans = source
+    else:
+        poses, trans = source, None
+    layout = layout or infer_layout(poses)
+    frames = len(poses)
+    n_chunks = -(-frames // chunk_size)
+    options = dict(options, robot=robot, layout=layout)
+    retargeter = Retargeter(**options)
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, f"{name}.npy") for name in ("q", "root", "error")}
+    shapes = {"q": (frames, len(retargeter.joint_names)), "root": (frames, 7), "error": (frames,)}
+    progress_path = os.path.join(output_dir, PROGRESS_NAME)
+    meta = {"robot": robot, "layout": layout, "frames": frames, "chunk_size": chunk_size,
+            "joint_names": retargeter.joint_names,
+            "options": {k: v for k, v in options.items() if k not in ("robot", "layout")}}
+    done = set()
+    processed = 0
+    if resume and os.path.exists(progress_path) and all(os.path.exists(p) for p in paths.values()):
+        with open(progress_path) as f:
+            state = json.load(f)
+        if state["meta"] != json.loads(json.dumps(meta)):
+            raise ValueError(
+                f"{output_dir} holds results of a different job ({state['meta']['robot']}, "
+                f"{state['meta']['frames']} frames); use another output directory or resume=False"
+            )
+        done = set(state["done"])
+    mode = "r+" if done else "w+"
+    outputs = {
+        name: np.lib.format.open_memmap(path, mode=mode, dtype=np.float32, shape=shapes[name])
+        for name, path in paths.items()
+    }
+
+    def record(index, q, root, error):
+        nonlocal processed
+        processed += len(q)
+        rows = slice(index * chunk_size, index * chunk_size + len(q))
+        for name, values in (("q", q), ("root", root), ("error", error)):
+            outputs[name][rows] = values
+            outputs[name].flush()
+        done.add(index)
+        _cache.atomic_write(progress_path, json.dumps({"meta": meta, "done": sorted(done)}))
+
+    chunks = iter_pose_chunks(poses, trans, chunk_size, skip=set(done))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for index, chunk_poses, chunk_trans in chunks:
+            result = retargeter(chunk_poses, chunk_trans)
+            record(index, result.q, result.root, result.error)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(options,)) as pool:
+            pending = set()
+            for index, chunk_poses, chunk_trans in chunks:
+                # Bound the number of chunks held in memory
+                if len(pending) >= 2 * workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(*future.result())
+                pending.add(pool.submit(_retarget_chunk, index, chunk_poses, chunk_trans))
+            for future in wait(pending).done:
+                record(*future.result())
+    del outputs
+    elapsed = time.perf_counter() - start_time
+    return SimpleNamespace(
+        q=np.load(paths["q"], mmap_mode="r"),
+        root=np.load(paths["root"], mmap_mode="r"),
+        error=np.load(paths["error"], mmap_mode="r"),
+        joint_names=retargeter.joint_names,
+        frames=frames,
+        chunks=n_chunks,
+        processed=processed,
+        elapsed=elapsed,
+        fps=processed / elapsed if elapsed > 0 else float("inf"),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retarget SMPL / SMPL-H motion onto a robot")
+    parser.add_argument("source", help="Motion .npy/.npz file or directory with poses.npy [trans.npy]")
+    parser.add_argument("--robot", required=True, choices=list(JOINT_MAPS), help="Target robot")
+    parser.add_argument("--output", required=True, help="Output directory")
+    parser.add_argument("--layout", choices=list(LAYOUTS), default=None, help="Pose layout (default: inferred)")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Frames per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-resume", action="store_true", help="Start over instead of resuming")
+    args = parser.parse_args(argv)
+
+    result = retarget_stream(args.source, args.robot, args.output, layout=args.layout,
+                             chunk_size=args.chunk_size, workers=args.workers, resume=not args.no_resume)
+    print(f"{result.processed}/{result.frames} frames retargeted "
+          f"in {result.elapsed:.1f}s ({result.fps:.0f} frames/s)")
+    print(f"median error {np.median(result.error) * 1e3:.1f} mm -> {args.output}")
+
+
+__all__ = [
+    "SMPL_JOINTS",
+    "SMPLH_JOINTS",
+    "LAYOUTS",
+    "JOINT_MAPS",
+    "load_skeleton",
+    "smpl_forward",
+    "infer_layout",
+    "Retargeter",
+    "open_motion",
+    "iter_pose_chunks",
+    "retarget_stream",
+]
+
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,299 @@
+"""Lightweight URDF model representation used by the openrd model tools.
+
+The parser keeps the original ``xml.etree`` elements next to the numeric
+data so tools can both compute with a model (mass, kinematic tree, ...) and
+write modified copies of it without losing unknown tags.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from . import _stats
+from .transforms import axis_angle_to_matrix, origin_to_transform
+
+
+def _floats(text, default):
+    if text is None:
+        return np.array(default, dtype=float)
+    return np.array([float(v) for v in text.split()], dtype=float)
+
+
+def parse_origin(element):
+    """Return the 4x4 transform of the ``<origin>`` child of ``element``."""
+    origin = element.find("origin") if element is not None else None
+    if origin is None:
+        return np.eye(4)
+    return origin_to_transform(
+        _floats(origin.get("xyz"), [0, 0, 0]), _floats(origin.get("rpy"), [0, 0, 0])
+    )
+
+
+class Link:
+    """A URDF ``<link>`` with its inertial data expressed in the link frame.
+
+    :ivar name: Link name
+    :ivar mass: Link mass in kg (0 if the link has no ``<inertial>``)
+    :ivar com: Center of mass in the link frame, shape (3,)
+    :ivar inertia: Inertia tensor about the COM, expressed in the link frame
+    :ivar element: The underlying ``<link>`` XML element
+    """
+
+    def __init__(self, element):
+        self.name = element.get("name")
+        self.element = element
+        inertial = element.find("inertial")
+        self.mass = 0.0
+        self.com = np.zeros(3)
+        self.inertia = np.zeros((3, 3))
+        if inertial is not None:
+            mass = inertial.find("mass")
+            self.mass = float(mass.get("value", 0.0)) if mass is not None else 0.0
+            T = parse_origin(inertial)
+            self.com = T[:3, 3].copy()
+            tensor = inertial.find("inertia")
+            if tensor is not None:
+                ixx, ixy, ixz, iyy, iyz, izz = (
+                    float(tensor.get(k, 0.0)) for k in ("ixx", "ixy", "ixz", "iyy", "iyz", "izz")
+                )
+                I = np.array([[ixx, ixy, ixz], [ixy, iyy, iyz], [ixz, iyz, izz]])
+                R = T[:3, :3]
+                self.inertia = R @ I @ R.T
+
+    def meshes(self, tag=("visual", "collision")):
+        """Yield ``(kind, origin_4x4, filename, scale)`` for every mesh geometry."""
+        for kind in tag:
+            for item in self.element.findall(kind):
+                mesh = item.find("geometry/mesh")
+                if mesh is not None and mesh.get("filename"):
+                    yield kind, parse_origin(item), mesh.get("filename"), _floats(mesh.get("scale"), [1, 1, 1])
+
+    def __repr__(self):
+        return f"Link({self.name!r}, mass={self.mass:g})"
+
+
+class Joint:
+    """A URDF ``<joint>``.
+
+    :ivar name: Joint name
+    :ivar type: Joint type ('revolute', 'continuous', 'prismatic', 'fixed', 'floating', 'planar')
+    :ivar parent: Parent link name
+    :ivar child: Child link name
+    :ivar origin: 4x4 transform from the parent link frame to the joint frame
+    :ivar axis: Unit joint axis in the joint frame, shape (3,)
+    :ivar lower: Lower position limit (-inf if unlimited)
+    :ivar upper: Upper position limit (+inf if unlimited)
+    :ivar effort: Effort limit (None if absent)
+    :ivar velocity: Velocity limit (None if absent)
+    :ivar mimic: ``(joint_name, multiplier, offset)`` or None
+    :ivar element: The underlying ``<joint>`` XML element
+    """
+
+    def __init__(self, element):
+        self.name = element.get("name")
+        self.type = element.get("type")
+        self.element = element
+        self.parent = element.find("parent").get("link")
+        self.child = element.find("child").get("link")
+        self.origin = parse_origin(element)
+        axis = element.find("axis")
+        self.axis = _floats(axis.get("xyz") if axis is not None else None, [1, 0, 0])
+        norm = np.linalg.norm(self.axis)
+        if norm > 0:
+            self.axis = self.axis / norm
+        limit = element.find("limit")
+        self.lower, self.upper = -np.inf, np.inf
+        self.effort = self.velocity = None
+        if limit is not None:
+            if self.type in ("revolute", "prismatic"):
+                self.lower = float(limit.get("lower", 0.0))
+                self.upper = float(limit.get("upper", 0.0))
+            if limit.get("effort") is not None:
+                self.effort = float(limit.get("effort"))
+            if limit.get("velocity") is not None:
+                self.velocity = float(limit.get("velocity"))
+        mimic = element.find("mimic")
+        self.mimic = None
+        if mimic is not None:
+            self.mimic = (
+                mimic.get("joint"),
+                float(mimic.get("multiplier", 1.0)),
+                float(mimic.get("offset", 0.0)),
+            )
+
+    @property
+    def is_actuated(self):
+        """True for 1-DOF joints that are not driven by a ``<mimic>`` tag."""
+        return self.type in ("revolute", "continuous", "prismatic") and self.mimic is None
+
+    def motion(self, value):
+        """Return the 4x4 joint-frame motion for position ``value``."""
+        T = np.eye(4)
+        if self.type in ("revolute", "continuous"):
+            T[:3, :3] = axis_angle_to_matrix(self.axis, value)
+        elif self.type == "prismatic":
+            T[:3, 3] = self.axis * value
+        elif self.type != "fixed":
+            raise ValueError(f"Cannot evaluate motion of {self.type} joint '{self.name}'.")
+        return T
+
+    def __repr__(self):
+        return f"Joint({self.name!r}, {self.type}, {self.parent} -> {self.child})"
+
+
+class RobotModel:
+    """Kinematic tree parsed from a URDF file.
+
+    :ivar name: Robot name from the ``<robot name>`` attribute
+    :ivar path: Absolute path of the source file (None if parsed from a string)
+    :ivar tree: The parsed ``ElementTree``
+    :ivar links: Ordered dict of link name -> :class:`Link`
+    :ivar joints: Ordered dict of joint name -> :class:`Joint`
+    :ivar root: Name of the root link
+    """
+
+    def __init__(self, tree, path=None):
+        self.tree = tree
+        self.path = os.path.abspath(path) if path else None
+        robot = tree.getroot()
+        self.name = robot.get("name")
+        self.links = {el.get("name"): Link(el) for el in robot.findall("link")}
+        self.joints = {el.get("name"): Joint(el) for el in robot.findall("joint")}
+        self.parent_joint = {}
+        self.child_joints = {name: [] for name in self.links}
+        for joint in self.joints.values():
+            if joint.child in self.parent_joint:
+                raise ValueError(f"Link '{joint.child}' has more than one parent joint.")
+            self.parent_joint[joint.child] = joint
+            self.child_joints.setdefault(joint.parent, []).append(joint)
+        roots = [name for name in self.links if name not in self.parent_joint]
+        if len(roots) != 1:
+            raise ValueError(f"URDF must have exactly one root link, found {roots}.")
+        self.root = roots[0]
+
+    @property
+    def base_dir(self):
+        """Directory used to resolve relative mesh filenames."""
+        return os.path.dirname(self.path) if self.path else os.getcwd()
+
+    @property
+    def total_mass(self):
+        """Sum of all link masses."""
+        return float(sum(link.mass for link in self.links.values()))
+
+    @property
+    def actuated_joints(self):
+        """Actuated (non-fixed, non-mimic) joints in topological order."""
+        return [j for j in self.topological_joints() if j.is_actuated]
+
+    def topological_joints(self, root=None):
+        """Return joints ordered so that every parent precedes its children."""
+        order = []
+        stack = [root or self.root]
+        while stack:
+            link = stack.pop()
+            children = self.child_joints.get(link, [])
+            order.extend(children)
+            stack.extend(j.child for j in reversed(children))
+        return order
+
+    def subtree_links(self, link):
+        """Return the names of ``link`` and all of its descendants."""
+        result = [link]
+        for joint in self.topological_joints(link):
+            result.append(joint.child)
+        return result
+
+    def chain(self, tip, root=None):
+        """Return the joints on the path from ``root`` (default: model root) to ``tip``."""
+        root = root or self.root
+        if tip not in self.links:
+            raise ValueError(f"Link not found: {tip}")
+        joints = []
+        link = tip
+        while link != root:
+            joint = self.parent_joint.get(link)
+            if joint is None:
+                raise ValueError(f"Link '{tip}' is not a descendant of '{root}'.")
+            joints.append(joint)
+            link = joint.parent
+        return joints[::-1]
+
+    def resolve_filename(self, filename):
+        """Resolve a mesh ``filename`` (relative or ``package://``) to an absolute path."""
+        if filename.startswith("package://"):
+            # openrd meshes live in <package>/meshes/<robot>/...; map the
+            # package-relative part onto the installed meshes directory.
+            rel = filename[len("package://"):].split("/", 1)[-1]
+            return os.path.normpath(os.path.join(os.path.dirname(__file__), "meshes", rel))
+        if filename.startswith("file://"):
+            filename = filename[len("file://"):]
+        if os.path.isabs(filename):
+            return filename
+        return os.path.normpath(os.path.join(self.base_dir, filename))
+
+    def to_string(self):
+        """Serialize the (possibly modified) XML tree to a URDF string."""
+        return tostring(self.tree.getroot())
+
+
+def tostring(element):
+    """Pretty-print an XML element tree with an XML declaration."""
+    element = _copy_element(element)
+    if hasattr(ET, "indent"):
+        ET.indent(element, space="  ")
+    return '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(element, encoding="unicode") + "\n"
+
+
+def _copy_element(element):
+    # Strip whitespace-only text so ET.indent produces clean output
+    copy = ET.Element(element.tag, dict(element.attrib))
+    copy.text = element.text if element.text and element.text.strip() else None
+    copy.tail = None
+    for child in element:
+        if child.tag is ET.Comment:
+            comment = ET.Comment(child.text)
+            copy.append(comment)
+            continue
+        copy.append(_copy_element(child))
+    return copy
+
+
+@_stats.timed("robot.load_urdf")
+def load_urdf(path):
+    """Parse a URDF file into a :class:`RobotModel`.
+
+    :param path: Path to the URDF file
+    :return: RobotModel
+    """
+    _stats.add_bytes(path)
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+    return RobotModel(ET.parse(path, parser=parser), path=path)
+
+
+def parse_urdf_string(text, base_dir=None):
+    """Parse URDF XML text into a :class:`RobotModel`.
+
+    :param text: URDF XML string
+    :param base_dir: Directory used to resolve relative mesh paths, optional
+    :return: RobotModel
+    """
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+    parser.feed(text)
+    tree = ET.ElementTree(parser.close())
+    model = RobotModel(tree)
+    if base_dir:
+        model.path = os.path.join(os.path.abspath(base_dir), "__string__.urdf")
+    return model
+
+
+__all__ = [
+    "Link",
+    "Joint",
+    "RobotModel",
+    "load_urdf",
+    "parse_urdf_string",
+    "parse_origin",
+    "tostring",
+]
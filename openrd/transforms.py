@@ -0,0 +1,191 @@
+"""Rigid-body transform helpers shared by the openrd model tools.
+
+All functions operate on NumPy arrays. Rotation helpers accept either a
+single value or a batch along the leading axes.
+"""
+
+import numpy as np
+
+
+def rpy_to_matrix(rpy):
+    """Convert URDF roll-pitch-yaw angles to a rotation matrix.
+
+    :param rpy: Array of shape (..., 3) holding (roll, pitch, yaw) in radians
+    :return: Array of shape (..., 3, 3)
+    """
+    rpy = np.asarray(rpy, dtype=float)
+    r, p, y = rpy[..., 0], rpy[..., 1], rpy[..., 2]
+    cr, sr = np.cos(r), np.sin(r)
+    cp, sp = np.cos(p), np.sin(p)
+    cy, sy = np.cos(y), np.sin(y)
+    R = np.empty(rpy.shape[:-1] + (3, 3))
+    R[..., 0, 0] = cy * cp
+    R[..., 0, 1] = cy * sp * sr - sy * cr
+    R[..., 0, 2] = cy * sp * cr + sy * sr
+    R[..., 1, 0] = sy * cp
+    R[..., 1, 1] = sy * sp * sr + cy * cr
+    R[..., 1, 2] = sy * sp * cr - cy * sr
+    R[..., 2, 0] = -sp
+    R[..., 2, 1] = cp * sr
+    R[..., 2, 2] = cp * cr
+    return R
+
+
+def matrix_to_rpy(R):
+    """Convert a rotation matrix to URDF roll-pitch-yaw angles.
+
+    :param R: Array of shape (3, 3)
+    :return: Array of shape (3,)
+    """
+    R = np.asarray(R, dtype=float)
+    sp = -R[2, 0]
+    if abs(sp) >= 1.0 - 1e-12:
+        # Gimbal lock: fold yaw into roll
+        pitch = np.copysign(np.pi / 2, sp)
+        roll = np.arctan2(np.copysign(1.0, sp) * R[0, 1], R[1, 1])
+        return np.array([roll, pitch, 0.0])
+    return np.array([
+        np.arctan2(R[2, 1], R[2, 2]),
+        np.arcsin(np.clip(sp, -1.0, 1.0)),
+        np.arctan2(R[1, 0], R[0, 0]),
+    ])
+
+
+def quat_to_matrix(quat):
+    """Convert a (w, x, y, z) quaternion to a rotation matrix.
+
+    :param quat: Array of shape (..., 4), normalized internally
+    :return: Array of shape (..., 3, 3)
+    """
+    q = np.asarray(quat, dtype=float)
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    R = np.empty(q.shape[:-1] + (3, 3))
+    R[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    R[..., 0, 1] = 2 * (x * y - z * w)
+    R[..., 0, 2] = 2 * (x * z + y * w)
+    R[..., 1, 0] = 2 * (x * y + z * w)
+    R[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    R[..., 1, 2] = 2 * (y * z - x * w)
+    R[..., 2, 0] = 2 * (x * z - y * w)
+    R[..., 2, 1] = 2 * (y * z + x * w)
+    R[..., 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+
+def matrix_to_quat(R):
+    """Convert a rotation matrix to a (w, x, y, z) quaternion with w >= 0.
+
+    :param R: Array of shape (3, 3)
+    :return: Array of shape (4,)
+    """
+    R = np.asarray(R, dtype=float)
+    trace = R[0, 0] + R[1, 1] + R[2, 2]
+    if trace > 0:
+        s = 2.0 * np.sqrt(trace + 1.0)
+        q = [0.25 * s, (R[2, 1] - R[1, 2]) / s, (R[0, 2] - R[2, 0]) / s, (R[1, 0] - R[0, 1]) / s]
+    elif R[0, 0] > R[1, 1] and R[0, 0] > R[2, 2]:
+        s = 2.0 * np.sqrt(1.0 + R[0, 0] - R[1, 1] - R[2, 2])
+        q = [(R[2, 1] - R[1, 2]) / s, 0.25 * s, (R[0, 1] + R[1, 0]) / s, (R[0, 2] + R[2, 0]) / s]
+    elif R[1, 1] > R[2, 2]:
+        s = 2.0 * np.sqrt(1.0 + R[1, 1] - R[0, 0] - R[2, 2])
+        q = [(R[0, 2] - R[2, 0]) / s, (R[0, 1] + R[1, 0]) / s, 0.25 * s, (R[1, 2] + R[2, 1]) / s]
+    else:
+        s = 2.0 * np.sqrt(1.0 + R[2, 2] - R[0, 0] - R[1, 1])
+        q = [(R[1, 0] - R[0, 1]) / s, (R[0, 2] + R[2, 0]) / s, (R[1, 2] + R[2, 1]) / s, 0.25 * s]
+    q = np.asarray(q)
+    q /= np.linalg.norm(q)
+    return -q if q[0] < 0 else q
+
+
+def axis_angle_to_matrix(axis, angle):
+    """Rodrigues rotation about unit ``axis`` by ``angle``.
+
+    :param axis: Array of shape (3,) or (..., 3)
+    :param angle: Scalar or array broadcastable against ``axis[..., 0]``
+    :return: Array of shape (..., 3, 3)
+    """
+    axis = np.asarray(axis, dtype=float)
+    angle = np.asarray(angle, dtype=float)
+    shape = np.broadcast_shapes(axis.shape[:-1], angle.shape)
+    x = np.broadcast_to(axis[..., 0], shape)
+    y = np.broadcast_to(axis[..., 1], shape)
+    z = np.broadcast_to(axis[..., 2], shape)
+    c, s = np.cos(angle), np.sin(angle)
+    t = 1.0 - c
+    R = np.empty(shape + (3, 3))
+    R[..., 0, 0] = t * x * x + c
+    R[..., 0, 1] = t * x * y - s * z
+    R[..., 0, 2] = t * x * z + s * y
+    R[..., 1, 0] = t * x * y + s * z
+    R[..., 1, 1] = t * y * y + c
+    R[..., 1, 2] = t * y * z - s * x
+    R[..., 2, 0] = t * x * z - s * y
+    R[..., 2, 1] = t * y * z + s * x
+    R[..., 2, 2] = t * z * z + c
+    return R
+
+
+def make_transform(R=None, p=None):
+    """Assemble a 4x4 homogeneous transform.
+
+    :param R: Rotation matrix (3, 3), identity if None
+    :param p: Translation (3,), zero if None
+    :return: Array of shape (4, 4)
+    """
+    T = np.eye(4)
+    if R is not None:
+        T[:3, :3] = R
+    if p is not None:
+        T[:3, 3] = p
+    return T
+
+
+def origin_to_transform(xyz, rpy):
+    """Convert a URDF ``<origin xyz rpy>`` pair to a 4x4 transform."""
+    return make_transform(rpy_to_matrix(rpy), xyz)
+
+
+def transform_to_origin(T):
+    """Convert a 4x4 transform back to a URDF ``(xyz, rpy)`` pair."""
+    return T[:3, 3].copy(), matrix_to_rpy(T[:3, :3])
+
+
+def skew(v):
+    """Skew-symmetric cross-product matrix of ``v`` with shape (..., 3)."""
+    v = np.asarray(v, dtype=float)
+    S = np.zeros(v.shape[:-1] + (3, 3))
+    S[..., 0, 1] = -v[..., 2]
+    S[..., 0, 2] = v[..., 1]
+    S[..., 1, 0] = v[..., 2]
+    S[..., 1, 2] = -v[..., 0]
+    S[..., 2, 0] = -v[..., 1]
+    S[..., 2, 1] = v[..., 0]
+    return S
+
+
+def combine_inertias(masses, coms, inertias):
+    """Combine rigid bodies expressed in a common frame into one body.
+
+    Each inertia tensor is taken about its own center of mass, expressed in
+    the common frame. The result is the total mass, the combined center of
+    mass and the combined inertia tensor about that center of mass, using
+    the parallel-axis theorem.
+
+    :param masses: Sequence of masses
+    :param coms: Sequence of centers of mass, shape (n, 3)
+    :param inertias: Sequence of 3x3 inertia tensors, shape (n, 3, 3)
+    :return: Tuple ``(mass, com, inertia)``
+    """
+    masses = np.asarray(masses, dtype=float)
+    coms = np.asarray(coms, dtype=float).reshape(-1, 3)
+    inertias = np.asarray(inertias, dtype=float).reshape(-1, 3, 3)
+    mass = masses.sum()
+    if mass <= 0.0:
+        return 0.0, np.zeros(3), np.zeros((3, 3))
+    com = (masses[:, None] * coms).sum(axis=0) / mass
+    inertia = np.zeros((3, 3))
+    for m, c, I in zip(masses, coms, inertias):
+        d = c - com
+        inertia += I + m * (np.dot(d, d) * np.eye(3) - np.outer(d, d))
+    return float(mass), com, inertia
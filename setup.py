@@ -34,9 +34,12 @@ setup(
     packages=find_packages(),
     # Tell setuptools to include the non-Python files
     package_data={
-        package_name: ['urdf/**/*', 'meshes/**/*', 'mjcf/**/*']
+        package_name: ['urdf/**/*', 'meshes/**/*', 'mjcf/**/*', 'catalog.json', '*.orda']
     },
     include_package_data=True,
+    entry_points={
+        'console_scripts': ['openrd=openrd.cli:main'],
+    },
     keywords="robotics, urdf, mjcf, robot-description",
     python_requires=">=3.7",
 )
\ No newline at end of file
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Tests for packed model archives."""
+
+import os
+
+import numpy as np
+import pytest
+import trimesh
+
+import openrd
+from openrd import archive, get_model_path
+from openrd.archive import PACKAGE_DIR, Archive, build_archive, extract_path
+from openrd.mesh_loader import load_mesh, resolve_mesh_path
+from openrd.robot import load_urdf
+
+MESH = "meshes/unitree_h1/left_ankle_link.STL"
+
+
+@pytest.fixture()
+def h1_archive(tmp_path, monkeypatch):
+    path = str(tmp_path / "unitree_h1.orda")
+    build_archive(path, robots=["unitree_h1"])
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("OPENRD_ARCHIVE", path)
+    monkeypatch.setattr(archive, "_paths", None)
+    monkeypatch.setattr(archive, "_opened", {})
+    monkeypatch.setattr(archive, "_extracted", set())
+    return path
+
+
+def _ghost(name):
+    """Alias a member under a robot directory that does not exist on disk."""
+    opened = archive.archives()[0]
+    ghost = name.replace("unitree_h1", "ghost")
+    opened.members[ghost] = opened.members[name]
+    return os.path.join(PACKAGE_DIR, *ghost.split("/"))
+
+
+def test_members_match_loose_files(h1_archive):
+    with Archive(h1_archive) as packed:
+        assert "urdf/unitree_h1/h1.urdf" in packed and MESH in packed
+        assert not any(name.endswith(".py") for name in packed.members)
+        with open(os.path.join(PACKAGE_DIR, MESH), "rb") as f:
+            data = f.read()
+        assert packed.read(MESH) == data
+        assert packed.view(MESH).tobytes() == data
+        assert packed.verify() == []
+
+
+def test_extract_model_keeps_mesh_references(h1_archive):
+    extracted = extract_path(get_model_path("unitree_h1"))
+    assert extracted.startswith(os.environ["OPENRD_CACHE_DIR"])
+    model = load_urdf(extracted)
+    meshes = [model.resolve_filename(f) for link in model.links.values() for _, _, f, _ in link.meshes()]
+    assert meshes and all(os.path.exists(path) for path in meshes)
+    assert extract_path(os.path.join(PACKAGE_DIR, "urdf", "bruce", "bruce.urdf")) is None
+
+
+def test_robot_directory_extracted_once(h1_archive, monkeypatch):
+    first = extract_path(get_model_path("unitree_h1"))
+    extracted = []
+    extract = Archive.extract
+    monkeypatch.setattr(Archive, "extract",
+                        lambda self, name, *args: extracted.append(name) or extract(self, name, *args))
+    assert extract_path(get_model_path("unitree_h1")) == first
+    assert extracted == ["urdf/unitree_h1/h1.urdf"]
+
+
+def test_pruned_files_served_from_archive(h1_archive, monkeypatch):
+    ghost_mesh = _ghost(MESH)
+    assert not os.path.exists(ghost_mesh)
+    loose = trimesh.load(os.path.join(PACKAGE_DIR, MESH), force="mesh")
+    np.testing.assert_allclose(load_mesh(ghost_mesh).vertices, loose.vertices)
+    assert os.path.getsize(resolve_mesh_path(ghost_mesh)) == os.path.getsize(os.path.join(PACKAGE_DIR, MESH))
+
+    ghost_urdf = _ghost("urdf/unitree_h1/h1.urdf")
+    monkeypatch.setattr(openrd.urdf.unitree_h1.h1, "urdf", ghost_urdf)
+    path = get_model_path("unitree_h1")
+    assert path != ghost_urdf and os.path.exists(path)
+    with pytest.raises(FileNotFoundError):
+        load_mesh(os.path.join(PACKAGE_DIR, "meshes", "ghost", "missing.STL"))
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "bad.orda"
+    path.write_bytes(b"not an archive at all")
+    with pytest.raises(ValueError):
+        Archive(str(path))
+    with pytest.raises(ValueError):
+        build_archive(str(tmp_path / "x.orda"), robots=["no_such_robot"])
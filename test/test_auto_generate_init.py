@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for incremental __init__.py generation."""
+
+import json
+
+from auto_generate_init import STATE_FILE, process_library
+
+MJCF = '<mujoco model="{name}"><worldbody/></mujoco>\n'
+
+
+def _library(tmp_path):
+    library = tmp_path / "openrd"
+    for name in ("alpha", "beta"):
+        (library / "mjcf" / name).mkdir(parents=True)
+        (library / "mjcf" / name / f"{name}.xml").write_text(MJCF.format(name=name))
+    return library
+
+
+def test_generates_inits_and_state(tmp_path):
+    library = _library(tmp_path)
+    changed, changed_files = process_library(library, ["mjcf"], verbose=False)
+    assert changed
+    assert sorted(p.name for p in changed_files) == ["alpha.xml", "beta.xml"]
+    init = (library / "mjcf" / "alpha" / "__init__.py").read_text()
+    assert 'alpha.xml = os.path.join(_MODULE_PATH, "alpha.xml")' in init
+    assert '    "beta",' in (library / "mjcf" / "__init__.py").read_text()
+    state = json.loads((library / "mjcf" / STATE_FILE).read_text())
+    assert set(state["robots"]) == {"alpha", "beta"}
+
+
+def test_incremental_only_touches_changed_entries(tmp_path):
+    library = _library(tmp_path)
+    process_library(library, ["mjcf"], verbose=False)
+    inits = {p: p.stat().st_mtime_ns for p in library.rglob("__init__.py")}
+
+    assert process_library(library, ["mjcf"], incremental=True, verbose=False) == (False, [])
+    assert {p: p.stat().st_mtime_ns for p in library.rglob("__init__.py")} == inits
+
+    # Content change: catalog entry is stale, but the generated module is the same
+    (library / "mjcf" / "beta" / "beta.xml").write_text(MJCF.format(name="beta2"))
+    changed, changed_files = process_library(library, ["mjcf"], incremental=True, verbose=False)
+    assert changed and changed_files == [library / "mjcf" / "beta" / "beta.xml"]
+    assert {p: p.stat().st_mtime_ns for p in library.rglob("__init__.py")} == inits
+
+    # New model file and new robot directory
+    (library / "mjcf" / "alpha" / "alpha_hand.xml").write_text(MJCF.format(name="hand"))
+    (library / "mjcf" / "gamma").mkdir()
+    (library / "mjcf" / "gamma" / "gamma.xml").write_text(MJCF.format(name="gamma"))
+    changed, changed_files = process_library(library, ["mjcf"], incremental=True, verbose=False)
+    assert sorted(p.name for p in changed_files) == ["alpha_hand.xml", "gamma.xml"]
+    assert "alpha_hand = SimpleNamespace()" in (library / "mjcf" / "alpha" / "__init__.py").read_text()
+    assert '    "gamma",' in (library / "mjcf" / "__init__.py").read_text()
+
+    # Removed model file: nothing to re-parse, but the catalog must be refreshed
+    (library / "mjcf" / "gamma" / "gamma.xml").unlink()
+    assert process_library(library, ["mjcf"], incremental=True, verbose=False) == (True, [])
+
+
+def test_mesh_changes_mark_models_changed(tmp_path):
+    library = _library(tmp_path)
+    mesh_dir = library / "meshes" / "alpha"
+    mesh_dir.mkdir(parents=True)
+    (mesh_dir / "base.stl").write_bytes(b"solid base\nendsolid base\n")
+    process_library(library, ["mjcf"], verbose=False)
+    assert process_library(library, ["mjcf"], incremental=True, verbose=False) == (False, [])
+
+    # Catalog properties such as mesh_bytes depend on the meshes: re-parse the robot's models
+    (mesh_dir / "arm.stl").write_bytes(b"solid arm\nendsolid arm\n")
+    changed, changed_files = process_library(library, ["mjcf"], incremental=True, verbose=False)
+    assert changed and changed_files == [library / "mjcf" / "alpha" / "alpha.xml"]
+    (mesh_dir / "arm.stl").unlink()
+    assert process_library(library, ["mjcf"], incremental=True, verbose=False) == (
+        True, [library / "mjcf" / "alpha" / "alpha.xml"])
+    assert process_library(library, ["mjcf"], incremental=True, verbose=False) == (False, [])
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for the searchable model catalog."""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from openrd import catalog, get_model_path
+from openrd.catalog import INDEX_PATH, build_index, query
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(catalog, "_index", None)
+
+
+def test_shipped_index_is_up_to_date():
+    with open(INDEX_PATH) as f:
+        shipped = json.load(f)["models"]
+    assert shipped == build_index(), "Run: python -m openrd.catalog build"
+
+
+def test_query_does_not_parse_xml(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("XML parsed at query time")
+
+    monkeypatch.setattr(ET, "parse", fail)
+    monkeypatch.setattr(ET, "XMLParser", fail)
+    assert query(name="unitree_g1", format="urdf")
+
+
+def test_filter_and_sort():
+    models = query(tags__contains="humanoid", dof__ge=23, formats__contains=["urdf", "mjcf"],
+                   format="urdf", sort_by="-dof")
+    names = [m.name for m in models]
+    assert {"unitree_g1", "fourier_gr3"} <= set(names)
+    assert "unitree_h1" not in names
+    assert [m.dof for m in models] == sorted((m.dof for m in models), reverse=True)
+
+    g1 = query(name="unitree_g1", format="urdf")[0]
+    assert g1.path == get_model_path("unitree_g1")
+    assert "left_knee_joint" in g1.joint_names
+    assert g1.total_mass > 0 and g1.mesh_bytes > 0 and g1.link_count > g1.dof
+    # Variants use the iter_models / get_model_path convention: None when absent
+    assert g1.variant is None and query(name="unitree_g1", format="urdf", variant=None) == [g1]
+
+    heaviest = query(format="urdf", sort_by="-total_mass", limit=1)[0]
+    assert heaviest.total_mass == max(m.total_mass for m in query(format="urdf"))
+    assert [m.variant for m in query(name="smpl", variant__in=["smpl_humanoid", "smplh_humanoid"])] == [
+        "smpl_humanoid",
+        "smplh_humanoid",
+    ]
+    assert query(where=lambda m: m.mesh_count == 0, format="urdf") == []
+
+
+def test_unknown_field_or_operator():
+    with pytest.raises(ValueError):
+        query(weight__ge=10)
+    with pytest.raises(ValueError):
+        query(dof__between=(1, 2))
+
+
+def test_incremental_build_reparses_only_given_paths():
+    previous = build_index()
+    for entry in previous:
+        entry["dof"] = -1
+    h1 = get_model_path("unitree_h1")
+    entries = build_index(only=[h1], previous=previous)
+    reparsed = [e for e in entries if e["dof"] != -1]
+    assert [e["path"] for e in reparsed] == ["urdf/unitree_h1/h1.urdf"]
+    assert len(entries) == len(previous)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for the streaming model listing and the ``openrd`` command line interface."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import openrd
+from openrd import get_model_path, iter_models
+from openrd.cli import main
+
+
+def _run(capsys, *argv):
+    main(list(argv))
+    return capsys.readouterr().out
+
+
+def test_iter_models_yields_get_model_path_arguments():
+    records = iter_models(model_format=None)
+    assert not isinstance(records, list)
+    records = list(records)
+    assert len(records) == len(openrd._collect_models("urdf")) + len(openrd._collect_models("mjcf"))
+    for record in records:
+        assert set(record) == {"name", "version", "variant", "format", "path"}
+        assert get_model_path(record["name"], version=record["version"], variant=record["variant"],
+                              model_format=record["format"]) == record["path"]
+    smpl = [r["variant"] for r in iter_models("mjcf", name="smpl")]
+    assert smpl == sorted(smpl) and "smpl_humanoid" in smpl
+
+
+def test_lookups_import_only_the_requested_robot():
+    code = ("import sys; from openrd.cli import main; main(['path', 'unitree_g1']); "
+            "print(sorted(m for m in sys.modules if m.startswith(('openrd.', 'numpy', 'xml'))))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    path, modules = result.stdout.splitlines()
+    assert path == get_model_path("unitree_g1")
+    assert eval(modules) == ["openrd._stats", "openrd.cli", "openrd.urdf", "openrd.urdf.unitree_g1"]
+
+
+def test_list_and_path(capsys):
+    lines = _run(capsys, "list", "--format", "all", "--name", "unitree_h1").splitlines()
+    assert [json.loads(line)["format"] for line in lines] == ["urdf", "mjcf"]
+    records = json.loads(_run(capsys, "list", "--format", "mjcf", "--fields", "name", "variant", "--json"))
+    assert {"name": "smpl", "variant": "smpl_humanoid"} in records and all(len(r) == 2 for r in records)
+
+    assert _run(capsys, "path", "unitree_h1", "--format", "mjcf").strip() == get_model_path("unitree_h1",
+                                                                                           model_format="mjcf")
+
+
+def test_path_variants_info_and_prefetch(capsys, tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path))
+    record = json.loads(_run(capsys, "path", "unitree_h1", "--reduce", '{"lock": {"torso_joint": 0}}', "--json"))
+    assert record["path"].startswith(str(tmp_path)) and record["format"] == "urdf"
+
+    info = json.loads(_run(capsys, "info", "unitree_g1"))
+    assert info["name"] == "unitree_g1" and info["variant"] is None and info["dof"] > 20
+
+    lines = _run(capsys, "prefetch", "bruce", "unitree_h1", "--format", "all").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [(r["name"], r["format"]) for r in records] == [("bruce", "urdf"), ("bruce", "mjcf"),
+                                                           ("unitree_h1", "urdf"), ("unitree_h1", "mjcf")]
+    assert all("error" not in r and r["seconds"] >= 0 for r in records)
+
+
+def test_errors_exit_non_zero(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["path", "no_such_robot"])
+    assert exit_info.value.code == 1 and "Robot not found" in capsys.readouterr().err
+    with pytest.raises(SystemExit) as exit_info:
+        main(["prefetch", "no_such_robot"])
+    assert exit_info.value.code == 1
+    with pytest.raises(SystemExit) as exit_info:
+        main(["path", "unitree_h1", "--reduce", "[1]"])
+    assert exit_info.value.code == 2
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Tests for URDF <-> MJCF conversion and the kinematic equivalence check."""
+
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from openrd import convert
+from openrd.convert import check_model, compare_kinematics, convert_catalog, convert_file
+from openrd.robot import load_urdf
+
+URDF = """<robot name="twins">
+  <material name="red"><color rgba="1 0 0 1"/></material>
+  <link name="base">
+    <inertial><mass value="2"/><inertia ixx="0.1" iyy="0.1" izz="0.1" ixy="0" ixz="0" iyz="0"/></inertial>
+    <visual><geometry><box size="0.2 0.2 0.1"/></geometry><material name="red"/></visual>
+    <collision><geometry><box size="0.2 0.2 0.1"/></geometry></collision>
+  </link>
+  <link name="left">
+    <inertial><origin xyz="0 0 0.05"/><mass value="0.5"/>
+      <inertia ixx="0.01" iyy="0.01" izz="0.01" ixy="0" ixz="0" iyz="0"/></inertial>
+    <visual><origin xyz="0 0 0.1" rpy="0.2 0 0"/><geometry><cylinder radius="0.02" length="0.2"/></geometry></visual>
+  </link>
+  <link name="right">
+    <inertial><mass value="0.5"/><inertia ixx="0.01" iyy="0.01" izz="0.01" ixy="0" ixz="0" iyz="0"/></inertial>
+    <visual><geometry><sphere radius="0.05"/></geometry></visual>
+  </link>
+  <joint name="left_joint" type="revolute">
+    <parent link="base"/><child link="left"/><origin xyz="0 0.2 0"/><axis xyz="0 0 1"/>
+    <limit lower="-1" upper="1" effort="10" velocity="1"/>
+  </joint>
+  <joint name="right_joint" type="revolute">
+    <parent link="base"/><child link="right"/><origin xyz="0 -0.2 0" rpy="0 0.3 0"/><axis xyz="1 0 0"/>
+    <limit lower="-1" upper="1" effort="10" velocity="1"/>
+    <mimic joint="left_joint" multiplier="-1" offset="0.1"/>
+  </joint>
+</robot>
+"""
+
+# Several joints per body, anchors off the body origin, reference positions,
+# degrees and a capsule: the cases that need intermediate URDF links
+MJCF = """<mujoco model="arm">
+  <compiler angle="degree"/>
+  <default><default class="arm"><joint axis="0 1 0" range="-90 90"/></default></default>
+  <worldbody>
+    <body name="base" pos="0 0 1">
+      <freejoint/>
+      <geom type="box" size="0.1 0.1 0.05"/>
+      <body name="upper" pos="0 0 0.1" euler="0 0 30" childclass="arm">
+        <inertial pos="0 0 0.15" mass="1" diaginertia="0.01 0.01 0.002"/>
+        <joint name="shoulder_pitch" pos="0 0 0.02" ref="10"/>
+        <joint name="shoulder_roll" axis="1 0 0" pos="0.01 0 0.02"/>
+        <geom type="capsule" fromto="0 0 0 0 0 0.3" size="0.03"/>
+        <body name="lower" pos="0 0 0.3">
+          <joint name="elbow" range="0 150"/>
+          <joint name="slider" type="slide" axis="0 0 1" range="0 0.1" ref="0.02"/>
+          <joint name="coupled" axis="1 0 0"/>
+          <geom type="cylinder" size="0.02 0.1" pos="0 0 0.1"/>
+        </body>
+      </body>
+    </body>
+  </worldbody>
+  <equality><joint joint1="coupled" joint2="elbow" polycoef="0.1 0.5 0 0 0"/></equality>
+  <actuator><motor joint="elbow" ctrlrange="-2 2" gear="10"/></actuator>
+</mujoco>
+"""
+
+
+@pytest.fixture()
+def twins(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "twins.urdf"
+    path.write_text(URDF)
+    return str(path)
+
+
+def test_urdf_to_mjcf_round_trip(twins):
+    mjcf_path = convert_file(twins)
+    report = compare_kinematics(twins, mjcf_path, samples=512)
+    assert report.equivalent and report.joints == ["left_joint"]
+    assert report.position_error < 1e-9 and sorted(report.errors) == ["base", "left", "right"]
+
+    root = ET.parse(mjcf_path).getroot()
+    assert root.find("equality/joint").attrib == {"joint1": "right_joint", "joint2": "left_joint",
+                                                  "polycoef": "0.1 -1 0 0 0"}
+    assert root.find("actuator/motor").get("ctrlrange") == "-10 10"
+    geoms = root.find("worldbody").iter("geom")
+    assert [g.get("class") for g in geoms] == ["visual", "collision", "visual", "visual"]
+
+    back = load_urdf(convert_file(mjcf_path, source_format="mjcf"))
+    assert back.joints["right_joint"].mimic == ("left_joint", -1.0, 0.1)
+    assert np.isclose(back.links["left"].mass, 0.5) and np.allclose(back.links["left"].com, [0, 0, 0.05])
+    assert compare_kinematics(back.path, mjcf_path, samples=512).equivalent
+
+
+def test_converted_mjcf_compiles_in_mujoco(twins):
+    mujoco = pytest.importorskip("mujoco")
+    model = mujoco.MjModel.from_xml_path(convert_file(twins, free_joint=True))
+    assert (model.nbody, model.njnt, model.nu, model.neq) == (4, 3, 1, 1)
+    assert np.isclose(model.body("left").mass[0], 0.5)
+
+
+def test_mjcf_to_urdf_chains_joints(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path / "cache"))
+    mjcf_path = tmp_path / "arm.xml"
+    mjcf_path.write_text(MJCF)
+    urdf_path = convert_file(str(mjcf_path), source_format="mjcf")
+    model = load_urdf(urdf_path)
+    assert model.root == "base"
+    assert [j.name for j in model.chain("lower")] == ["shoulder_pitch", "shoulder_roll", "upper_fixed", "elbow",
+                                                      "slider", "coupled"]
+    elbow, slider = model.joints["elbow"], model.joints["slider"]
+    assert np.allclose([elbow.lower, elbow.upper], [0.0, np.radians(150)]) and elbow.effort == 20.0
+    assert slider.type == "prismatic" and np.allclose([slider.lower, slider.upper], [0.0, 0.1])
+    assert model.joints["coupled"].mimic == ("elbow", 0.5, 0.1)
+    # Without visual-only geoms every geom is drawn; the capsule becomes a cylinder and two spheres
+    upper = model.links["upper"].element
+    assert len(upper.findall("visual")) == len(upper.findall("collision")) == 3
+
+    report = compare_kinematics(urdf_path, str(mjcf_path), samples=1024)
+    assert report.equivalent, report.errors
+    assert report.joints == ["shoulder_pitch", "shoulder_roll", "elbow", "slider"]
+
+
+def test_bundled_models_checked_for_drift():
+    assert check_model("unitree_h1", samples=1024).equivalent
+    # The G1 MJCF hand differs from the URDF (frame of left_one_link, joint limits)
+    report = check_model("unitree_g1", samples=1024)
+    assert not report.equivalent and report.position_error > 1e-3
+    assert report.worst_link.endswith(("_one_link", "_two_link", "_three_link", "_four_link", "_five_link",
+                                       "_six_link"))
+    assert not report.urdf_only_joints and not report.mjcf_only_joints
+
+
+def test_catalog_conversion_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path))
+    first = convert_catalog(["unitree_h1", "bruce"], workers=1, check=True)
+    assert [r.name for r in first] == ["bruce", "unitree_h1"]
+    assert all(r.error is None and r.report.equivalent for r in first)
+
+    monkeypatch.setattr(convert, "urdf_to_mjcf", lambda *args, **kwargs: pytest.fail("cached model was rebuilt"))
+    assert [r.path for r in convert_catalog(["unitree_h1", "bruce"], workers=1)] == [r.path for r in first]
+    with pytest.raises(ValueError):
+        convert_file(first[0].source, source_format="sdf")
+
+
+def test_catalog_check_forwards_comparison_options(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path))
+    calls = []
+    monkeypatch.setattr(convert, "compare_kinematics", lambda *paths, **kwargs: calls.append(kwargs))
+    convert.main(["convert", "--robots", "bruce", "--workers", "1", "--check", "--samples", "7",
+                  "--tolerance", "0.5"])
+    assert calls == [{"samples": 7, "tolerance": 0.5}]
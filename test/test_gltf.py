@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Tests for GLB export and the node transform fast path."""
+
+import numpy as np
+import pytest
+
+from openrd import get_model_path
+from openrd import gltf
+from openrd.gltf import GlbScene, export_glb, read_glb, shade
+from openrd.kinematics import KinematicModel
+
+URDF = """<robot name="twins">
+  <material name="red"><color rgba="1 0 0 1"/></material>
+  <link name="base">
+    <visual><geometry><box size="0.2 0.2 0.1"/></geometry></visual>
+  </link>
+  <link name="left">
+    <visual><geometry><mesh filename="part.stl"/></geometry><material name="red"/></visual>
+  </link>
+  <link name="right">
+    <visual><origin xyz="0 0 0.1"/><geometry><mesh filename="part.stl" scale="1 -1 1"/></geometry></visual>
+  </link>
+  <joint name="left_joint" type="revolute">
+    <parent link="base"/><child link="left"/><origin xyz="0 0.2 0"/><axis xyz="0 0 1"/>
+    <limit lower="-1" upper="1" effort="1" velocity="1"/>
+  </joint>
+  <joint name="right_joint" type="revolute">
+    <parent link="base"/><child link="right"/><origin xyz="0 -0.2 0" rpy="0 0.3 0"/><axis xyz="1 0 0"/>
+    <mimic joint="left_joint" multiplier="-1" offset="0.1"/>
+  </joint>
+</robot>
+"""
+
+
+@pytest.fixture()
+def twins(tmp_path, monkeypatch):
+    import trimesh
+
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path / "cache"))
+    trimesh.creation.box(extents=[0.1, 0.2, 0.3]).export(str(tmp_path / "part.stl"))
+    path = tmp_path / "twins.urdf"
+    path.write_text(URDF)
+    return str(path)
+
+
+def test_structure_shares_meshes(twins):
+    scene = GlbScene(export_glb(twins))
+    assert scene.link_names == ["base", "left", "right"]
+    assert scene.joint_names == ["left_joint"]
+    nodes = scene.gltf["nodes"]
+    assert nodes[0]["children"][:1] == [3] and set(nodes[0]["children"][1:]) == {1, 2}
+    # The box file is stored once and shared across materials and scales
+    left, right = (nodes[nodes[i]["children"][0]] for i in (1, 2))
+    assert left["mesh"] != right["mesh"]
+    primitives = [scene.gltf["meshes"][n["mesh"]]["primitives"][0] for n in (left, right)]
+    assert primitives[0]["attributes"] == primitives[1]["attributes"]
+    assert len(scene.gltf["meshes"]) == 3 and len(scene.gltf["materials"]) == 2
+    assert np.isclose(np.linalg.det(np.reshape(right["matrix"], (4, 4))), -1.0)
+    # Flat box faces: the 8 corners are split into 24 vertices with axis-aligned normals
+    accessor = scene.gltf["accessors"][primitives[0]["attributes"]["NORMAL"]]
+    view = scene.gltf["bufferViews"][accessor["bufferView"]]
+    normals = np.frombuffer(scene.binary, np.float32, accessor["count"] * 3, view["byteOffset"]).reshape(-1, 3)
+    assert len(normals) == 24 and np.allclose(np.abs(normals).sum(axis=1), 1.0)
+
+
+def test_node_matrices_match_forward_kinematics(twins):
+    scene = GlbScene(export_glb(twins))
+    kinematics = KinematicModel(twins)
+    q = np.random.default_rng(0).uniform(-1, 1, (16, 1))
+    np.testing.assert_allclose(scene.link_poses(q), kinematics.forward(q), atol=1e-12)
+
+    path = get_model_path("unitree_g1")
+    scene, kinematics = GlbScene(export_glb(path)), KinematicModel(path)
+    assert scene.link_names == kinematics.link_names
+    q = np.random.default_rng(1).uniform(-1, 1, (8, kinematics.nq))
+    np.testing.assert_allclose(scene.link_poses(q), kinematics.forward(q), atol=1e-12)
+
+    posed, _ = read_glb(scene.posed(q[0]))
+    local = scene.node_matrices(q[0])
+    for i in range(len(scene.link_names)):
+        np.testing.assert_allclose(np.reshape(posed["nodes"][i]["matrix"], (4, 4)).T, local[i], atol=1e-12)
+    assert posed["nodes"][len(scene.link_names):] == scene.gltf["nodes"][len(scene.link_names):]
+
+
+def test_mjcf_matches_mujoco(tmp_path, monkeypatch):
+    mujoco = pytest.importorskip("mujoco")
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path))
+    path = get_model_path("smpl", variant="smpl_humanoid", model_format="mjcf")
+    scene = GlbScene(export_glb(path, model_format="mjcf"))
+    model = mujoco.MjModel.from_xml_path(path)
+    data = mujoco.MjData(model)
+    q = np.random.default_rng(2).uniform(-1, 1, scene.nq)
+    for name, value in zip(scene.joint_names, q):
+        data.qpos[model.joint(name).qposadr[0]] = value
+    mujoco.mj_kinematics(model, data)
+    poses = scene.link_poses(q)
+    ids = [0] + [model.body(name).id for name in scene.link_names[1:]]
+    np.testing.assert_allclose(poses[:, :3, 3], data.xpos[ids], atol=1e-9)
+    np.testing.assert_allclose(poses[:, :3, :3], data.xmat[ids].reshape(-1, 3, 3), atol=1e-9)
+
+
+def test_quantized_export_and_cache(twins, monkeypatch):
+    import trimesh
+
+    path = export_glb(twins, quantize=True)
+    scene = GlbScene(path)
+    assert scene.gltf["extensionsRequired"] == ["KHR_mesh_quantization"]
+    loaded = trimesh.load(path)
+    reference = trimesh.load(export_glb(twins))
+    np.testing.assert_allclose(loaded.bounds, reference.bounds, atol=1e-5)
+
+    monkeypatch.setattr(gltf, "_build_glb", lambda *args: pytest.fail("cached export was rebuilt"))
+    assert export_glb(twins, quantize=True) == path
+    with pytest.raises(ValueError):
+        export_glb(twins, geometry="inertial")
+
+
+def _rendered_normals(path):
+    """Normals of the first mesh node as a renderer sees them (inverse transpose of the node matrix)."""
+    with open(path, "rb") as f:
+        document, binary = read_glb(f.read())
+    node = next(node for node in document["nodes"] if "mesh" in node)
+    accessor = document["accessors"][document["meshes"][node["mesh"]]["primitives"][0]["attributes"]["NORMAL"]]
+    view = document["bufferViews"][accessor["bufferView"]]
+    dtype = np.int16 if accessor["componentType"] == gltf._SHORT else np.float32
+    stride = view.get("byteStride", 3 * np.dtype(dtype).itemsize) // np.dtype(dtype).itemsize
+    data = np.frombuffer(binary, dtype, view["byteLength"] // np.dtype(dtype).itemsize, view["byteOffset"])
+    normals = data.reshape(-1, stride)[:, :3].astype(float)
+    linear = np.array(node["matrix"]).reshape(4, 4).T[:3, :3]
+    normals = normals @ np.linalg.inv(linear)
+    return normals / np.linalg.norm(normals, axis=1)[:, None]
+
+
+def test_quantized_normals_survive_anisotropic_scale(tmp_path, monkeypatch):
+    import trimesh
+
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path / "cache"))
+    ellipsoid = trimesh.creation.icosphere(subdivisions=3)
+    ellipsoid.apply_scale([0.005, 0.05, 0.15])
+    ellipsoid.export(str(tmp_path / "ellipsoid.stl"))
+    path = tmp_path / "ellipsoid.urdf"
+    path.write_text('<robot name="e"><link name="base"><visual><geometry><mesh filename="ellipsoid.stl"/>'
+                    '</geometry></visual></link></robot>')
+    reference = _rendered_normals(export_glb(str(path), y_up=False))
+    rendered = _rendered_normals(export_glb(str(path), quantize=True, y_up=False))
+    angles = np.degrees(np.arccos(np.clip(np.einsum("ij,ij->i", rendered, reference), -1.0, 1.0)))
+    assert angles.max() < 1.0
+
+
+def test_shade_keeps_smooth_surfaces_smooth():
+    import trimesh
+
+    sphere = trimesh.creation.icosphere(subdivisions=3)
+    vertices, normals, faces = shade(sphere.vertices, sphere.faces)
+    assert len(vertices) == len(sphere.vertices)
+    radial = sphere.vertices / np.linalg.norm(sphere.vertices, axis=1)[:, None]
+    assert np.all(np.einsum("ij,ij->i", normals, radial) > 0.999)
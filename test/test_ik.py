@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Tests for batched forward kinematics, Jacobians and DLS IK."""
+
+import numpy as np
+import pytest
+
+from openrd import get_model_path
+from openrd.ik import BatchIK
+from openrd.kinematics import KinematicModel
+from openrd.robot import parse_urdf_string
+
+PLANAR_ARM = """<?xml version="1.0"?>
+<robot name="planar_arm">
+  <link name="base"/>
+  <link name="upper"/>
+  <link name="lower"/>
+  <link name="tip"/>
+  <joint name="shoulder" type="revolute">
+    <parent link="base"/>
+    <child link="upper"/>
+    <axis xyz="0 0 1"/>
+    <limit lower="-3" upper="3" effort="1" velocity="1"/>
+  </joint>
+  <joint name="elbow" type="revolute">
+    <parent link="upper"/>
+    <child link="lower"/>
+    <origin xyz="1 0 0"/>
+    <axis xyz="0 0 1"/>
+    <limit lower="0" upper="2.5" effort="1" velocity="1"/>
+  </joint>
+  <joint name="wrist" type="fixed">
+    <parent link="lower"/>
+    <child link="tip"/>
+    <origin xyz="0.5 0 0"/>
+  </joint>
+</robot>
+"""
+
+G1_TARGETS = ["left_ankle_roll_link", "right_ankle_roll_link", "left_elbow_roll_link", "right_elbow_roll_link"]
+
+
+def test_forward_matches_planar_arm():
+    km = KinematicModel(parse_urdf_string(PLANAR_ARM))
+    q = np.array([[0.0, 0.0], [np.pi / 2, 0.0], [0.3, np.pi / 2]])
+    tip = km.forward(q)[:, km.link_ids(["tip"])[0], :3, 3]
+    expected = [
+        [1.5, 0.0, 0.0],
+        [0.0, 1.5, 0.0],
+        [np.cos(0.3) - 0.5 * np.sin(0.3), np.sin(0.3) + 0.5 * np.cos(0.3), 0.0],
+    ]
+    np.testing.assert_allclose(tip, expected, atol=1e-12)
+
+
+def test_forward_matches_unbatched():
+    km = KinematicModel(get_model_path("unitree_g1"))
+    q = np.random.default_rng(0).uniform(-0.5, 0.5, (4, km.nq))
+    batched = km.forward(q)
+    for b in range(len(q)):
+        np.testing.assert_allclose(km.forward(q[b]), batched[b], atol=1e-12)
+
+
+@pytest.mark.parametrize("name", ["unitree_h1", "unitree_g1"])
+def test_jacobian_matches_finite_differences(name):
+    km = KinematicModel(get_model_path(name))
+    ids = km.link_ids([km.link_names[-1], km.link_names[len(km.link_names) // 2]])
+    q = km.clamp(np.random.default_rng(1).uniform(-0.5, 0.5, (2, km.nq)))
+    poses = km.forward(q)
+    J = km.jacobian(poses, ids)
+    eps = 1e-6
+    for j in range(km.nq):
+        dq = q.copy()
+        dq[:, j] += eps
+        numeric = (km.forward(dq)[:, ids][..., :3, 3] - poses[:, ids][..., :3, 3]) / eps
+        np.testing.assert_allclose(J[..., j], numeric, atol=1e-5)
+
+
+def test_solve_reaches_reachable_targets_within_limits():
+    ik = BatchIK.from_model("unitree_g1", G1_TARGETS)
+    km = ik.kinematics
+    rng = np.random.default_rng(2)
+    q_true = km.clamp(ik.neutral(16) + rng.uniform(-0.3, 0.3, (16, km.nq)))
+    targets = km.forward(q_true)[:, ik.target_ids][..., :3, 3]
+
+    result = ik.solve(targets, max_iters=200)
+    assert result.q.shape == (16, km.nq)
+    assert np.all(result.q >= km.lower - 1e-12) and np.all(result.q <= km.upper + 1e-12)
+    assert np.median(result.error) < 1e-3
+    np.testing.assert_allclose(result.error, ik.position_error(result.q, targets))
+
+
+def test_solve_with_orientation():
+    ik = BatchIK.from_model("unitree_h1", ["left_ankle_link", "left_elbow_link"],
+                            orientation_links=["left_ankle_link"])
+    km = ik.kinematics
+    q_true = km.clamp(ik.neutral(4) + np.random.default_rng(3).uniform(-0.2, 0.2, (4, km.nq)))
+    poses = km.forward(q_true)
+    positions = poses[:, ik.target_ids][..., :3, 3]
+    rotations = poses[:, km.link_ids(["left_ankle_link"])][..., :3, :3]
+
+    result = ik.solve(positions, rotations, max_iters=200)
+    solved = km.forward(result.q)[:, km.link_ids(["left_ankle_link"])][..., :3, :3]
+    assert np.median(result.error) < 1e-3
+    np.testing.assert_allclose(solved, rotations, atol=1e-2)
+
+
+def test_solve_sequence_warm_start():
+    ik = BatchIK.from_model("unitree_h1", ["left_ankle_link", "right_ankle_link", "left_elbow_link", "right_elbow_link"])
+    km = ik.kinematics
+    t = np.linspace(0, 1, 120)[:, None]
+    q_true = km.clamp(ik.neutral(1) + 0.3 * np.sin(2 * np.pi * t + np.arange(km.nq)))
+    targets = km.forward(q_true)[:, ik.target_ids][..., :3, 3]
+
+    result = ik.solve_sequence(targets, batch_size=8)
+    assert result.q.shape == (120, km.nq)
+    assert np.median(result.error) < 1e-3
+    assert result.fps > 0
+    # Warm starts keep consecutive solutions close together
+    assert np.median(np.abs(np.diff(result.q, axis=0)).max(axis=1)) < 0.2
+
+
+def test_solve_sequence_empty():
+    ik = BatchIK.from_model("unitree_h1", ["left_ankle_link", "right_ankle_link"])
+    result = ik.solve_sequence(np.empty((0, 2, 3)))
+    assert result.q.shape == (0, ik.kinematics.nq) and result.error.shape == (0,)
+
+
+def test_unknown_target_link():
+    with pytest.raises(ValueError):
+        BatchIK.from_model("unitree_h1", ["no_such_link"])
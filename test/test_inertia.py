@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for mesh-derived mass properties and URDF inertial verification."""
+
+import numpy as np
+import pytest
+import trimesh
+
+from openrd import inertia
+from openrd.inertia import correct_urdf, mesh_properties, verify_urdf
+
+# 0.2 x 0.1 x 0.4 box mesh, scaled by 0.5 along x and rotated 90 deg about z in the URDF
+URDF = """<?xml version="1.0"?>
+<robot name="box">
+  <link name="base"/>
+  <link name="box">
+    <inertial>
+      <origin xyz="{com}"/>
+      <mass value="2.0"/>
+      <inertia ixx="{ixx}" ixy="0" ixz="0" iyy="{iyy}" iyz="0" izz="{izz}"/>
+    </inertial>
+    <visual>
+      <origin xyz="0.1 0.2 0.3" rpy="0 0 1.5707963267948966"/>
+      <geometry><mesh filename="box.stl" scale="0.5 1 1"/></geometry>
+    </visual>
+  </link>
+  <joint name="hinge" type="revolute">
+    <parent link="base"/>
+    <child link="box"/>
+    <axis xyz="0 0 1"/>
+    <limit lower="-1" upper="1" effort="1" velocity="1"/>
+  </joint>
+</robot>
+"""
+
+
+def _box_inertia(mass, extents):
+    x, y, z = extents
+    return mass / 12.0 * np.array([y * y + z * z, x * x + z * z, x * x + y * y])
+
+
+@pytest.fixture()
+def box_urdf(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path / "cache"))
+    mesh = trimesh.creation.box(extents=(0.2, 0.1, 0.4))
+    mesh.apply_translation((0.05, 0.0, 0.0))
+    mesh.export(str(tmp_path / "box.stl"))
+
+    def write(com, moments):
+        path = tmp_path / "box.urdf"
+        ixx, iyy, izz = moments
+        path.write_text(URDF.format(com=" ".join(map(str, com)), ixx=ixx, iyy=iyy, izz=izz))
+        return str(path)
+
+    return write
+
+
+def test_matches_exact_box_inertial(box_urdf):
+    # Scaled box is 0.1 x 0.1 x 0.4, its x axis turned onto y; the mesh offset 0.05 becomes 0.025 along y
+    path = box_urdf((0.1, 0.225, 0.3), _box_inertia(2.0, (0.1, 0.1, 0.4)))
+    [report] = verify_urdf(path, workers=1)
+    assert report.volume == pytest.approx(0.1 * 0.1 * 0.4)
+    assert report.density == pytest.approx(2.0 / 0.004)
+    # STL stores float32 vertices
+    assert report.com_error < 1e-6 and report.inertia_error < 1e-6
+    assert report.physical and not report.flagged
+    assert correct_urdf(path, workers=1) == path
+
+
+def test_flags_and_corrects_wrong_inertial(box_urdf):
+    # Axes swapped: violates the triangle inequality, and the COM is off by 5 cm
+    path = box_urdf((0.1, 0.175, 0.3), (0.001, 0.001, 0.05))
+    [report] = verify_urdf(path, workers=1)
+    assert report.flagged and not report.physical
+    assert report.com_error == pytest.approx(0.05)
+
+    corrected = correct_urdf(path, workers=1)
+    assert corrected != path
+    [fixed] = verify_urdf(corrected, workers=1)
+    assert fixed.mass == pytest.approx(2.0) and not fixed.flagged
+    assert fixed.inertia_error < 1e-6
+
+    # Density given: mass follows from the volume
+    [dense] = verify_urdf(path, density=1000.0, workers=1)
+    assert dense.mesh_mass == pytest.approx(4.0)
+
+
+def test_properties_cached_by_mesh_hash(box_urdf, tmp_path, monkeypatch):
+    stl = str(tmp_path / "box.stl")
+    first = mesh_properties([stl], workers=1)[stl]
+
+    def fail(path):
+        raise AssertionError("mesh integrated again")
+
+    monkeypatch.setattr(inertia, "_compute_mesh_properties", fail)
+    cached = mesh_properties([stl], workers=1)[stl]
+    assert cached["key"] == first["key"]
+    np.testing.assert_allclose(cached["inertia"], first["inertia"])
+
+    trimesh.creation.box(extents=(0.3, 0.1, 0.4)).export(stl)
+    with pytest.raises(AssertionError, match="integrated again"):
+        mesh_properties([stl], workers=1)
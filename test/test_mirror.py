@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for mirror-image mesh detection and on-demand reconstruction."""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+from openrd import get_model_path
+from openrd.mesh_loader import load_mesh, resolve_mesh_path
+from openrd.mirror import (MESHES_DIR, detect_mirrors, match_reflection, partner_name, prune, restore,
+                           write_manifest)
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def test_partner_name():
+    assert partner_name("hip_yaw_link_l.STL") == "hip_yaw_link_r.STL"
+    assert partner_name("left_knee_link.STL") == "right_knee_link.STL"
+    assert partner_name("L_hand_base_link.STL.convex.stl") == "R_hand_base_link.STL.convex.stl"
+    assert partner_name("Link11_L.STL") == "Link11_R.STL"
+    assert partner_name("base_link.STL") is None
+
+
+def test_match_reflection_detects_axis():
+    mesh = trimesh.creation.box(extents=[0.1, 0.2, 0.3])
+    mesh.apply_translation([0.0, 0.05, 0.0])
+    mirrored = mesh.copy()
+    mirrored.vertices[:, 1] *= -1
+    scale, error = match_reflection(mesh, mirrored)
+    assert scale == (1.0, -1.0, 1.0)
+    assert error == pytest.approx(0.0)
+    assert match_reflection(mesh, trimesh.creation.box(extents=[0.1, 0.2, 0.31])) is None
+
+
+def test_pruned_mesh_is_rebuilt(tmp_path):
+    mesh_dir = tmp_path / "unitree_g1"
+    shutil.copytree(os.path.join(MESHES_DIR, "unitree_g1"), mesh_dir)
+    mirrors = detect_mirrors(str(mesh_dir))
+    assert "right_zero_link.STL" in mirrors
+    write_manifest(str(mesh_dir), mirrors)
+
+    original = trimesh.load(str(mesh_dir / "right_zero_link.STL"), force="mesh")
+    assert prune(str(mesh_dir)) > 0
+    assert not (mesh_dir / "right_zero_link.STL").exists()
+
+    rebuilt = load_mesh(str(mesh_dir / "right_zero_link.STL"))
+    assert rebuilt.volume == pytest.approx(original.volume, rel=1e-4)
+    np.testing.assert_allclose(rebuilt.bounds, original.bounds, atol=1e-4)
+
+    path = resolve_mesh_path(str(mesh_dir / "right_zero_link.STL"))
+    assert os.path.exists(path)
+    assert trimesh.load(path, force="mesh").volume == pytest.approx(original.volume, rel=1e-4)
+
+
+def test_rebuilt_meshes_keep_their_format(tmp_path):
+    mesh = trimesh.creation.box(extents=[0.1, 0.2, 0.3])
+    mesh.apply_translation([0.0, 0.05, 0.0])
+    mirrored = mesh.copy()
+    mirrored.vertices[:, 1] *= -1
+    for ext in ("obj", "ply"):
+        mesh.export(str(tmp_path / f"left_foot.{ext}"))
+        mirrored.export(str(tmp_path / f"right_foot.{ext}"))
+    mirrors = detect_mirrors(str(tmp_path))
+    assert sorted(mirrors) == ["right_foot.obj", "right_foot.ply"]
+    # A hand-written entry for a format trimesh cannot write
+    mirrors["right_foot.dae"] = {"source": "left_foot.obj", "scale": [1.0, -1.0, 1.0]}
+    write_manifest(str(tmp_path), mirrors)
+    prune(str(tmp_path))
+
+    resolved = resolve_mesh_path(str(tmp_path / "right_foot.dae"))
+    assert resolved.endswith(".stl")
+    for name in ("right_foot.obj", "right_foot.ply"):
+        resolved = resolve_mesh_path(str(tmp_path / name))
+        assert resolved.endswith(name[-4:])
+        # Loaded by its extension, so STL bytes in an .obj / .ply file would not parse
+        np.testing.assert_allclose(trimesh.load(resolved, force="mesh").bounds, mirrored.bounds, atol=1e-9)
+    del mirrors["right_foot.dae"]
+    write_manifest(str(tmp_path), mirrors)
+    assert sorted(restore(str(tmp_path))) == ["right_foot.obj", "right_foot.ply"]
+    for name in ("right_foot.obj", "right_foot.ply"):
+        np.testing.assert_allclose(load_mesh(str(tmp_path / name)).bounds, mirrored.bounds, atol=1e-9)
+
+
+def test_mirror_meshes_model_variant():
+    path = get_model_path("unitree_g1", model_format="mjcf", mirror_meshes=True)
+    assert path != get_model_path("unitree_g1", model_format="mjcf")
+    with open(path) as f:
+        text = f.read()
+    assert 'name="right_zero_link"' in text
+    assert 'scale="1 -1 1"' in text
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Tests for fixed-joint lumping, sub-tree extraction and joint locking."""
+
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from openrd import get_model_path
+from openrd.reduce import reduce_mjcf, reduce_urdf
+from openrd.robot import load_urdf, parse_urdf_string
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path))
+
+
+def _com_and_inertia_about_root(model):
+    """Total mass, COM and inertia of a model in its zero pose, in the root frame."""
+    poses = {model.root: np.eye(4)}
+    for joint in model.topological_joints():
+        poses[joint.child] = poses[joint.parent] @ joint.origin
+    masses, coms, inertias = [], [], []
+    for name, link in model.links.items():
+        R, p = poses[name][:3, :3], poses[name][:3, 3]
+        masses.append(link.mass)
+        coms.append(R @ link.com + p)
+        inertias.append(R @ link.inertia @ R.T)
+    from openrd.transforms import combine_inertias
+
+    return combine_inertias(masses, coms, inertias)
+
+
+def test_lump_fixed_preserves_mass_properties():
+    """Lumping removes every fixed joint and keeps the rigid-body totals."""
+    original = load_urdf(get_model_path("unitree_g1"))
+    reduced = parse_urdf_string(reduce_urdf(original))
+
+    n_fixed = sum(j.type == "fixed" for j in original.joints.values())
+    assert n_fixed > 0
+    assert len(reduced.links) == len(original.links) - n_fixed
+    assert not any(j.type == "fixed" for j in reduced.joints.values())
+    assert "imu_link" not in reduced.links
+
+    m0, c0, I0 = _com_and_inertia_about_root(original)
+    m1, c1, I1 = _com_and_inertia_about_root(reduced)
+    assert m1 == pytest.approx(m0)
+    np.testing.assert_allclose(c1, c0, atol=1e-7)
+    np.testing.assert_allclose(I1, I0, atol=1e-7)
+
+
+def test_keep_links_survive_lumping():
+    reduced = parse_urdf_string(reduce_urdf(get_model_path("unitree_g1"), keep=["imu_link"]))
+    assert "imu_link" in reduced.links
+    assert "logo_link" not in reduced.links
+
+
+def test_lock_matches_forward_kinematics():
+    """A locked joint freezes its child at the same pose as the original model."""
+    original = load_urdf(get_model_path("unitree_h1"))
+    reduced = parse_urdf_string(
+        reduce_urdf(original, lock={"left_knee_joint": 0.7}, lump_fixed=False)
+    )
+    assert reduced.joints["left_knee_joint"].type == "fixed"
+
+    def pose(model, link, q):
+        T = np.eye(4)
+        for joint in model.chain(link):
+            T = T @ joint.origin @ joint.motion(q.get(joint.name, 0.0))
+        return T
+
+    np.testing.assert_allclose(
+        pose(reduced, "left_ankle_link", {}),
+        pose(original, "left_ankle_link", {"left_knee_joint": 0.7}),
+        atol=1e-8,
+    )
+
+
+def test_subtree_extraction():
+    reduced = parse_urdf_string(
+        reduce_urdf(get_model_path("unitree_h1"), root="pelvis", tips=["left_ankle_link", "right_ankle_link"])
+    )
+    assert reduced.root == "pelvis"
+    assert len(reduced.actuated_joints) == 10
+    assert all("shoulder" not in name for name in reduced.joints)
+
+
+def test_reduced_mesh_paths_are_absolute():
+    reduced = parse_urdf_string(reduce_urdf(get_model_path("bruce")))
+    filenames = [f for link in reduced.links.values() for _, _, f, _ in link.meshes()]
+    assert filenames
+    assert all(os.path.isabs(f) and os.path.exists(f) for f in filenames)
+
+
+def test_mjcf_subtree_and_lock():
+    text = reduce_mjcf(
+        get_model_path("unitree_g1", model_format="mjcf"),
+        root="torso_link",
+        tips=["left_elbow_roll_link"],
+        lock={"left_elbow_pitch_joint": 0.5},
+    )
+    assert '<body name="left_elbow_pitch_link"' not in text
+    assert '<body name="left_elbow_roll_link"' in text
+    assert '<body name="right_shoulder_pitch_link"' not in text
+    assert 'file="right_shoulder_pitch_link.STL"' not in text
+    assert 'joint="left_elbow_pitch_joint"' not in text
+    assert "<freejoint" not in text
+
+
+def test_mjcf_lock_resolves_default_classes(tmp_path):
+    from openrd.transforms import axis_angle_to_matrix, quat_to_matrix
+
+    path = tmp_path / "arm.xml"
+    path.write_text("""<mujoco model="arm">
+  <default><default class="arm"><joint axis="0 1 0" pos="0 0 0.1"/></default></default>
+  <worldbody>
+    <body name="upper" childclass="arm">
+      <joint name="shoulder"/>
+      <body name="lower" pos="0 0 0.3">
+        <joint name="elbow"/>
+        <geom type="sphere" size="0.05"/>
+      </body>
+    </body>
+  </worldbody>
+</mujoco>""")
+    reduced = ET.fromstring(reduce_mjcf(str(path), lump_fixed=False, lock={"elbow": 0.5}))
+    lower = reduced.find(".//body[@name='lower']")
+    R = axis_angle_to_matrix(np.array([0.0, 1.0, 0.0]), 0.5)
+    np.testing.assert_allclose(quat_to_matrix([float(v) for v in lower.get("quat").split()]), R, atol=1e-9)
+    # Rotation about the inherited anchor at z = 0.1 in the body frame
+    anchor = np.array([0.0, 0.0, 0.1])
+    np.testing.assert_allclose([float(v) for v in lower.get("pos").split()],
+                               np.array([0.0, 0.0, 0.3]) + anchor - R @ anchor, atol=1e-9)
+
+
+def test_get_model_path_reduction_is_cached():
+    first = get_model_path("unitree_g1", reduction={"lock": {"left_knee_joint": 0.3}})
+    mtime = os.path.getmtime(first)
+    second = get_model_path("unitree_g1", reduction={"lock": {"left_knee_joint": 0.3}})
+    assert first == second
+    assert os.path.getmtime(second) == mtime
+    assert first != get_model_path("unitree_g1", reduction={})
+    with pytest.raises(ValueError):
+        get_model_path("unitree_g1", reduction={"unknown_option": True})
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Tests for streaming SMPL-to-robot retargeting."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from openrd.retarget import Retargeter, iter_pose_chunks, load_skeleton, retarget_stream, smpl_forward
+
+# Standard SMPL kinematic tree
+SMPL_PARENTS = [-1, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9, 12, 13, 14, 16, 17, 18, 19, 20, 21]
+
+
+def _motion(frames, joints=24, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames)[:, None, None] / 30.0
+    poses = 0.2 * np.sin(2 * np.pi * 0.5 * t + rng.uniform(0, 2 * np.pi, (1, joints, 3)))
+    trans = np.cumsum(np.full((frames, 3), 0.01), axis=0)
+    return poses.reshape(frames, -1), trans
+
+
+def test_skeleton_matches_smpl_tree():
+    parents, offsets = load_skeleton("smpl")
+    assert parents.tolist() == SMPL_PARENTS
+    parents_h, _ = load_skeleton("smplh")
+    assert parents_h[:22].tolist() == SMPL_PARENTS[:22]
+    assert len(parents_h) == 52
+
+    # Rest pose: joint positions are the accumulated offsets
+    _, p = smpl_forward(np.zeros((1, 24, 3)), np.zeros((1, 3)), parents, offsets)
+    np.testing.assert_allclose(p[0, 7], offsets[1] + offsets[4] + offsets[7])
+
+
+def test_rest_pose_targets_reachable():
+    retargeter = Retargeter("unitree_g1")
+    poses = np.zeros((2, 24, 3))
+    # Arms down: rotate the shoulders about the SMPL forward axis
+    poses[:, 16, 2], poses[:, 17, 2] = -1.2, 1.2
+    result = retargeter(poses)
+    assert result.q.shape == (2, len(retargeter.joint_names))
+    assert np.all(result.error < 0.06)
+    np.testing.assert_allclose(result.root[:, 3:], [[1.0, 0, 0, 0]] * 2)
+
+
+def test_iter_pose_chunks_skips_finished():
+    poses, trans = _motion(25)
+    chunks = list(iter_pose_chunks(poses, trans, chunk_size=10, skip={1}))
+    assert [index for index, _, _ in chunks] == [0, 2]
+    assert chunks[1][1].shape == (5, 72)
+
+
+def test_stream_resumes_from_finished_chunks(tmp_path):
+    poses, trans = _motion(60, joints=52)
+    source = tmp_path / "motion"
+    source.mkdir()
+    np.save(source / "poses.npy", poses)
+    np.save(source / "trans.npy", trans)
+    out = tmp_path / "out"
+
+    full = retarget_stream(str(source), "unitree_h1", str(out), chunk_size=16, workers=1)
+    assert full.frames == 60 and full.chunks == 4 and full.processed == 60
+    assert full.q.shape == (60, len(full.joint_names))
+    expected = np.array(full.q)
+
+    # Forget the last two chunks and corrupt their rows, as after an interruption
+    progress_path = os.path.join(out, "progress.json")
+    with open(progress_path) as f:
+        state = json.load(f)
+    state["done"] = [0, 1]
+    with open(progress_path, "w") as f:
+        json.dump(state, f)
+    q = np.load(out / "q.npy", mmap_mode="r+")
+    q[32:] = 0.0
+    q.flush()
+    del q
+
+    resumed = retarget_stream(str(source), "unitree_h1", str(out), chunk_size=16, workers=1)
+    assert resumed.processed == 28
+    np.testing.assert_allclose(resumed.q, expected)
+
+    with pytest.raises(ValueError):
+        retarget_stream(str(source), "unitree_g1", str(out), chunk_size=16, workers=1)
+
+
+def test_stream_process_pool_matches_serial(tmp_path):
+    poses, trans = _motion(40)
+    serial = retarget_stream((poses, trans), "unitree_h1", str(tmp_path / "serial"), chunk_size=16, workers=1)
+    pooled = retarget_stream((poses, trans), "unitree_h1", str(tmp_path / "pooled"), chunk_size=16, workers=2)
+    np.testing.assert_allclose(pooled.q, serial.q)
+    np.testing.assert_allclose(pooled.root, serial.root)
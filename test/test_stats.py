@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for the opt-in loader instrumentation."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import openrd
+from openrd import get_model_path
+from openrd.mesh_loader import load_mesh
+from openrd.reduce import reduce_file
+from openrd.robot import load_urdf
+
+MESH = os.path.join(os.path.dirname(openrd.__file__), "meshes", "unitree_h1", "left_ankle_link.STL")
+
+
+@pytest.fixture()
+def recording(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENRD_CACHE_DIR", str(tmp_path))
+    openrd.stats(reset=True)
+    openrd.enable_stats()
+    yield
+    openrd.enable_stats(False)
+    openrd.stats(reset=True)
+
+
+def test_disabled_records_nothing():
+    openrd.stats(reset=True)
+    load_urdf(get_model_path("unitree_h1"))
+    snapshot = openrd.stats()
+    assert not snapshot["enabled"] and snapshot["import_seconds"] > 0
+    assert snapshot["calls"] == {} and snapshot["bytes_read"] == {} and snapshot["cache"] == {}
+
+
+def test_latency_bytes_and_cache_counters(recording):
+    path = get_model_path("unitree_h1")
+    for _ in range(3):
+        load_urdf(path)
+    load_mesh(MESH)
+    reduce_file(path, lock={"torso_joint": 0.0})
+    reduce_file(path, lock={"torso_joint": 0.0})
+
+    snapshot = openrd.stats(reset=True)
+    calls = snapshot["calls"]
+    assert calls["get_model_path"]["count"] == 1
+    load = calls["robot.load_urdf"]
+    assert load["count"] >= 3 and load["min"] <= load["p50"] <= load["p99"] <= load["max"]
+    assert sum(n for _, n in load["histogram"]) == load["count"]
+    expected = 3 * os.path.getsize(path) + os.path.getsize(MESH)
+    assert snapshot["bytes_read"]["unitree_h1"] >= expected
+    assert snapshot["cache"]["reduced"] == {"hits": 1, "misses": 1}
+    assert openrd.stats()["calls"] == {}
+
+
+def test_profile_dumped_at_exit(tmp_path):
+    target = tmp_path / "profile-{pid}.json"
+    env = dict(os.environ, OPENRD_PROFILE=str(target))
+    code = "import openrd; openrd.get_model_path('bruce'); print(__import__('os').getpid())"
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    with open(str(target).replace("{pid}", result.stdout.strip())) as f:
+        profile = json.load(f)
+    assert profile["enabled"] and profile["calls"]["get_model_path"]["count"] == 1
+
+
+@pytest.mark.parametrize("value", ["", "0", "false", "OFF"])
+def test_profile_env_disabled_values(tmp_path, value):
+    # Run from an empty directory so a stray dump (e.g. a file named "0") would show up
+    package_root = os.path.dirname(os.path.dirname(openrd.__file__))
+    env = dict(os.environ, OPENRD_PROFILE=value,
+               PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])))
+    code = "import openrd; openrd.get_model_path('bruce'); print(openrd.stats()['enabled'])"
+    result = subprocess.run([sys.executable, "-c", code], env=env, cwd=tmp_path, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip() == "False" and result.stderr == ""
+    assert list(tmp_path.iterdir()) == []